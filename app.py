@@ -1,4 +1,10 @@
+import asyncio
+import gzip
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from functools import wraps
 
@@ -6,6 +12,8 @@ from dotenv import load_dotenv
 from flask import (
     Flask,
     flash,
+    g,
+    has_request_context,
     jsonify,
     redirect,
     render_template,
@@ -14,35 +22,73 @@ from flask import (
     url_for,
 )
 from flask_caching import Cache
-from markdown_it import MarkdownIt
-from mdit_py_plugins.texmath import texmath_plugin
-from supabase import Client, create_client
 
+from contest_watch import ContestWatcher
+import event_loop
+from feed import FEED_PAGE_SIZE, StaleCursor, facets, feed_filters, feed_page
+from http_client import upstream_states
 from info import (
-    get_codechef_profile_stats,
-    get_full_codeforces_profile_stats,
-    get_full_leetcode_profile_stats,
-    get_leetcode_submissions,
-    get_recent_failed_leetcode_problems,
-    get_recent_failed_problem_summaries,
-    get_unified_problem_recommendations,
-    get_unified_tag_distribution,
+    COMPONENT_FETCHERS,
+    PROFILE_COMPONENTS,
+    get_unified_problem_recommendations_async,
+    profile_from_components,
+    project_component,
+    unified_tag_distribution,
 )
-from llm import feedback_generator, get_ai_response
+from llm import feedback_generator_async, get_ai_response_async
+from metrics import (
+    format_span_log,
+    observe,
+    record_cache,
+    register_gauges,
+    render_metrics,
+    start_spans,
+    track,
+)
+from projections import json_default
+import services
+from render import content_hash, render_feedback, render_markdown, wrap_markdown_html
+from series import prepare_rating_series
+from singleflight import SingleFlight
 
 load_dotenv()
 
 url: str = os.getenv("SUPABASE_URL")
 key: str = os.getenv("SUPABASE_KEY")
 secret_key: str = os.getenv("SUPABASE_SERVICE_KEY")
-supabase: Client = create_client(url, key)
 
-supabase_admin: Client = create_client(url, secret_key)
+
+def supabase_client(api_key):
+    # supabase is imported with the first client, not with this module.
+    from supabase import create_client
+
+    return create_client(url, api_key)
+
+
+supabase = services.register("supabase", lambda: supabase_client(key))
+
+supabase_admin = services.register(
+    "supabase_admin",
+    lambda: supabase_client(secret_key),
+    health_check=lambda c: c.table("profiles").select("id").limit(1).execute(),
+)
 
 conversation_history = []
 
 
 def login_required(view_func):
+    # Goes under @app.route, so the route registers the guarded view.
+    if asyncio.iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def wrapped_async_view(*args, **kwargs):
+            if not session.get("user_id"):
+                return redirect(url_for("login", next=request.path))
+
+            return await view_func(*args, **kwargs)
+
+        return wrapped_async_view
+
     @wraps(view_func)
     def wrapped_view(*args, **kwargs):
         user_id = session.get("user_id")
@@ -57,11 +103,179 @@ def login_required(view_func):
 
 app = Flask(__name__, template_folder="templates")
 app.secret_key = os.getenv("SECRET_KEY")
+# Async views run on the worker's shared event loop, not one loop per request.
+app.async_to_sync = event_loop.async_to_sync
 
-config = {"DEBUG": True, "CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 3600}
+config = {
+    "DEBUG": True,
+    "CACHE_TYPE": "cache_backend.BudgetCache",
+    "CACHE_DEFAULT_TIMEOUT": 3600,
+}
 
 app.config.from_mapping(config)
 cache = Cache(app)
+register_gauges(cache.cache.gauges)
+
+LOG_SPANS = os.getenv("LOG_REQUEST_SPANS") == "1"
+
+
+def cache_lookup(key):
+    value = cache.get(key)
+
+    if has_request_context():
+        parts = key.split(":")
+        family = parts[2] if parts[0] == "user" else parts[-1]
+        record_cache(request.endpoint or "unknown", family, value is not None)
+
+    return value
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.spans = start_spans()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get("request_started")
+    if started is None or request.endpoint == "metrics":
+        return response
+
+    duration = time.perf_counter() - started
+    observe(
+        "http_request_duration_seconds",
+        {"route": request.endpoint or "unknown", "status": str(response.status_code)},
+        duration,
+    )
+
+    if LOG_SPANS:
+        print(
+            format_span_log(
+                request.method, request.path, response.status_code, duration, g.spans
+            )
+        )
+
+    return response
+
+
+
+def profile_cache_key(user_id):
+    return f"user:{user_id}:row"
+
+
+def get_profile(user_id):
+    # Read-through cache for the user's `profiles` row. Writes made by this
+    # app go through store_profile/cache_profile so the cached row stays
+    # current without re-reading it from Supabase.
+    profile = cache_lookup(profile_cache_key(user_id))
+
+    if profile is None:
+        profile = fills.do(profile_cache_key(user_id), lambda: fetch_profile(user_id))
+
+    return profile
+
+
+def fetch_profile(user_id):
+    with track("supabase", "profiles.select"):
+        res = (
+            supabase_admin.table("profiles")
+            .select("*")
+            .eq("id", user_id)
+            .maybe_single()
+            .execute()
+        )
+    profile = res.data if res and res.data else None
+
+    if profile is not None:
+        cache.set(profile_cache_key(user_id), profile)
+
+    return profile
+
+
+def cache_profile(user_id, fields):
+    # Only patch a row that is already cached; a partial row would otherwise
+    # shadow the full one on the next read.
+    profile = cache.get(profile_cache_key(user_id))
+
+    if profile is not None:
+        cache.set(profile_cache_key(user_id), {**profile, **fields})
+
+
+def store_profile(user_id, fields):
+    with track("supabase", "profiles.upsert"):
+        supabase_admin.table("profiles").upsert(
+            {"id": user_id, **fields}, on_conflict="id"
+        ).execute()
+
+    cache_profile(user_id, fields)
+
+
+def render_feedback_page(ai_feedback):
+    return render_template("ai_feedback.html", ai_feedback=render_feedback(ai_feedback))
+
+
+def data_etag(value):
+    return content_hash(json.dumps(value, sort_keys=True, default=json_default))
+
+
+def cache_user_data(key, value, timeout=None):
+    # Stored as (etag, value) in one entry, so the two can't be evicted or
+    # expire apart. The ETag is worked out once, when the entry is written,
+    # so conditional requests can be answered without serializing the data.
+    stored = (data_etag(value), value)
+    cache.set(key, stored, timeout=timeout)
+    return stored
+
+
+fills = SingleFlight()
+
+
+async def fill_once(key, compute, read):
+    # Concurrent misses on the same key within this worker share one fill.
+    # The cache is per worker, so there is no value to share across workers;
+    # what they do share are upstream responses, through response_cache.
+    async def lead():
+        # A fill that finished after the caller's miss leaves nothing to do.
+        value = read()
+        return value if value is not None else await compute()
+
+    return await fills.do_async(key, lead)
+
+
+def conditional_response(user_id, name, parts, render, mimetype="text/html"):
+    # parts are the ETags of the cache entries the response is built from,
+    # plus anything else from the session that ends up in it.
+    etag = content_hash("|".join(str(part) for part in parts))
+
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        # Rendered output is kept gzipped per user until one of its inputs
+        # changes, which also changes the ETag.
+        cache_key = f"user:{user_id}:fragment:{name}"
+        cached = cache_lookup(cache_key)
+
+        if cached is not None and cached[0] == etag:
+            body = cached[1]
+        else:
+            body = gzip.compress(render().encode("utf-8"), compresslevel=6)
+            cache.set(cache_key, (etag, body))
+
+        if "gzip" in request.accept_encodings:
+            response = app.response_class(body, mimetype=mimetype)
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = app.response_class(gzip.decompress(body), mimetype=mimetype)
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.vary.update(["Accept-Encoding", "Cookie"])
+    return response
+
+
+async def _no_result():
+    return None
 
 
 @app.route("/", endpoint="landing")
@@ -97,29 +311,23 @@ def login():
 
         elif email and password:
             try:
-                response = supabase_admin.auth.sign_in_with_password(
-                    {
-                        "email": email,
-                        "password": password,
-                    }
-                )
+                with track("supabase", "auth.sign_in"):
+                    response = supabase_admin.auth.sign_in_with_password(
+                        {
+                            "email": email,
+                            "password": password,
+                        }
+                    )
 
                 if not response.user:
                     flash("Invalid credentials.", "warning")
                     return redirect(url_for("login"))
 
-                user = supabase_admin.auth.get_user()
-                user_id = user.user.id
-
-                profile_response = (
-                    supabase_admin.table("profiles")
-                    .select("*")
-                    .eq("id", user_id)
-                    .single()
-                    .execute()
-                )
+                user_id = response.user.id
+                profile = get_profile(user_id)
 
-                profile = profile_response.data
+                if profile is None:
+                    raise RuntimeError("profile not found")
 
                 session["user_id"] = user_id
                 session["username"] = profile.get("username")
@@ -139,6 +347,8 @@ def login():
                     else None
                 )
 
+                schedule_prefetch(user_id, session_usernames())
+
                 flash("Login successful!", "info")
                 return redirect(url_for("landing"))
 
@@ -174,9 +384,10 @@ def signup():
             return redirect(url_for("signup"))
 
         try:
-            response = supabase_admin.auth.sign_up(
-                {"email": email, "password": password}
-            )
+            with track("supabase", "auth.sign_up"):
+                response = supabase_admin.auth.sign_up(
+                    {"email": email, "password": password}
+                )
 
             user = response.user
             if not user:
@@ -184,15 +395,19 @@ def signup():
                 return redirect(url_for("signup"))
 
             user_id = user.id
-            supabase_admin.table("profiles").insert(
-                {
-                    "id": user_id,
-                    "username": username,
-                    "leetcode_username": leetcode,
-                    "codeforces_username": codeforces,
-                    "codechef_username": codechef,
-                }
-            ).execute()
+            profile = {
+                "id": user_id,
+                "username": username,
+                "leetcode_username": leetcode,
+                "codeforces_username": codeforces,
+                "codechef_username": codechef,
+            }
+            with track("supabase", "profiles.insert"):
+                inserted = supabase_admin.table("profiles").insert(profile).execute()
+            cache.set(
+                profile_cache_key(user_id),
+                inserted.data[0] if inserted.data else profile,
+            )
 
             session["user_id"] = user.id
             session["username"] = username
@@ -200,6 +415,8 @@ def signup():
             session["codeforces_username"] = codeforces
             session["codechef_username"] = codechef
 
+            schedule_prefetch(user.id, session_usernames())
+
             flash("Welcome to AlgoDash!", "info")
             return redirect(url_for("landing"))
 
@@ -212,11 +429,41 @@ def signup():
 @app.route("/logout", endpoint="logout", methods=["GET", "POST"])
 def logout():
     session.clear()
-    supabase.auth.sign_out()
+    with track("supabase", "auth.sign_out"):
+        supabase.auth.sign_out()
     flash("Logout successful!", "info")
     return redirect(url_for("landing"))
 
 
+@app.route("/metrics", endpoint="metrics")
+def metrics():
+    return app.response_class(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.route("/health", endpoint="health")
+def health():
+    # ?deep=1 builds every client and calls its service; without it only
+    # reports which clients this worker has built so far.
+    if request.args.get("deep"):
+        checks = services.health_checks()
+        ok = all(check["ok"] for check in checks.values())
+        return (
+            jsonify({"ok": ok, "services": checks, "upstreams": upstream_states()}),
+            200 if ok else 503,
+        )
+
+    return jsonify(
+        {
+            "ok": True,
+            "services": services.status(),
+            "upstreams": upstream_states(),
+            "cache": cache.cache.stats(),
+        }
+    )
+
+
 @app.route("/contact", endpoint="contact")
 def contact():
 
@@ -224,65 +471,325 @@ def contact():
         return render_template("contact.html")
 
 
-@login_required
+PLATFORM_SESSION_KEYS = {
+    "leetcode": "leetcode_username",
+    "codeforces": "codeforces_username",
+    "codechef": "codechef_username",
+}
+
+# How long each profile component stays fresh. Ratings only move after a
+# rated contest and blogs rarely change, while tags and failures move every
+# time the user practises.
+COMPONENT_TTL = {
+    "rating_history": 6 * 3600,
+    "user_info": 6 * 3600,
+    "blogs": 7 * 86400,
+    "language_stats": 86400,
+    "tag_distribution": 1800,
+    "recent_failures": 600,
+}
+
+# LeetCode and CodeChef profiles also carry solve counts.
+COMPONENT_TTL_OVERRIDES = {
+    ("leetcode", "user_info"): 1800,
+    ("codechef", "user_info"): 3600,
+}
+
+
+# With the contest watcher running these are kept until a contest the handle
+# took part in publishes new ratings, or for a day at most, in case the
+# watcher never sees the handle's rating change.
+CONTEST_WATCH = os.getenv("CONTEST_WATCH", "1") == "1"
+RATING_COMPONENTS = [("codeforces", "rating_history"), ("codeforces", "user_info")]
+WATCHED_RATING_TTL = 86400
+
+
+def component_ttl(platform, component):
+    if CONTEST_WATCH and (platform, component) in RATING_COMPONENTS:
+        return WATCHED_RATING_TTL
+
+    return COMPONENT_TTL_OVERRIDES.get((platform, component), COMPONENT_TTL[component])
+
+
+def shortest_ttl(ttls):
+    # A timeout of 0 never expires, so it only counts if nothing else does.
+    return min((ttl for ttl in ttls if ttl), default=0)
+
+
+def platform_ttl(platform):
+    # An assembled entry is only as fresh as its most volatile component.
+    return shortest_ttl(
+        component_ttl(platform, c) for c in PROFILE_COMPONENTS[platform]
+    )
+
+
+def invalidate_ratings(handle, user_ids):
+    keys = [component_key(platform, handle, c) for platform, c in RATING_COMPONENTS]
+    for user_id in user_ids:
+        keys += [f"user:{user_id}:platform:codeforces", f"user:{user_id}:profile"]
+
+    cache.delete_many(*keys)
+
+
+contest_watcher = ContestWatcher(invalidate_ratings)
+
+
+def component_key(platform, handle, component):
+    return f"{platform}:{handle}:{component}"
+
+
+async def load_component(platform, handle, component):
+    # Returns None if the fetch failed. Empty results aren't cached, so an
+    # upstream hiccup that comes back as {} is retried on the next request.
+    key = component_key(platform, handle, component)
+    value = cache_lookup(key)
+    if value is not None:
+        return value
+
+    async def compute():
+        try:
+            value = await COMPONENT_FETCHERS[platform][component](handle)
+        except Exception as e:
+            print(f"Error fetching {key}: {e}")
+            return None
+
+        if value:
+            value = project_component(platform, component, value)
+            cache.set(key, value, timeout=component_ttl(platform, component))
+        return value
+
+    return await fill_once(key, compute, lambda: cache.get(key))
+
+
+async def load_platform_profile(platform, handle):
+    names = PROFILE_COMPONENTS[platform]
+    values = await asyncio.gather(
+        *(load_component(platform, handle, name) for name in names)
+    )
+
+    if any(value is None for value in values):
+        return {}
+
+    try:
+        return profile_from_components(platform, dict(zip(names, values)))
+    except Exception as e:
+        print(f"Error building {platform} profile for {handle}: {e}")
+        return {}
+
+
+def cached_platform_entry(user_id, platform):
+    # (etag, entry), taken from the combined profile entry when there is one.
+    profile = cache_lookup(f"user:{user_id}:profile")
+    if profile is not None:
+        return profile[0], profile[1][platform]
+
+    return cache_lookup(f"user:{user_id}:platform:{platform}")
+
+
+def rating_series(handle, entry):
+    # The chart only needs a downsampled series, which is prepared once per
+    # handle and reused until the handle's rating history changes.
+    if not entry or not entry["connected"]:
+        return None
+
+    data = entry["data"]
+    history = data.get("ratingHistory", [])
+    digest = data_etag(history)
+    cache_key = f"codeforces:{handle}:rating_series"
+
+    cached = cache_lookup(cache_key)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+
+    series = prepare_rating_series(history)
+    cache.set(cache_key, (digest, series))
+    return series
+
+
+def session_usernames():
+    return {p: session.get(key) for p, key in PLATFORM_SESSION_KEYS.items()}
+
+
+async def load_platform_entry(user_id, platform, username):
+    # Returns (etag, entry), as do the other user data loaders below.
+    cached = cached_platform_entry(user_id, platform)
+    if cached is not None:
+        return cached
+
+    key = f"user:{user_id}:platform:{platform}"
+
+    async def compute():
+        data = await load_platform_profile(platform, username) if username else None
+
+        entry = {"connected": bool(username and data), "data": data}
+        stored = cache_user_data(key, entry, timeout=platform_ttl(platform))
+
+        if CONTEST_WATCH and platform == "codeforces" and data:
+            contest_watcher.watch(username, user_id)
+
+        # Once every card has loaded, keep the combined entry that the feedback
+        # and recommendation views read.
+        entries = {p: cached_platform_entry(user_id, p) for p in PLATFORM_SESSION_KEYS}
+        if all(e is not None for e in entries.values()):
+            cache_user_data(
+                f"user:{user_id}:profile",
+                {p: e[1] for p, e in entries.items()},
+                timeout=shortest_ttl(platform_ttl(p) for p in PLATFORM_SESSION_KEYS),
+            )
+
+        return stored
+
+    return await fill_once(key, compute, lambda: cache.get(key))
+
+
+async def load_tag_distribution(user_id, leetcode_user, codeforces_user):
+    key = f"user:{user_id}:tag"
+    cached = cache_lookup(key)
+    if cached is not None:
+        return cached
+
+    async def compute():
+        # Built from the same tag components the profile cards use.
+        lc_tags, cf_tags = await asyncio.gather(
+            load_component("leetcode", leetcode_user, "tag_distribution")
+            if leetcode_user
+            else _no_result(),
+            load_component("codeforces", codeforces_user, "tag_distribution")
+            if codeforces_user
+            else _no_result(),
+        )
+
+        tag_distribution = unified_tag_distribution(
+            lc_tags or {}, cf_tags[0] if cf_tags else {}
+        )
+        return cache_user_data(
+            key, tag_distribution, timeout=COMPONENT_TTL["tag_distribution"]
+        )
+
+    return await fill_once(key, compute, lambda: cache.get(key))
+
+
+# The feed pages and filters over this ranking, so it holds more than one
+# page's worth per platform.
+RECOMMENDATIONS_PER_PLATFORM = 40
+
+
+async def load_recommendations(user_id, tag_distribution):
+    key = f"user:{user_id}:recs"
+    cached = cache_lookup(key)
+    if cached is not None:
+        return cached
+
+    async def compute():
+        weak_tags = []
+        if tag_distribution:
+            sorted_tags = sorted(tag_distribution.items(), key=lambda x: x[1])
+
+            weak_count = max(3, len(sorted_tags) // 3)
+            weak_tags = [tag for tag, count in sorted_tags[:weak_count]]
+
+        if not weak_tags:
+            weak_tags = ["dp", "greedy", "graphs"]
+
+        recommendations = await get_unified_problem_recommendations_async(
+            tags=weak_tags,
+            limit_per_platform=RECOMMENDATIONS_PER_PLATFORM,
+            include_contests=True,
+            platforms=["leetcode", "codeforces", "codechef"],
+        )
+        return cache_user_data(key, recommendations)
+
+    return await fill_once(key, compute, lambda: cache.get(key))
+
+
+async def prefetch_user_data(user_id, usernames):
+    async def tags_and_recommendations():
+        tag_distribution = None
+        if usernames["leetcode"] or usernames["codeforces"]:
+            _, tag_distribution = await load_tag_distribution(
+                user_id, usernames["leetcode"], usernames["codeforces"]
+            )
+        await load_recommendations(user_id, tag_distribution)
+
+    await asyncio.gather(
+        *(load_platform_entry(user_id, p, usernames[p]) for p in PLATFORM_SESSION_KEYS),
+        tags_and_recommendations(),
+    )
+
+
+# Logins warm the caches the dashboard reads from, in the background so the
+# redirect isn't held up. The caches are per worker, so this helps when the
+# dashboard request lands on the same worker as the login.
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+_prefetching = set()
+_prefetching_lock = threading.Lock()
+
+
+def _run_prefetch(user_id, usernames):
+    try:
+        with app.app_context():
+            event_loop.run(prefetch_user_data(user_id, usernames))
+    except Exception as e:
+        print(f"Prefetch error for {user_id}: {e}")
+    finally:
+        with _prefetching_lock:
+            _prefetching.discard(user_id)
+
+
+def schedule_prefetch(user_id, usernames):
+    if not any(usernames.values()):
+        return False
+
+    with _prefetching_lock:
+        if user_id in _prefetching:
+            return False
+        _prefetching.add(user_id)
+
+    _prefetch_executor.submit(_run_prefetch, user_id, usernames)
+    return True
+
+
 @app.route("/dashboard", endpoint="dashboard", methods=["GET"])
+@login_required
 def dashboard():
     try:
-        platforms = cache.get(f"user:{session.get('user_id')}:profile")
+        user_id = session.get("user_id")
 
         leetcode_user = session.get("leetcode_username")
         codeforces_user = session.get("codeforces_username")
         codechef_user = session.get("codechef_username")
 
-        if platforms is None:
-            leetcode_data = None
-            codechef_data = None
-            codeforces_data = None
-
-            if leetcode_user and leetcode_user != "":
-                leetcode_data = get_full_leetcode_profile_stats(leetcode_user)
-            if codechef_user and codechef_user != "":
-                codechef_data = get_codechef_profile_stats(codechef_user)
-            if codeforces_user and codeforces_user != "":
-                codeforces_data = get_full_codeforces_profile_stats(codeforces_user)
-
-            platforms = {
-                "leetcode": {
-                    "connected": bool(leetcode_user and leetcode_data),
-                    "data": leetcode_data,
-                },
-                "codeforces": {
-                    "connected": bool(codeforces_user and codeforces_data),
-                    "data": codeforces_data,
-                },
-                "codechef": {
-                    "connected": bool(codechef_user and codechef_data),
-                    "data": codechef_data,
-                },
-            }
-
-        tag_distribution = None
-
-        if leetcode_user or codeforces_user:
-            tag_distribution = cache.get(f"user:{session.get('user_id')}:tag")
-            if tag_distribution is None:
-                tag_distribution = get_unified_tag_distribution(
-                    leetcode_username=leetcode_user if leetcode_user else None,
-                    codeforces_handle=codeforces_user if codeforces_user else None,
-                )
-                cache.set(f"user:{session.get('user_id')}:tag", tag_distribution)
-
-        if not any(p["connected"] for p in platforms.values()):
+        if not any([leetcode_user, codeforces_user, codechef_user]):
             flash("Please connect at least one platform to continue.", "warning")
             return redirect(url_for("landing"))
 
-        cache.set(f"user:{session.get('user_id')}:profile", platforms)
+        # Render the shell straight away from whatever is cached; the cards
+        # and charts that are missing are fetched by the page itself.
+        cached = {p: cached_platform_entry(user_id, p) for p in PLATFORM_SESSION_KEYS}
+        platforms = {p: c[1] if c else None for p, c in cached.items()}
 
-        return render_template(
-            "dashboard.html",
-            username=session.get("username"),
-            platforms=platforms,
-            tag_distribution=tag_distribution,
+        wants_tags = bool(leetcode_user or codeforces_user)
+        tag_etag, tag_distribution = (
+            wants_tags and cache_lookup(f"user:{user_id}:tag") or (None, None)
+        )
+
+        return conditional_response(
+            user_id,
+            "dashboard",
+            [
+                session.get("username"),
+                wants_tags,
+                tag_etag,
+                *(c[0] if c else None for c in cached.values()),
+            ],
+            lambda: render_template(
+                "dashboard.html",
+                username=session.get("username"),
+                platforms=platforms,
+                rating_series=rating_series(codeforces_user, platforms["codeforces"]),
+                tag_distribution=tag_distribution,
+                wants_tags=wants_tags,
+            ),
         )
 
     except Exception as e:
@@ -295,9 +802,80 @@ def dashboard():
         return render_template("landing.html", authenticated=authed, username=username)
 
 
+@app.route(
+    "/dashboard/data/<platform>",
+    endpoint="dashboard_platform_data",
+    methods=["GET"],
+)
+@login_required
+async def dashboard_platform_data(platform):
+    if platform not in PLATFORM_SESSION_KEYS:
+        return jsonify({"success": False, "error": "Unknown platform"}), 404
+
+    try:
+        user_id = session.get("user_id")
+        etag, entry = await load_platform_entry(
+            user_id, platform, session.get(PLATFORM_SESSION_KEYS[platform])
+        )
+
+        def render():
+            payload = {
+                "success": True,
+                "connected": entry["connected"],
+                "html": render_template(
+                    f"partials/{platform}_card.html", platform=entry
+                ),
+            }
+
+            if platform == "codeforces" and entry["connected"]:
+                payload["ratingSeries"] = rating_series(
+                    session.get("codeforces_username"), entry
+                )
+                payload["maxRating"] = entry["data"].get("maxRating")
+
+            return json.dumps(payload)
+
+        return conditional_response(
+            user_id,
+            f"card:{platform}",
+            [etag],
+            render,
+            mimetype="application/json",
+        )
+
+    except Exception as e:
+        print(f"Dashboard {platform} error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route("/dashboard/data/tags", endpoint="dashboard_tag_data", methods=["GET"])
 @login_required
+async def dashboard_tag_data():
+    try:
+        user_id = session.get("user_id")
+        leetcode_user = session.get("leetcode_username")
+        codeforces_user = session.get("codeforces_username")
+
+        etag, tag_distribution = await load_tag_distribution(
+            user_id, leetcode_user, codeforces_user
+        )
+
+        return conditional_response(
+            user_id,
+            "tags",
+            [etag],
+            lambda: json.dumps({"success": True, "tag_distribution": tag_distribution}),
+            mimetype="application/json",
+        )
+
+    except Exception as e:
+        print(f"Dashboard tags error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route("/chat", endpoint="chat", methods=["GET", "POST"])
-def chat():
+@login_required
+async def chat():
 
     if request.method == "GET":
         return render_template("chat.html")
@@ -317,19 +895,12 @@ def chat():
             elif len(conversation_history) > 2:
                 context = conversation_history[-2]
 
-            ai_response = get_ai_response(doubt, context)
+            ai_response = await get_ai_response_async(doubt, context)
             conversation_history.append(
                 {"user": ai_response, "ai_response": ai_response}
             )
 
-            md = MarkdownIt("gfm-like", {"linkify": False}).use(texmath_plugin)
-            ai_response = md.render(ai_response)
-
-            ai_response = f"""
-            <div class="markdown-content">
-                {ai_response}
-            </div>
-            """
+            ai_response = wrap_markdown_html(render_markdown(ai_response))
 
             if len(conversation_history) > 2:
                 conversation_history.pop(0)
@@ -345,48 +916,41 @@ def chat():
             return jsonify({"success": False, "error": str(e)}), 500
 
 
-@login_required
-@app.route("/problem_recommendation", endpoint="problem_recommendation")
-def problem_recommendation():
-
-    try:
-        if request.method == "GET":
-            problem_recommendations = cache.get(f"user:{session.get('user_id')}:recs")
-
-            if problem_recommendations is None:
-                leetcode_username = session.get("leetcode_username")
-                codeforces_username = session.get("codeforces_username")
+async def load_user_recommendations(user_id):
+    cached = cache_lookup(f"user:{user_id}:recs")
 
-                tag_distribution = get_unified_tag_distribution(
-                    leetcode_username=leetcode_username if leetcode_username else None,
-                    codeforces_handle=codeforces_username
-                    if codeforces_username
-                    else None,
-                )
-                cache.set(f"user:{session.get('user_id')}:tag", tag_distribution)
+    if cached is None:
+        _, tag_distribution = await load_tag_distribution(
+            user_id,
+            session.get("leetcode_username"),
+            session.get("codeforces_username"),
+        )
+        cached = await load_recommendations(user_id, tag_distribution)
 
-                weak_tags = []
-                if tag_distribution:
-                    sorted_tags = sorted(tag_distribution.items(), key=lambda x: x[1])
+    return cached
 
-                    weak_count = max(3, len(sorted_tags) // 3)
-                    weak_tags = [tag for tag, count in sorted_tags[:weak_count]]
 
-                if not weak_tags:
-                    weak_tags = ["dp", "greedy", "graphs"]
+@app.route("/problem_recommendation", endpoint="problem_recommendation")
+@login_required
+async def problem_recommendation():
 
-                recommendations = get_unified_problem_recommendations(
-                    tags=weak_tags,
-                    limit_per_platform=15,
-                    include_contests=True,
-                    platforms=["leetcode", "codeforces", "codechef"],
+    try:
+        if request.method == "GET":
+            user_id = session.get("user_id")
+            version, recommendations = await load_user_recommendations(user_id)
+
+            # Only the first page is rendered; the rest of the ranking is
+            # fetched from the feed as the user asks for it.
+            def render():
+                feed = feed_page(recommendations["problems"], version, {})
+                feed["facets"] = facets(recommendations["problems"])
+                return render_template(
+                    "problems.html",
+                    recommendations=recommendations,
+                    feed=feed,
                 )
-                cache.set(f"user:{session.get('user_id')}:recs", recommendations)
 
-            return render_template(
-                "problems.html",
-                recommendations=recommendations,
-            )
+            return conditional_response(user_id, "problems", [version], render)
 
     except Exception as e:
         flash("An error occured, please try refreshing or contacting the dev!", "error")
@@ -395,111 +959,168 @@ def problem_recommendation():
         return render_template("landing.html", authenticated=authed, username=username)
 
 
+@app.route(
+    "/problem_recommendation/feed",
+    endpoint="problem_recommendation_feed",
+    methods=["GET"],
+)
 @login_required
-@app.route("/ai_feedback", endpoint="ai_feedback")
-def ai_feedback():
+async def problem_recommendation_feed():
+    try:
+        filters = feed_filters(request.args)
+        limit = int(request.args.get("limit") or FEED_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid filter"}), 400
+
     try:
         user_id = session.get("user_id")
-        today_utc = datetime.now(timezone.utc).date()
+        version, recommendations = await load_user_recommendations(user_id)
+        cursor = request.args.get("cursor")
 
-        res = (
-            supabase.table("profiles")
-            .select("ai_feedback, last_feedback_generated")
-            .eq("id", user_id)
-            .maybe_single()
-            .execute()
+        try:
+            page = feed_page(
+                recommendations["problems"], version, filters, cursor, limit
+            )
+        except StaleCursor as e:
+            return jsonify({"success": False, "stale": True, "error": str(e)}), 409
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        def render():
+            return json.dumps(
+                {
+                    "success": True,
+                    "html": "".join(
+                        render_template("partials/problem_card.html", problem=problem)
+                        for problem in page["problems"]
+                    ),
+                    "total": page["total"],
+                    "next_cursor": page["next_cursor"],
+                }
+            )
+
+        return conditional_response(
+            user_id,
+            "feed",
+            [version, request.query_string.decode("utf-8", "replace")],
+            render,
+            mimetype="application/json",
         )
 
-        row = res.data if res and res.data else None
+    except Exception as e:
+        print(f"Recommendation feed error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
 
-        if row and row.get("last_feedback_generated"):
-            last_generated_date = datetime.fromisoformat(
-                row["last_feedback_generated"].replace("Z", "+00:00")
-            ).date()
 
-            if last_generated_date == today_utc:
-                return render_template(
-                    "ai_feedback.html", ai_feedback=row["ai_feedback"]
-                )
+def todays_feedback(row):
+    # The stored feedback fields, if they were generated today.
+    if row and row.get("last_feedback_generated"):
+        last_generated_date = datetime.fromisoformat(
+            row["last_feedback_generated"].replace("Z", "+00:00")
+        ).date()
 
-        tag_distro = cache.get(f"user:{session.get('user_id')}:tag")
-        if tag_distro is None:
-            tag_distro = get_unified_tag_distribution(
-                leetcode_username=session.get("leetcode_username"),
-                codeforces_handle=session.get("codeforces_username"),
-            )
-            cache.set(f"user:{session.get('user_id')}:tag", tag_distro)
-
-        dashboard_info = cache.get(f"user:{session.get('user_id')}:profile")
-        if dashboard_info is None:
-            leetcode_user = session.get("leetcode_username")
-            codeforces_user = session.get("codeforces_username")
-            codechef_user = session.get("codechef_username")
-
-            dashboard_info = {
-                "leetcode": {
-                    "connected": bool(leetcode_user),
-                    "data": get_full_leetcode_profile_stats(leetcode_user)
-                    if leetcode_user
-                    else None,
-                },
-                "codeforces": {
-                    "connected": bool(codeforces_user),
-                    "data": get_full_codeforces_profile_stats(codeforces_user)
-                    if codeforces_user
-                    else None,
-                },
-                "codechef": {
-                    "connected": bool(codechef_user),
-                    "data": get_codechef_profile_stats(codechef_user)
-                    if codechef_user
-                    else None,
-                },
+        if last_generated_date == datetime.now(timezone.utc).date():
+            return {
+                "ai_feedback": row["ai_feedback"],
+                "ai_feedback_html": row.get("ai_feedback_html"),
             }
-            cache.set(f"user:{session.get('user_id')}:profile", dashboard_info)
 
-        failed_leetcode = None
-        failed_codeforces = None
+    return None
 
-        if session.get("leetcode_username") is not None:
-            failed_leetcode = get_recent_failed_leetcode_problems(
-                get_leetcode_submissions(session.get("leetcode_username"))
-            )
 
-        if session.get("codeforces_username") is not None:
-            failed_codeforces = get_recent_failed_problem_summaries(
-                session.get("codeforces_username")
-            )
+async def feedback_page(user_id, feedback):
+    # The page is rendered once, when the feedback is generated, and stored
+    # with it. Rows stored before that get theirs rendered on the first view.
+    if feedback["ai_feedback_html"] is None:
+        feedback["ai_feedback_html"] = render_feedback_page(feedback["ai_feedback"])
+        await asyncio.to_thread(
+            store_profile, user_id, {"ai_feedback_html": feedback["ai_feedback_html"]}
+        )
 
-        info_to_send = {
-            "tag_distribution": tag_distro,
-            "dashboard_info": dashboard_info,
-            "failed_leetcode": failed_leetcode,
-            "failed_codeforces": failed_codeforces,
-        }
+    return feedback["ai_feedback_html"]
+
+
+async def generate_feedback(user_id, row, usernames):
+    leetcode_user = usernames["leetcode"]
+    codeforces_user = usernames["codeforces"]
+
+    (
+        tag_distro,
+        failed_leetcode,
+        failed_codeforces,
+        *entries,
+    ) = await asyncio.gather(
+        load_tag_distribution(user_id, leetcode_user, codeforces_user),
+        load_component("leetcode", leetcode_user, "recent_failures")
+        if leetcode_user is not None
+        else _no_result(),
+        load_component("codeforces", codeforces_user, "recent_failures")
+        if codeforces_user is not None
+        else _no_result(),
+        *(load_platform_entry(user_id, p, usernames[p]) for p in PLATFORM_SESSION_KEYS),
+    )
+
+    info_to_send = {
+        "tag_distribution": tag_distro[1],
+        "dashboard_info": {p: e[1] for p, e in zip(PLATFORM_SESSION_KEYS, entries)},
+        "failed_leetcode": failed_leetcode,
+        "failed_codeforces": failed_codeforces,
+    }
+
+    ai_feedback = await feedback_generator_async(
+        info_to_send, previous=row.get("ai_feedback") if row else None
+    )
+    if "error" in ai_feedback:
+        return ai_feedback
+
+    if not isinstance(ai_feedback, dict):
+        raise RuntimeError("LLM feedback generation failed")
+
+    feedback = {
+        "ai_feedback": ai_feedback,
+        "ai_feedback_html": render_feedback_page(ai_feedback),
+    }
+    await asyncio.to_thread(
+        store_profile,
+        user_id,
+        {
+            **feedback,
+            "last_feedback_generated": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+
+    return feedback
 
-        ai_feedback = feedback_generator(info_to_send)
-        if "error" in ai_feedback:
-            flash(ai_feedback["error"], "error")
+
+@app.route("/ai_feedback", endpoint="ai_feedback")
+@login_required
+async def ai_feedback():
+    try:
+        user_id = session.get("user_id")
+
+        # A cache miss reads Supabase, whose client is synchronous.
+        row = await asyncio.to_thread(get_profile, user_id)
+
+        feedback = todays_feedback(row)
+        if feedback is not None:
+            return await feedback_page(user_id, feedback)
+
+        # Generating costs an LLM call, so a double refresh waits for the
+        # first request's feedback instead of asking for its own.
+        feedback = await fill_once(
+            f"user:{user_id}:feedback",
+            lambda: generate_feedback(user_id, row, session_usernames()),
+            lambda: todays_feedback(cache.get(profile_cache_key(user_id))),
+        )
+        if "error" in feedback:
+            flash(feedback["error"], "error")
             authed = True if session.get("user_id") else False
             username = session.get("username")
             return render_template(
                 "landing.html", authenticated=authed, username=username
             )
 
-        if not isinstance(ai_feedback, dict):
-            raise RuntimeError("LLM feedback generation failed")
-
-        supabase_admin.table("profiles").upsert(
-            {
-                "id": user_id,
-                "ai_feedback": ai_feedback,
-                "last_feedback_generated": datetime.now(timezone.utc).isoformat(),
-            },
-            on_conflict="id",
-        ).execute()
-
-        return render_template("ai_feedback.html", ai_feedback=ai_feedback)
+        return await feedback_page(user_id, feedback)
 
     except Exception as e:
         print(str(e))
@@ -509,5 +1130,11 @@ def ai_feedback():
         return render_template("landing.html", authenticated=authed, username=username)
 
 
+if os.getenv("WARM_UP_SERVICES") == "1":
+    # Build the clients in the background so the first requests a worker
+    # serves don't wait for them.
+    threading.Thread(target=services.warm_up, daemon=True).start()
+
+
 if __name__ == "__main__":
     app.run(debug=True)
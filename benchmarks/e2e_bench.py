@@ -0,0 +1,251 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_llm import start_fake_llm  # noqa: E402
+from benchmarks.fixture_server import (  # noqa: E402
+    load_fixture,
+    parse_latencies,
+    start_fixture_server,
+)
+from benchmarks.llm_bench import percentile  # noqa: E402
+
+# Drives the Flask routes end to end against benchmarks/fixture_server.py
+# and the fake LLM, and reports cold (see reset_state) and warm latency,
+# upstream calls per route and peak Python memory.
+#
+#   python -m benchmarks.e2e_bench --runs 5 --latency 0.15 --out e2e.json
+
+# A scenario is a list of steps; the paths in one step are requested
+# concurrently, the way the dashboard page loads its cards.
+SCENARIOS = {
+    "dashboard": [
+        ["/dashboard"],
+        [
+            "/dashboard/data/leetcode",
+            "/dashboard/data/codeforces",
+            "/dashboard/data/codechef",
+            "/dashboard/data/tags",
+        ],
+    ],
+    "problem_recommendation": [
+        ["/problem_recommendation"],
+        ["/problem_recommendation/feed?platform=codeforces"],
+    ],
+    "ai_feedback": [["/ai_feedback"]],
+}
+
+# Shaped like a Supabase key so the client accepts it; never sent anywhere.
+FAKE_SUPABASE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYmVuY2gifQ.YmVuY2g"
+
+
+def configure_environment(stub_url, llm_url):
+    # Must run before app (and with it http_client and llm) is imported.
+    os.environ["UPSTREAM_STUB_URL"] = stub_url
+    os.environ["SUPABASE_URL"] = f"{stub_url}/supabase"
+    os.environ["SUPABASE_KEY"] = FAKE_SUPABASE_KEY
+    os.environ["SUPABASE_SERVICE_KEY"] = FAKE_SUPABASE_KEY
+    os.environ["GROQ_API_KEY"] = "fake"
+    os.environ["GROQ_BASE_URL"] = llm_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    # The contest watcher's schedule fetch would land in whichever scenario
+    # happens to be running; rating data is then cached on a timer instead.
+    os.environ.setdefault("CONTEST_WATCH", "0")
+    # Each run starts with empty on-disk caches and stores.
+    cache_dir = tempfile.mkdtemp(prefix="algodash-bench-")
+    os.environ["RESPONSE_CACHE_PATH"] = os.path.join(cache_dir, "responses.sqlite3")
+    os.environ["PROBLEM_CATALOG_PATH"] = os.path.join(cache_dir, "problems.catalog")
+    os.environ["SUBMISSION_STORE_PATH"] = os.path.join(cache_dir, "submissions.sqlite3")
+
+
+def bench_user():
+    row = load_fixture("supabase_profiles")["body"][0]
+    return {
+        "user_id": row["id"],
+        "username": row["username"],
+        "leetcode_username": row["leetcode_username"],
+        "codeforces_username": row["codeforces_username"],
+        "codechef_username": row["codechef_username"],
+    }
+
+
+def logged_in_client(app, user):
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session.update(user)
+    return client
+
+
+def run_scenario(app, user, steps, pool):
+    statuses = []
+    started = time.perf_counter()
+
+    for paths in steps:
+        clients = [logged_in_client(app, user) for _ in paths]
+        responses = pool.map(lambda pair: pair[0].get(pair[1]), zip(clients, paths))
+        statuses.extend(r.status_code for r in responses)
+
+    return time.perf_counter() - started, statuses
+
+
+def reset_state(cache):
+    # Cold runs start the way a fresh deploy would: empty Flask cache, render
+    # cache, response cache and submission store, closed breakers and no
+    # last-good responses. The problem catalog is rebuilt into the new
+    # directory up front and waited for, so its upstream calls are neither
+    # skipped by a catalog left from the last run nor counted in the scenario.
+    import http_client
+    import info
+    import render
+    import response_cache
+    import submission_store
+    from catalog import CatalogFile
+    from resilience import CircuitBreaker, LatencyTracker
+
+    state_dir = tempfile.mkdtemp(prefix="algodash-bench-")
+
+    if info.problem_catalog is not None:
+        info.problem_catalog = CatalogFile(
+            os.path.join(state_dir, "problems.catalog"),
+            info._catalog_records,
+            info.CATALOG_MAX_AGE_SECONDS,
+        )
+        info.problem_catalog.rebuild()
+
+    # Swapping the thread-locals makes every thread open the new files.
+    response_cache.RESPONSE_CACHE_PATH = os.path.join(state_dir, "responses.sqlite3")
+    response_cache._local = threading.local()
+    submission_store.SUBMISSION_STORE_PATH = os.path.join(
+        state_dir, "submissions.sqlite3"
+    )
+    submission_store._local = threading.local()
+
+    for name in http_client._breakers:
+        http_client._breakers[name] = CircuitBreaker(name)
+        http_client._latencies[name] = LatencyTracker()
+    with http_client._last_good_lock:
+        http_client._last_good.clear()
+
+    with render._render_cache_lock:
+        render._render_cache.clear()
+    cache.clear()
+
+
+def measure(app, cache, server, user, steps, pool, cold):
+    if cold:
+        reset_state(cache)
+
+    server.reset_counts()
+    latency, statuses = run_scenario(app, user, steps, pool)
+    calls, unmatched = server.snapshot_counts()
+    return {
+        "latency": latency,
+        "calls": calls,
+        "unmatched": unmatched,
+        "errors": sum(1 for s in statuses if s >= 400),
+    }
+
+
+def peak_memory(app, cache, user, steps, pool):
+    reset_state(cache)
+    tracemalloc.start()
+    try:
+        run_scenario(app, user, steps, pool)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(samples):
+    latencies = [s["latency"] for s in samples]
+    hosts = sorted({h for s in samples for h in s["calls"]})
+    return {
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p95_s": percentile(latencies, 95),
+        "latency_mean_s": sum(latencies) / len(latencies) if latencies else None,
+        "upstream_calls": {
+            host: sum(s["calls"].get(host, 0) for s in samples) / len(samples)
+            for host in hosts
+        },
+        "errors": sum(s["errors"] for s in samples),
+        "unmatched": sorted({u for s in samples for u in s["unmatched"]}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark AlgoDash routes.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--warm-runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.1, help="per upstream")
+    parser.add_argument("--host-latency", action="append", metavar="HOST=SECONDS")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable"
+    )
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--label", default="")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    server, stub_url = start_fixture_server(
+        args.latency, parse_latencies(args.host_latency)
+    )
+    llm_server, llm_url = start_fake_llm(args.llm_latency, min(0.05, args.llm_latency))
+    configure_environment(stub_url, llm_url)
+
+    from app import app, cache
+
+    user = bench_user()
+    results = {
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "runs": args.runs,
+        "warm_runs": args.warm_runs,
+        "upstream_latency_s": args.latency,
+        "llm_latency_s": args.llm_latency,
+        "scenarios": {},
+    }
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for name in args.scenario or list(SCENARIOS):
+            steps = SCENARIOS[name]
+            cold, warm = [], []
+
+            for _ in range(args.runs):
+                cold.append(measure(app, cache, server, user, steps, pool, True))
+                for _ in range(args.warm_runs):
+                    warm.append(measure(app, cache, server, user, steps, pool, False))
+
+            results["scenarios"][name] = {
+                "cold": summarize(cold),
+                "warm": summarize(warm),
+                "peak_memory_mb": (
+                    None
+                    if args.no_memory
+                    else peak_memory(app, cache, user, steps, pool) / 2**20
+                ),
+            }
+
+    server.shutdown()
+    llm_server.shutdown()
+
+    print(json.dumps(results, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
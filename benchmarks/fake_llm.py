@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A stand-in for the Groq (OpenAI-compatible) chat completions endpoint.
+# It answers json_schema requests with a minimal schema-conforming object and
+# everything else with a short markdown reply, after a configurable delay.
+
+FAKE_MARKDOWN = (
+    "## Think about the constraints\n\n"
+    "- What does **N ≤ 10^5** rule out?\n"
+    "- Which state would a `dp` need to carry?\n\n"
+    "### Next step\n\n"
+    "Try a brute force first and estimate its complexity.\n"
+)
+
+
+def count_tokens(text):
+    # Close enough to a BPE tokenizer for relative comparisons.
+    return max(1, len(text) // 4)
+
+
+def sample_from_schema(schema):
+    kind = schema.get("type")
+
+    if kind == "object":
+        return {
+            name: sample_from_schema(prop)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [
+            sample_from_schema(schema.get("items", {}))
+            for _ in range(max(1, schema.get("minItems", 1)))
+        ]
+    if kind == "string":
+        return "Revisit the **edge cases** before optimising the loop."
+    return None
+
+
+def completion_content(body):
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"]["schema"]
+        return json.dumps(sample_from_schema(schema))
+    return FAKE_MARKDOWN
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    latency = 0.2
+    ttft = 0.05
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        prompt = "".join(m.get("content") or "" for m in body.get("messages", []))
+        content = completion_content(body)
+        usage = {
+            "prompt_tokens": count_tokens(prompt),
+            "completion_tokens": count_tokens(content),
+            "total_tokens": count_tokens(prompt) + count_tokens(content),
+        }
+
+        if body.get("stream"):
+            self._stream(body, content, usage)
+        else:
+            time.sleep(self.latency)
+            self._send_json(
+                {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                            "logprobs": None,
+                        }
+                    ],
+                    "usage": usage,
+                }
+            )
+
+    def _send_json(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, body, content, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        time.sleep(self.ttft)
+
+        pieces = [content[i : i + 16] for i in range(0, len(content), 16)] or [""]
+        per_piece = max(0.0, self.latency - self.ttft) / len(pieces)
+
+        for i, piece in enumerate(pieces):
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": piece},
+                        "finish_reason": "stop" if i == len(pieces) - 1 else None,
+                    }
+                ],
+            }
+            if i == len(pieces) - 1:
+                chunk["usage"] = usage
+                chunk["x_groq"] = {"id": "fake", "usage": usage}
+
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if i < len(pieces) - 1:
+                time.sleep(per_piece)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def start_fake_llm(latency=0.2, ttft=0.05, port=0):
+    handler = type(
+        "ConfiguredFakeLLMHandler",
+        (FakeLLMHandler,),
+        {"latency": latency, "ttft": ttft},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,254 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+# Record/replay stand-in for every upstream info.py and app.py talk to.
+# http_client sends requests here when UPSTREAM_STUB_URL is set, as
+# {stub}/{original host}{original path}?{query}; Supabase is pointed here
+# with SUPABASE_URL={stub}/supabase.
+#
+# Replay (default) answers each request from benchmarks/fixtures/<name>.json,
+# where <name> comes from the URL patterns below, after an injected delay.
+# --record forwards requests to the real upstream and saves what comes back.
+# Replayed responses carry an ETag and honor If-None-Match, like the upstreams
+# that support revalidation.
+#
+#   python -m benchmarks.fixture_server --port 8765 --latency 0.15
+#   python -m benchmarks.fixture_server --port 8765 --record
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+NODE_API_HOST = urlsplit(os.getenv("NODE_API_URL", "http://localhost:3000")).netloc
+
+# (fixture name, upstream host, path pattern)
+PATTERNS = [
+    ("cf_problemset", "codeforces.com", r"/api/problemset\.problems"),
+    ("cf_contest_list", "codeforces.com", r"/api/contest\.list"),
+    ("cf_user_info", "codeforces.com", r"/api/user\.info"),
+    ("cf_user_status", "codeforces.com", r"/api/user\.status"),
+    ("cf_user_rating", "codeforces.com", r"/api/user\.rating"),
+    ("cf_user_blogs", "codeforces.com", r"/api/user\.blogEntries"),
+    ("lc_submissions", NODE_API_HOST, r"/leetcode/[^/]+/submission"),
+    ("lc_ac_submissions", NODE_API_HOST, r"/leetcode/[^/]+/acSubmission"),
+    ("lc_skill_stats", NODE_API_HOST, r"/leetcode/skillStats/[^/]+"),
+    ("lc_daily", NODE_API_HOST, r"/leetcode/daily"),
+    ("lc_problems", NODE_API_HOST, r"/leetcode/problems"),
+    ("lc_profile", "alfa-leetcode-api.onrender.com", r"/[^/]+/profile"),
+    ("lc_contests", "competeapi.vercel.app", r"/contests/leetcode/?"),
+    ("cc_contests", "competeapi.vercel.app", r"/contests/codechef/?"),
+    ("cc_user", "competeapi.vercel.app", r"/user/codechef/[^/]+/?"),
+    ("supabase_profiles", "supabase", r"/rest/v1/profiles"),
+]
+
+
+def match_fixture(host, path):
+    for name, pattern_host, pattern in PATTERNS:
+        if host == pattern_host and re.fullmatch(pattern, path):
+            return name
+    return None
+
+
+def load_fixture(name, fixtures_dir=FIXTURES_DIR):
+    with open(os.path.join(fixtures_dir, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_fixture(name, fixture, fixtures_dir=FIXTURES_DIR):
+    os.makedirs(fixtures_dir, exist_ok=True)
+    with open(os.path.join(fixtures_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(fixture, f, separators=(",", ":"))
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    latencies = {}
+    record = False
+    fixtures_dir = FIXTURES_DIR
+    calls = None
+    unmatched = None
+    encoded = None
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _target(self):
+        target = urlsplit(self.path)
+        host, _, rest = target.path.lstrip("/").partition("/")
+        return host, "/" + rest, target.query
+
+    def _count(self, host, name):
+        with self.lock:
+            self.calls[host] += 1
+            if name is None:
+                self.unmatched[f"{host}{self.path}"] += 1
+
+    def do_GET(self):
+        host, path, query = self._target()
+        name = match_fixture(host, path)
+        self._count(host, name)
+
+        if self.record and host != "supabase":
+            self._record(name, host, path, query)
+            return
+
+        if name is None:
+            self._send(404, {"error": f"no fixture for {host}{path}"})
+            return
+
+        time.sleep(self.latencies.get(host, self.latency))
+        self._send_fixture(name)
+
+    def do_POST(self):
+        # Supabase writes (insert/upsert) are acknowledged with the row sent.
+        host, path, _ = self._target()
+        self._count(host, match_fixture(host, path))
+
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"[]")
+
+        time.sleep(self.latencies.get(host, self.latency))
+        self._send(201, body if isinstance(body, list) else [body])
+
+    do_PATCH = do_POST
+
+    def _record(self, name, host, path, query):
+        scheme = "http" if host == NODE_API_HOST else "https"
+        url = f"{scheme}://{host}{path}" + (f"?{query}" if query else "")
+
+        try:
+            res = requests.get(url, timeout=60)
+            try:
+                body = res.json()
+            except ValueError:
+                self._send(502, {"error": f"non-JSON response from {url}"})
+                return
+        except Exception as e:
+            self._send(502, {"error": repr(e)})
+            return
+
+        if name is not None and res.status_code == 200:
+            save_fixture(name, {"status": 200, "body": body}, self.fixtures_dir)
+
+        self._send(res.status_code, body)
+
+    def _send_fixture(self, name):
+        # Fixtures are encoded once so replay cost stays out of the numbers.
+        with self.lock:
+            cached = self.encoded.get(name)
+        if cached is None:
+            fixture = load_fixture(name, self.fixtures_dir)
+            data = json.dumps(fixture["body"]).encode()
+            etag = f'"{hashlib.sha1(data).hexdigest()}"'
+            cached = (fixture.get("status", 200), data, etag)
+            with self.lock:
+                self.encoded[name] = cached
+
+        status, data, etag = cached
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self._send_bytes(status, data, etag if status == 200 else None)
+
+    def _send(self, status, payload):
+        self._send_bytes(status, json.dumps(payload).encode("utf-8"))
+
+    def _send_bytes(self, status, data, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Every response closes its connection (HTTP/1.0), so a cold page opens
+    # a burst of connections; past the default backlog of 5 the extra SYNs
+    # are dropped and retried a second later.
+    request_queue_size = 128
+
+    def reset_counts(self):
+        handler = self.RequestHandlerClass
+        with handler.lock:
+            handler.calls.clear()
+            handler.unmatched.clear()
+
+    def snapshot_counts(self):
+        handler = self.RequestHandlerClass
+        with handler.lock:
+            return dict(handler.calls), dict(handler.unmatched)
+
+
+def start_fixture_server(
+    latency=0.0, latencies=None, record=False, fixtures_dir=FIXTURES_DIR, port=0
+):
+    handler = type(
+        "ConfiguredFixtureHandler",
+        (FixtureHandler,),
+        {
+            "latency": latency,
+            "latencies": latencies or {},
+            "record": record,
+            "fixtures_dir": fixtures_dir,
+            "calls": Counter(),
+            "unmatched": Counter(),
+            "encoded": {},
+            "lock": threading.Lock(),
+        },
+    )
+    server = FixtureServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def parse_latencies(values):
+    # --host-latency codeforces.com=0.4 --host-latency supabase=0.05
+    latencies = {}
+    for value in values or []:
+        host, _, seconds = value.partition("=")
+        latencies[host] = float(seconds)
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded upstream responses.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--host-latency", action="append", metavar="HOST=SECONDS")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    args = parser.parse_args(argv)
+
+    server, base_url = start_fixture_server(
+        args.latency,
+        parse_latencies(args.host_latency),
+        args.record,
+        args.fixtures,
+        args.port,
+    )
+    print(f"{'Recording' if args.record else 'Replaying'} upstreams on {base_url}")
+    print(f"  UPSTREAM_STUB_URL={base_url} SUPABASE_URL={base_url}/supabase")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Measures how long a fresh interpreter takes to import a module (app by
+# default), which is what every gunicorn worker and script pays at boot,
+# and lists the slowest imports from `python -X importtime`.
+#
+#   python -m benchmarks.import_profile --runs 10 --module app
+
+FAKE_ENV = {
+    "SUPABASE_URL": "http://127.0.0.1:9/supabase",
+    "SUPABASE_KEY": "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYmVuY2gifQ.YmVuY2g",
+    "SUPABASE_SERVICE_KEY": "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYmVuY2gifQ.YmVuY2g",
+    "GROQ_API_KEY": "fake",
+    "SECRET_KEY": "benchmark",
+}
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+TIMER = (
+    "import time; started = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def interpreter_env():
+    env = dict(os.environ)
+    for name, value in FAKE_ENV.items():
+        env.setdefault(name, value)
+    return env
+
+
+def time_import(module, env):
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER.format(module=module)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(module, env, top):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Only top-level packages, so nested imports aren't counted twice.
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match and "." not in match.group(4):
+            name = match.group(4)
+            cumulative[name] = max(cumulative.get(name, 0), int(match.group(2)))
+
+    ranked = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)
+    return [{"module": name, "ms": us / 1000} for name, us in ranked[:top]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile module import time.")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    env = interpreter_env()
+    timings = [time_import(args.module, env) for _ in range(args.runs)]
+
+    results = {
+        "label": args.label,
+        "module": args.module,
+        "runs": args.runs,
+        "import_median_ms": statistics.median(timings) * 1000,
+        "import_min_ms": min(timings) * 1000,
+        "slowest_imports": slowest_imports(args.module, env, args.top),
+    }
+
+    print(json.dumps(results, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
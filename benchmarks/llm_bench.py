@@ -0,0 +1,279 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_llm import start_fake_llm  # noqa: E402
+
+CONTEXTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "contexts")
+
+# Replays recorded user contexts through llm.get_ai_response and
+# llm.feedback_generator and reports latency, token usage, time to first
+# token and schema conformance. By default the calls go to a local fake
+# server; pass --backend groq to measure the real provider.
+#
+#   python -m benchmarks.llm_bench --runs 5 --out results.json
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def validate(instance, schema, path="$"):
+    # Covers the subset of JSON Schema used by llm.section_schemas.
+    kind = schema.get("type")
+    errors = []
+
+    if kind == "object":
+        if not isinstance(instance, dict):
+            return [f"{path}: expected object"]
+        for name in schema.get("required", []):
+            if name not in instance:
+                errors.append(f"{path}.{name}: missing")
+        properties = schema.get("properties", {})
+        for name, value in instance.items():
+            if name in properties:
+                errors.extend(validate(value, properties[name], f"{path}.{name}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}.{name}: unexpected property")
+    elif kind == "array":
+        if not isinstance(instance, list):
+            return [f"{path}: expected array"]
+        if len(instance) < schema.get("minItems", 0):
+            errors.append(f"{path}: fewer than {schema['minItems']} items")
+        for i, item in enumerate(instance):
+            errors.extend(validate(item, schema.get("items", {}), f"{path}[{i}]"))
+    elif kind == "string" and not isinstance(instance, str):
+        errors.append(f"{path}: expected string")
+
+    return errors
+
+
+class RecordingCompletions:
+    # Wraps client.chat.completions so every call made by llm.py is timed and
+    # its token usage recorded. With measure_ttft the call is streamed and
+    # reassembled, which lets us see the first token without changing llm.py.
+
+    def __init__(self, completions, measure_ttft=True):
+        self._completions = completions
+        self.measure_ttft = measure_ttft
+        self.calls = []
+
+    def create(self, **kwargs):
+        record = {
+            "latency": None,
+            "ttft": None,
+            "prompt_tokens": None,
+            "completion_tokens": None,
+            "error": None,
+        }
+        started = time.perf_counter()
+
+        try:
+            if self.measure_ttft:
+                return self._create_streamed(kwargs, record, started)
+
+            response = self._completions.create(**kwargs)
+            self._record_usage(record, response.usage)
+            return response
+
+        except Exception as e:
+            record["error"] = repr(e)
+            raise
+
+        finally:
+            record["latency"] = time.perf_counter() - started
+            self.calls.append(record)
+
+    def _create_streamed(self, kwargs, record, started):
+        parts = []
+        usage = None
+
+        for chunk in self._completions.create(stream=True, **kwargs):
+            if chunk.choices and chunk.choices[0].delta.content:
+                if record["ttft"] is None:
+                    record["ttft"] = time.perf_counter() - started
+                parts.append(chunk.choices[0].delta.content)
+
+            x_groq = getattr(chunk, "x_groq", None)
+            usage = (
+                getattr(chunk, "usage", None) or getattr(x_groq, "usage", None) or usage
+            )
+
+        self._record_usage(record, usage)
+
+        message = SimpleNamespace(role="assistant", content="".join(parts))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    def _record_usage(self, record, usage):
+        if usage is not None:
+            record["prompt_tokens"] = usage.prompt_tokens
+            record["completion_tokens"] = usage.completion_tokens
+
+
+def load_contexts(pattern):
+    contexts = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8") as f:
+            context = json.load(f)
+        context.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+        contexts.append(context)
+    return contexts
+
+
+def run_chat(llm, recorder, context):
+    samples = []
+    for turn in context.get("chat", []):
+        first_call = len(recorder.calls)
+        started = time.perf_counter()
+        llm.get_ai_response(turn["query"], turn.get("context", []))
+        samples.append(
+            {
+                "latency": time.perf_counter() - started,
+                "calls": recorder.calls[first_call:],
+                "schema_errors": [],
+            }
+        )
+    return samples
+
+
+def run_feedback(llm, recorder, context):
+    feedback_context = context.get("feedback")
+    if not feedback_context:
+        return []
+
+    first_call = len(recorder.calls)
+    started = time.perf_counter()
+    feedback = llm.feedback_generator(
+        feedback_context["info"], previous=feedback_context.get("previous")
+    )
+    latency = time.perf_counter() - started
+
+    if "error" in feedback:
+        schema_errors = [f"$: {feedback['error']}"]
+    else:
+        schema_errors = []
+        for name in llm.FEEDBACK_SECTIONS:
+            schema_errors.extend(
+                validate(feedback.get(name), llm.section_schemas[name], f"$.{name}")
+            )
+
+    return [
+        {
+            "latency": latency,
+            "calls": recorder.calls[first_call:],
+            "schema_errors": schema_errors,
+        }
+    ]
+
+
+def summarize(samples):
+    calls = [c for s in samples for c in s["calls"]]
+    latencies = [s["latency"] for s in samples]
+    ttfts = [c["ttft"] for c in calls if c["ttft"] is not None]
+    prompt_tokens = [c["prompt_tokens"] for c in calls if c["prompt_tokens"]]
+    completion_tokens = [
+        c["completion_tokens"] for c in calls if c["completion_tokens"]
+    ]
+
+    def mean(values):
+        return sum(values) / len(values) if values else None
+
+    return {
+        "invocations": len(samples),
+        "model_calls": len(calls),
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p95_s": percentile(latencies, 95),
+        "ttft_p50_s": percentile(ttfts, 50),
+        "ttft_p95_s": percentile(ttfts, 95),
+        "prompt_tokens_per_call": mean(prompt_tokens),
+        "completion_tokens_per_call": mean(completion_tokens),
+        "error_rate": (
+            sum(1 for c in calls if c["error"]) / len(calls) if calls else 0.0
+        ),
+        "schema_failure_rate": (
+            sum(1 for s in samples if s["schema_errors"]) / len(samples)
+            if samples
+            else 0.0
+        ),
+        "schema_errors": sorted({e for s in samples for e in s["schema_errors"]})[:20],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark AlgoDash LLM calls.")
+    parser.add_argument("--backend", choices=["fake", "groq"], default="fake")
+    parser.add_argument(
+        "--base-url", help="OpenAI-compatible endpoint to use instead of Groq"
+    )
+    parser.add_argument(
+        "--contexts", default=os.path.join(CONTEXTS_DIR, "*.json"), help="glob"
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--fake-latency", type=float, default=0.2)
+    parser.add_argument("--fake-ttft", type=float, default=0.05)
+    parser.add_argument("--no-stream", action="store_true", help="skip TTFT")
+    parser.add_argument("--label", default="")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url
+    if args.backend == "fake":
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        server, base_url = start_fake_llm(args.fake_latency, args.fake_ttft)
+
+    from groq import Groq
+
+    import llm
+
+    real_client = Groq(api_key=os.getenv("GROQ_API_KEY"), base_url=base_url)
+    recorder = RecordingCompletions(
+        real_client.chat.completions, measure_ttft=not args.no_stream
+    )
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=recorder))
+
+    contexts = load_contexts(args.contexts)
+    if not contexts:
+        parser.error(f"no recorded contexts match {args.contexts}")
+
+    chat_samples = []
+    feedback_samples = []
+    for _ in range(args.runs):
+        for context in contexts:
+            chat_samples.extend(run_chat(llm, recorder, context))
+            feedback_samples.extend(run_feedback(llm, recorder, context))
+
+    results = {
+        "label": args.label,
+        "backend": args.backend if not args.base_url else args.base_url,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "runs": args.runs,
+        "contexts": [c["name"] for c in contexts],
+        "get_ai_response": summarize(chat_samples),
+        "feedback_generator": summarize(feedback_samples),
+    }
+
+    if args.backend == "fake":
+        server.shutdown()
+
+    print(json.dumps(results, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+from flask import Flask
+from flask.sessions import SecureCookieSessionInterface
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.e2e_bench import configure_environment  # noqa: E402
+from benchmarks.fake_llm import start_fake_llm  # noqa: E402
+from benchmarks.fixture_server import (  # noqa: E402
+    parse_latencies,
+    start_fixture_server,
+)
+from benchmarks.llm_bench import percentile  # noqa: E402
+
+# Runs the app under gunicorn against the fixture server and the fake LLM,
+# then simulates logged-in users at increasing concurrency. Each virtual user
+# loops over a weighted mix of pages with some think time in between, and
+# now and then switches to a new identity so the caches see cold users too.
+#
+#   python -m benchmarks.load_test --levels 1,5,10,25 --duration 20 \
+#       --workers 2 --threads 8 --out load.json
+
+DEFAULT_MIX = "dashboard=5,problem_recommendation=2,chat=2,ai_feedback=1"
+
+DASHBOARD_CARDS = [
+    "/dashboard/data/leetcode",
+    "/dashboard/data/codeforces",
+    "/dashboard/data/codechef",
+    "/dashboard/data/tags",
+]
+
+CHAT_DOUBTS = [
+    "Why does my binary search loop forever when lo and hi are adjacent?",
+    "How do I know when a greedy choice is safe for interval scheduling?",
+    "What state should a dp over subsets keep for the travelling salesman?",
+]
+
+CACHE_LINE_RE = re.compile(r"^cache_requests_total\{(.*)\} (\d+(?:\.\d+)?)$")
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ACTIONS:
+            raise argparse.ArgumentTypeError(f"unknown page {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def session_serializer(secret_key):
+    # Sessions are signed the same way the app signs them, so virtual users
+    # are logged in without going through Supabase auth.
+    signer = Flask("load_test")
+    signer.secret_key = secret_key
+    return SecureCookieSessionInterface().get_signing_serializer(signer)
+
+
+def identity(serializer, name):
+    return serializer.dumps(
+        {
+            "user_id": name,
+            "username": name,
+            "leetcode_username": f"{name}_lc",
+            "codeforces_username": f"{name}_cf",
+            "codechef_username": f"{name}_cc",
+        }
+    )
+
+
+def get_dashboard(http, base_url, timeout, rng, cards):
+    responses = [http.get(f"{base_url}/dashboard", timeout=timeout)]
+    responses.extend(
+        cards.map(
+            lambda path: http.get(f"{base_url}{path}", timeout=timeout), DASHBOARD_CARDS
+        )
+    )
+    return responses
+
+
+def get_problem_recommendation(http, base_url, timeout, rng, cards):
+    return [http.get(f"{base_url}/problem_recommendation", timeout=timeout)]
+
+
+def post_chat(http, base_url, timeout, rng, cards):
+    return [
+        http.post(
+            f"{base_url}/chat", json={"doubt": rng.choice(CHAT_DOUBTS)}, timeout=timeout
+        )
+    ]
+
+
+def get_ai_feedback(http, base_url, timeout, rng, cards):
+    return [http.get(f"{base_url}/ai_feedback", timeout=timeout)]
+
+
+ACTIONS = {
+    "dashboard": get_dashboard,
+    "problem_recommendation": get_problem_recommendation,
+    "chat": post_chat,
+    "ai_feedback": get_ai_feedback,
+}
+
+
+def virtual_user(index, args, serializer, deadline, samples, lock, level):
+    rng = random.Random(args.seed * 1000 + level * 100 + index)
+    names, weights = zip(*args.mix.items())
+    http = requests.Session()
+    generation = 0
+
+    def new_identity():
+        http.cookies.set(
+            "session", identity(serializer, f"load-{level}-{index}-{generation}")
+        )
+
+    new_identity()
+
+    with ThreadPoolExecutor(max_workers=len(DASHBOARD_CARDS)) as cards:
+        while time.perf_counter() < deadline:
+            if rng.random() < args.churn:
+                generation += 1
+                new_identity()
+
+            action = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            sample = {"action": action, "requests": 0, "error": None}
+
+            try:
+                responses = ACTIONS[action](
+                    http, args.base_url, args.timeout, rng, cards
+                )
+                sample["requests"] = len(responses)
+                bad = [r.status_code for r in responses if r.status_code >= 400]
+                if bad:
+                    sample["error"] = f"HTTP {bad[0]}"
+            except requests.Timeout:
+                sample["error"] = "timeout"
+            except Exception as e:
+                sample["error"] = type(e).__name__
+
+            sample["latency"] = time.perf_counter() - started
+            with lock:
+                samples.append(sample)
+
+            time.sleep(rng.uniform(0, 2 * args.think_time))
+
+
+def scrape_cache_counts(base_url, workers):
+    # Each gunicorn worker has its own counters and answers whichever scrape
+    # it happens to accept, so scrape until every worker has been seen.
+    counts = {}
+    for _ in range(workers * 10):
+        try:
+            text = requests.get(f"{base_url}/metrics", timeout=5).text
+        except requests.RequestException:
+            continue
+
+        pid = re.search(r'worker_info\{pid="(\d+)"\}', text)
+        if pid is None:
+            continue
+
+        worker = {"hit": 0, "miss": 0}
+        for line in text.splitlines():
+            match = CACHE_LINE_RE.match(line)
+            if match:
+                result = "hit" if 'result="hit"' in match.group(1) else "miss"
+                worker[result] += float(match.group(2))
+        counts[pid.group(1)] = worker
+
+        if len(counts) >= workers:
+            break
+    return counts
+
+
+def cache_hit_rate(before, after):
+    hits = misses = 0
+    for pid, worker in after.items():
+        previous = before.get(pid, {"hit": 0, "miss": 0})
+        hits += worker["hit"] - previous["hit"]
+        misses += worker["miss"] - previous["miss"]
+    return hits / (hits + misses) if hits + misses else None
+
+
+def run_level(level, concurrency, args, serializer, server):
+    samples = []
+    lock = threading.Lock()
+
+    before = scrape_cache_counts(args.base_url, args.workers)
+    server.reset_counts()
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(
+            target=virtual_user,
+            args=(i, args, serializer, deadline, samples, lock, level),
+        )
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    calls, _ = server.snapshot_counts()
+    after = scrape_cache_counts(args.base_url, args.workers)
+
+    requests_made = sum(s["requests"] for s in samples)
+    latencies = [s["latency"] for s in samples if not s["error"]]
+    per_action = defaultdict(list)
+    for s in samples:
+        if not s["error"]:
+            per_action[s["action"]].append(s["latency"])
+
+    return {
+        "concurrency": concurrency,
+        "pages": len(samples),
+        "requests": requests_made,
+        "pages_per_s": len(samples) / elapsed,
+        "requests_per_s": requests_made / elapsed,
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p95_s": percentile(latencies, 95),
+        "latency_p99_s": percentile(latencies, 99),
+        "error_rate": (
+            sum(1 for s in samples if s["error"]) / len(samples) if samples else 0.0
+        ),
+        "timeouts": sum(1 for s in samples if s["error"] == "timeout"),
+        "upstream_calls_per_request": (
+            sum(calls.values()) / requests_made if requests_made else None
+        ),
+        "upstream_calls": calls,
+        "cache_hit_rate": cache_hit_rate(before, after),
+        "pages_by_action": {
+            action: {
+                "count": len(values),
+                "latency_p50_s": percentile(values, 50),
+                "latency_p95_s": percentile(values, 95),
+            }
+            for action, values in sorted(per_action.items())
+        },
+    }
+
+
+def start_gunicorn(args):
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "app:app",
+        "--bind",
+        f"127.0.0.1:{args.port}",
+        "--workers",
+        str(args.workers),
+        "--worker-class",
+        args.worker_class,
+        "--timeout",
+        str(int(args.timeout) + 30),
+        "--log-level",
+        "warning",
+        "--threads",
+        str(args.threads),
+    ]
+
+    # Only stderr is kept, for real errors.
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {process.returncode}")
+        try:
+            requests.get(f"{args.base_url}/", timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def print_header():
+    print(
+        f"{'users':>6} {'pages/s':>8} {'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>7}"
+        f" {'errors':>7} {'up/req':>7} {'hit%':>6}"
+    )
+
+
+def print_row(r):
+    hit = r["cache_hit_rate"]
+    up = r["upstream_calls_per_request"]
+    print(
+        f"{r['concurrency']:>6} {r['pages_per_s']:>8.1f} {r['requests_per_s']:>8.1f}"
+        f" {r['latency_p50_s'] or 0:>7.3f} {r['latency_p95_s'] or 0:>7.3f}"
+        f" {r['latency_p99_s'] or 0:>7.3f} {r['error_rate']:>7.1%}"
+        f" {up if up is not None else 0:>7.2f}"
+        f" {'-' if hit is None else f'{hit:.0%}':>6}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test AlgoDash.")
+    parser.add_argument("--levels", default="1,5,10,25", help="virtual users")
+    parser.add_argument("--duration", type=float, default=20, help="seconds per level")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean seconds")
+    parser.add_argument("--churn", type=float, default=0.1, help="new-user chance")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--worker-class", default="gthread")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--latency", type=float, default=0.1, help="per upstream")
+    parser.add_argument("--host-latency", action="append", metavar="HOST=SECONDS")
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+    args.base_url = f"http://127.0.0.1:{args.port}"
+
+    server, stub_url = start_fixture_server(
+        args.latency, parse_latencies(args.host_latency)
+    )
+    llm_server, llm_url = start_fake_llm(args.llm_latency, min(0.1, args.llm_latency))
+    configure_environment(stub_url, llm_url)
+    serializer = session_serializer(os.environ["SECRET_KEY"])
+
+    app_process = start_gunicorn(args)
+    levels = []
+    print_header()
+    try:
+        for level, concurrency in enumerate(int(n) for n in args.levels.split(",")):
+            levels.append(run_level(level, concurrency, args, serializer, server))
+            print_row(levels[-1])
+    finally:
+        app_process.terminate()
+        app_process.wait()
+        server.shutdown()
+        llm_server.shutdown()
+
+    results = {
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "gunicorn": {
+            "workers": args.workers,
+            "threads": args.threads,
+            "worker_class": args.worker_class,
+        },
+        "duration_s": args.duration,
+        "mix": args.mix,
+        "think_time_s": args.think_time,
+        "churn": args.churn,
+        "upstream_latency_s": args.latency,
+        "llm_latency_s": args.llm_latency,
+        "levels": levels,
+    }
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
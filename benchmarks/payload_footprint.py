@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import load_fixture  # noqa: E402
+
+# Measures what one user's profile data costs in the cache: pickled bytes
+# per key (SimpleCache keeps values pickled), the time to pickle and unpickle
+# them, and the memory the unpickled dashboard entries take. Compares the
+# full upstream payloads with the projections cached now.
+#
+# The recorded LeetCode profile has an empty submission calendar and no
+# recent submissions; they are padded to a typical size unless --as-recorded.
+#
+#   python -m benchmarks.payload_footprint --out footprint.json
+
+
+def fixture_response(name):
+    fixture = load_fixture(name)
+    return httpx.Response(fixture["status"], json=fixture["body"])
+
+
+def padded_leetcode_profile(profile, calendar_days, recent_submissions):
+    profile = dict(profile)
+    start = 1700000000
+    profile["submissionCalendar"] = {
+        str(start + day * 86400): day % 7 + 1 for day in range(calendar_days)
+    }
+    profile["recentSubmissions"] = [
+        {
+            "title": f"Problem {i}",
+            "titleSlug": f"problem-{i}",
+            "timestamp": str(start + i * 3600),
+            "statusDisplay": "Accepted" if i % 3 else "Wrong Answer",
+            "lang": "cpp",
+        }
+        for i in range(recent_submissions)
+    ]
+    return profile
+
+
+def raw_components(args):
+    import info
+
+    submissions = fixture_response("cf_user_status").json()["result"]
+    leetcode_profile = info._leetcode_submission_info_from(
+        fixture_response("lc_profile")
+    )
+    if not args.as_recorded:
+        leetcode_profile = padded_leetcode_profile(
+            leetcode_profile, args.calendar_days, args.recent_submissions
+        )
+
+    return {
+        "codeforces": {
+            "tag_distribution": info._topic_distribution_from(
+                info._accepted_problems_from(submissions)
+            ),
+            "language_stats": info._most_used_lang_from(submissions),
+            "user_info": info._codeforces_user_info_from(
+                fixture_response("cf_user_info")
+            ),
+            "blogs": info._blog_info_from(fixture_response("cf_user_blogs")),
+            "rating_history": info._rating_history_from(
+                fixture_response("cf_user_rating")
+            ),
+        },
+        "leetcode": {
+            "user_info": leetcode_profile,
+            "language_stats": {"language": "C++"},
+            "tag_distribution": info._leetcode_tag_distribution_from(
+                fixture_response("lc_skill_stats")
+            ),
+        },
+        "codechef": {
+            "user_info": info._codechef_profile_stats_from(fixture_response("cc_user"))
+        },
+    }
+
+
+def full_profile(platform, components):
+    # What was cached before projections: the profiles built from the
+    # untrimmed payloads.
+    import info
+
+    if platform == "codeforces":
+        return info._codeforces_profile_from_components(**components)
+    elif platform == "leetcode":
+        return info._leetcode_profile_from(
+            dict(components["user_info"]),
+            components["language_stats"],
+            components["tag_distribution"],
+        )
+    return components["user_info"]
+
+
+def cache_entries(components, project):
+    # The values one user's dashboard writes: each component, each platform
+    # entry and the combined profile entry.
+    import info
+
+    entries = {}
+    profiles = {}
+    for platform, values in components.items():
+        if project:
+            values = {
+                name: info.project_component(platform, name, value)
+                for name, value in values.items()
+            }
+        for name, value in values.items():
+            entries[f"{platform}:handle:{name}"] = value
+
+        profile = (
+            info.profile_from_components(platform, values)
+            if project
+            else full_profile(platform, values)
+        )
+        profiles[platform] = {"connected": True, "data": profile}
+        entries[f"user:1:platform:{platform}"] = profiles[platform]
+
+    entries["user:1:profile"] = profiles
+    return entries
+
+
+def measure(entries, runs):
+    pickled = {
+        key: pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        for key, value in entries.items()
+    }
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        for value in entries.values():
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    dumps_seconds = (time.perf_counter() - started) / runs
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        for data in pickled.values():
+            pickle.loads(data)
+    loads_seconds = (time.perf_counter() - started) / runs
+
+    tracemalloc.start()
+    loaded = pickle.loads(pickled["user:1:profile"])
+    resident, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+
+    return {
+        "pickled_bytes": sum(len(data) for data in pickled.values()),
+        "pickled_bytes_per_key": {key: len(data) for key, data in pickled.items()},
+        "profile_entry_resident_bytes": resident,
+        "dumps_ms": dumps_seconds * 1000,
+        "loads_ms": loads_seconds * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure the cached footprint of one user's profile data."
+    )
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--calendar-days", type=int, default=365)
+    parser.add_argument("--recent-submissions", type=int, default=20)
+    parser.add_argument("--as-recorded", action="store_true", help="don't pad")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("PROBLEM_CATALOG_PATH", "")
+    components = raw_components(args)
+
+    full = measure(cache_entries(components, project=False), args.runs)
+    projected = measure(cache_entries(components, project=True), args.runs)
+
+    results = {
+        "full": full,
+        "projected": projected,
+        "pickled_bytes_saved_per_user": full["pickled_bytes"]
+        - projected["pickled_bytes"],
+    }
+
+    print(json.dumps(results, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
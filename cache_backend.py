@@ -0,0 +1,296 @@
+import heapq
+import os
+import threading
+import time
+
+from cachelib.serializers import SimpleSerializer
+from flask_caching.backends.base import BaseCache
+
+from metrics import inc
+
+# In-process cache backend that knows what its entries cost. Every value is
+# stored pickled and its size counted; the cache as a whole stays under
+# max_bytes and each owner (a user, or a platform handle) under
+# owner_quota_bytes, so one user with huge histories can't push out
+# everyone else's entries.
+#
+# Eviction is GreedyDual-Size: an entry's priority is the cost of computing
+# it again divided by its size, plus an inflation value that rises to the
+# priority of each evicted entry. Entries that are never read sink below
+# newer ones, which makes this LRU when costs and sizes are equal. Cheap,
+# large entries go first.
+
+MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 128 * 1024 * 1024))
+OWNER_QUOTA_BYTES = int(os.getenv("CACHE_OWNER_QUOTA_BYTES", 2 * 1024 * 1024))
+# Per-entry bookkeeping (dict slot, entry object, key) not in the payload.
+ENTRY_OVERHEAD_BYTES = 200
+EXPIRED_SWEEP_SECONDS = 5
+
+# Relative cost of recomputing an entry, by key family (see key_family).
+# Anything not listed costs 1: a re-render or an assembly from other entries.
+COSTS = {
+    "codeforces:tag_distribution": 10,
+    "codeforces:language_stats": 10,
+    "codeforces:recent_failures": 6,
+    "codeforces:rating_history": 4,
+    "codeforces:user_info": 2,
+    "codeforces:blogs": 2,
+    "codeforces:rating_series": 2,
+    "leetcode:user_info": 6,
+    "leetcode:language_stats": 4,
+    "leetcode:tag_distribution": 4,
+    "leetcode:recent_failures": 4,
+    "codechef:user_info": 6,
+    "user:recs": 8,
+    "user:row": 5,
+    "user:tag": 3,
+    "user:platform": 3,
+    "user:profile": 3,
+}
+
+
+def key_family(key):
+    # user:{id}:{family}[:...], {platform}:{handle}:{component}
+    parts = key.split(":")
+    if parts[0] == "user":
+        return f"user:{parts[2]}" if len(parts) > 2 else "user"
+    return f"{parts[0]}:{parts[-1]}"
+
+
+def key_owner(key):
+    parts = key.split(":")
+    if len(parts) < 3:
+        return None
+    return f"{parts[0]}:{parts[1]}"
+
+
+class _Entry:
+    __slots__ = ("data", "expires", "size", "family", "owner", "priority", "seq")
+
+    def __init__(self, data, expires, size, family, owner):
+        self.data = data
+        self.expires = expires
+        self.size = size
+        self.family = family
+        self.owner = owner
+        self.priority = 0
+        self.seq = 0
+
+    def expired(self, now):
+        return self.expires != 0 and self.expires <= now
+
+
+class BudgetCache(BaseCache):
+    serializer = SimpleSerializer()
+
+    def __init__(
+        self,
+        max_bytes=MAX_BYTES,
+        owner_quota_bytes=OWNER_QUOTA_BYTES,
+        default_timeout=300,
+        ignore_delete_many_errors=False,
+    ):
+        BaseCache.__init__(
+            self,
+            default_timeout=default_timeout,
+            ignore_delete_many_errors=ignore_delete_many_errors,
+        )
+        self.max_bytes = max_bytes
+        self.owner_quota_bytes = owner_quota_bytes
+        self._entries = {}
+        self._owners = {}
+        self._heap = []
+        self._seq = 0
+        self._inflation = 0.0
+        self._bytes = 0
+        self._families = {}
+        self._swept_at = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(
+            max_bytes=config.get("CACHE_MAX_BYTES", MAX_BYTES),
+            owner_quota_bytes=config.get("CACHE_OWNER_QUOTA_BYTES", OWNER_QUOTA_BYTES),
+        )
+        return cls(*args, **kwargs)
+
+    def _family_stats(self, family):
+        stats = self._families.get(family)
+        if stats is None:
+            stats = self._families[family] = {
+                "entries": 0,
+                "bytes": 0,
+                "evictions": {},
+            }
+        return stats
+
+    def _touch(self, key, entry):
+        entry.priority = self._inflation + COSTS.get(entry.family, 1) / entry.size
+        self._seq += 1
+        entry.seq = self._seq
+        heapq.heappush(self._heap, (entry.priority, entry.seq, key))
+
+        # Touches leave stale heap items behind; rebuild once they dominate.
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(e.priority, e.seq, k) for k, e in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _remove(self, key, reason=None):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+        if entry.owner is not None:
+            owned = self._owners[entry.owner]
+            owned[0] -= entry.size
+            owned[1].discard(key)
+            if not owned[1]:
+                del self._owners[entry.owner]
+
+        stats = self._family_stats(entry.family)
+        stats["entries"] -= 1
+        stats["bytes"] -= entry.size
+        if reason is not None:
+            self._count_eviction(entry.family, reason)
+
+    def _count_eviction(self, family, reason):
+        evictions = self._family_stats(family)["evictions"]
+        evictions[reason] = evictions.get(reason, 0) + 1
+        inc("cache_evictions_total", {"family": family, "reason": reason})
+
+    def _evict_one(self):
+        while self._heap:
+            priority, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry.seq == seq:
+                self._inflation = priority
+                self._remove(key, "budget")
+                return True
+        return False
+
+    def _sweep_expired(self, now):
+        self._swept_at = now
+        for key in [k for k, e in self._entries.items() if e.expired(now)]:
+            self._remove(key, "expired")
+
+    def _make_room(self, key, entry):
+        now = time.time()
+        if self._bytes + entry.size > self.max_bytes:
+            if now - self._swept_at >= EXPIRED_SWEEP_SECONDS:
+                self._sweep_expired(now)
+            while self._bytes + entry.size > self.max_bytes and self._evict_one():
+                pass
+
+        owned = self._owners.get(entry.owner)
+        while owned is not None and owned[0] + entry.size > self.owner_quota_bytes:
+            victim = min(owned[1], key=lambda k: self._entries[k].priority)
+            self._remove(victim, "quota")
+            owned = self._owners.get(entry.owner)
+
+    def _store(self, key, value, timeout):
+        data = self.serializer.dumps(value)
+        timeout = self._normalize_timeout(timeout)
+        entry = _Entry(
+            data,
+            time.time() + timeout if timeout > 0 else 0,
+            len(data) + len(key) + ENTRY_OVERHEAD_BYTES,
+            key_family(key),
+            key_owner(key),
+        )
+
+        if key in self._entries:
+            self._remove(key)
+
+        limit = self.max_bytes
+        if entry.owner is not None:
+            limit = min(limit, self.owner_quota_bytes)
+        if entry.size > limit:
+            self._count_eviction(entry.family, "too_large")
+            return False
+
+        self._make_room(key, entry)
+
+        self._entries[key] = entry
+        self._bytes += entry.size
+        if entry.owner is not None:
+            owned = self._owners.setdefault(entry.owner, [0, set()])
+            owned[0] += entry.size
+            owned[1].add(key)
+
+        stats = self._family_stats(entry.family)
+        stats["entries"] += 1
+        stats["bytes"] += entry.size
+
+        self._touch(key, entry)
+        return True
+
+    def _live(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expired(time.time()):
+            self._remove(key, "expired")
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return None
+            self._touch(key, entry)
+            data = entry.data
+        return self.serializer.loads(data)
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            return self._store(key, value, timeout)
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            return self._store(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def has(self, key):
+        with self._lock:
+            return self._live(key) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._owners.clear()
+            self._heap.clear()
+            self._families.clear()
+            self._bytes = 0
+            self._inflation = 0.0
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "entries": len(self._entries),
+                "owners": len(self._owners),
+                "owner_quota_bytes": self.owner_quota_bytes,
+                "families": {
+                    family: {**stats, "evictions": dict(stats["evictions"])}
+                    for family, stats in sorted(self._families.items())
+                },
+            }
+
+    def gauges(self):
+        stats = self.stats()
+        yield "cache_bytes", {}, stats["bytes"]
+        yield "cache_entries", {}, stats["entries"]
+        for family, family_stats in stats["families"].items():
+            yield "cache_family_bytes", {"family": family}, family_stats["bytes"]
+            yield "cache_family_entries", {"family": family}, family_stats["entries"]
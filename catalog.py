@@ -0,0 +1,350 @@
+import array
+import bisect
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+
+# Problem catalogs (every Codeforces and LeetCode problem) kept in a compact
+# binary file that each worker maps read-only, so the page cache holds one
+# copy for all of them instead of a list of dicts per worker.
+#
+# The file is a header, a section table and one fixed-width array per column.
+# Rows are sorted by platform then rating, so a rating band is a bisect away;
+# each (platform, tag) has a posting list of row ids in the same order. Tags
+# are interned, and titles, slugs and tag names live in one string table.
+# Arrays use native byte order: the file is built and read on the same host.
+
+MAGIC = b"ALGOCAT1"
+HEADER = struct.Struct("=8sIId")
+SECTION = struct.Struct("=QQ")
+
+PLATFORMS = ("codeforces", "leetcode")
+DIFFICULTIES = ("unknown", "easy", "medium", "hard")
+
+PREMIUM = 1
+NOT_PROGRAMMING = 2
+
+# (name, array typecode), in file order.
+COLUMNS = [
+    ("platform", "B"),
+    ("difficulty", "B"),
+    ("flags", "B"),
+    ("tag_count", "B"),
+    ("rating", "H"),
+    ("ac_rate", "H"),
+    ("title_len", "H"),
+    ("slug_len", "H"),
+    ("solved_count", "I"),
+    ("number", "I"),
+    ("title_at", "I"),
+    ("slug_at", "I"),
+    ("tags_at", "I"),
+    ("points", "f"),
+    ("problem_tags", "H"),
+    ("tag_platform", "B"),
+    ("tag_name_len", "H"),
+    ("tag_slug_len", "H"),
+    ("tag_name_at", "I"),
+    ("tag_slug_at", "I"),
+    ("posting_at", "I"),
+    ("posting_count", "I"),
+    ("postings", "I"),
+    ("strings", "B"),
+]
+
+
+def _row_order(record):
+    return (
+        PLATFORMS.index(record["platform"]),
+        record["rating"] or 0,
+        record["number"],
+        record["slug"],
+    )
+
+
+def write_catalog(path, records, built_at=None):
+    # records: dicts with platform, title, slug, number, rating, difficulty,
+    # solved_count, ac_rate, premium, programming, points and tags (a list of
+    # (name, slug) pairs). Written to a temporary file and swapped in with
+    # os.replace, so readers only ever see a complete catalog.
+    columns = {name: array.array(code) for name, code in COLUMNS}
+    strings = bytearray()
+    string_at = {}
+    tag_ids = {}
+    postings = defaultdict(list)
+
+    def intern(text):
+        data = (text or "").encode("utf-8")[:65535]
+        if data not in string_at:
+            string_at[data] = len(strings)
+            strings.extend(data)
+        return string_at[data], len(data)
+
+    for row, record in enumerate(sorted(records, key=_row_order)):
+        platform = PLATFORMS.index(record["platform"])
+        title_at, title_len = intern(record["title"])
+        slug_at, slug_len = intern(record["slug"])
+
+        columns["platform"].append(platform)
+        columns["difficulty"].append(DIFFICULTIES.index(record["difficulty"]))
+        columns["flags"].append(
+            (PREMIUM if record.get("premium") else 0)
+            | (0 if record.get("programming", True) else NOT_PROGRAMMING)
+        )
+        columns["rating"].append(record["rating"] or 0)
+        columns["ac_rate"].append(round((record.get("ac_rate") or 0) * 100))
+        columns["solved_count"].append(record.get("solved_count") or 0)
+        columns["number"].append(record["number"] or 0)
+        columns["points"].append(
+            math.nan if record.get("points") is None else record["points"]
+        )
+        columns["title_at"].append(title_at)
+        columns["title_len"].append(title_len)
+        columns["slug_at"].append(slug_at)
+        columns["slug_len"].append(slug_len)
+        columns["tags_at"].append(len(columns["problem_tags"]))
+
+        tags = record["tags"][:255]
+        columns["tag_count"].append(len(tags))
+        for name, slug in tags:
+            key = (platform, slug)
+            if key not in tag_ids:
+                tag_ids[key] = len(tag_ids)
+                name_at, name_len = intern(name)
+                slug_at, slug_len = intern(slug)
+                columns["tag_platform"].append(platform)
+                columns["tag_name_at"].append(name_at)
+                columns["tag_name_len"].append(name_len)
+                columns["tag_slug_at"].append(slug_at)
+                columns["tag_slug_len"].append(slug_len)
+            columns["problem_tags"].append(tag_ids[key])
+            postings[tag_ids[key]].append(row)
+
+    for tag_id in range(len(tag_ids)):
+        columns["posting_at"].append(len(columns["postings"]))
+        columns["posting_count"].append(len(postings[tag_id]))
+        columns["postings"].extend(postings[tag_id])
+
+    columns["strings"].frombytes(bytes(strings))
+
+    row_count = len(columns["platform"])
+    offset = HEADER.size + SECTION.size * len(COLUMNS)
+    sections = []
+    for name, _ in COLUMNS:
+        offset += -offset % 8
+        size = len(columns[name]) * columns[name].itemsize
+        sections.append((offset, size))
+        offset += size
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, row_count, len(tag_ids), built_at or time.time()))
+        for section in sections:
+            f.write(SECTION.pack(*section))
+        for (name, _), (start, _) in zip(COLUMNS, sections):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(columns[name].tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+
+class Catalog:
+    # Read-only view over a mapped catalog file. Columns are memoryviews of
+    # the mapping; only the rows a caller asks for are turned into dicts.
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._map)
+        magic, self.row_count, self.tag_count, self.built_at = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a problem catalog")
+
+        self._columns = {}
+        for i, (name, code) in enumerate(COLUMNS):
+            start, size = SECTION.unpack_from(view, HEADER.size + i * SECTION.size)
+            self._columns[name] = view[start : start + size].cast(code)
+
+        self._strings = self._columns["strings"]
+        self._tag_ids = {
+            (PLATFORMS[self._columns["tag_platform"][t]], self._tag_slug(t)): t
+            for t in range(self.tag_count)
+        }
+
+        platforms = self._columns["platform"]
+        self._platform_rows = {
+            name: (
+                bisect.bisect_left(platforms, i),
+                bisect.bisect_right(platforms, i),
+            )
+            for i, name in enumerate(PLATFORMS)
+        }
+
+    def _string(self, at, length):
+        return bytes(self._strings[at : at + length]).decode("utf-8")
+
+    def _tag_slug(self, tag_id):
+        c = self._columns
+        return self._string(c["tag_slug_at"][tag_id], c["tag_slug_len"][tag_id])
+
+    def _tag_name(self, tag_id):
+        c = self._columns
+        return self._string(c["tag_name_at"][tag_id], c["tag_name_len"][tag_id])
+
+    def _posting(self, platform, tag):
+        tag_id = self._tag_ids.get((platform, tag))
+        if tag_id is None:
+            return self._columns["postings"][0:0]
+
+        at = self._columns["posting_at"][tag_id]
+        return self._columns["postings"][
+            at : at + self._columns["posting_count"][tag_id]
+        ]
+
+    def rows(self, platform, tag=None, min_rating=None, max_rating=None):
+        # Row ids of a platform's problems (with the tag, if given) in the
+        # rating band, as a slice of the mapping. As with the Codeforces API
+        # filters, unrated problems are left out once a bound is given.
+        if tag is None:
+            rows = range(*self._platform_rows[platform])
+        else:
+            rows = self._posting(platform, tag)
+
+        if min_rating is None and max_rating is None:
+            return rows
+
+        rating = self._columns["rating"].__getitem__
+        low = bisect.bisect_left(rows, max(min_rating or 0, 1), key=rating)
+        if max_rating is None:
+            return rows[low:]
+        return rows[low : bisect.bisect_right(rows, max_rating, key=rating)]
+
+    def rows_with_tags(self, platform, tags):
+        # Rows carrying every one of the tags.
+        if not tags:
+            return self.rows(platform)
+
+        postings = sorted((self._posting(platform, t) for t in tags), key=len)
+        return [
+            row
+            for row in postings[0]
+            if all(_contains(posting, row) for posting in postings[1:])
+        ]
+
+    def number(self, row):
+        return self._columns["number"][row]
+
+    def difficulty(self, row):
+        return DIFFICULTIES[self._columns["difficulty"][row]]
+
+    def record(self, row):
+        c = self._columns
+        tags_at = c["tags_at"][row]
+        tag_ids = c["problem_tags"][tags_at : tags_at + c["tag_count"][row]]
+        points = c["points"][row]
+
+        return {
+            "platform": PLATFORMS[c["platform"][row]],
+            "title": self._string(c["title_at"][row], c["title_len"][row]),
+            "slug": self._string(c["slug_at"][row], c["slug_len"][row]),
+            "number": c["number"][row],
+            "rating": c["rating"][row] or None,
+            "difficulty": DIFFICULTIES[c["difficulty"][row]],
+            "solved_count": c["solved_count"][row],
+            "ac_rate": c["ac_rate"][row] / 100,
+            "premium": bool(c["flags"][row] & PREMIUM),
+            "programming": not c["flags"][row] & NOT_PROGRAMMING,
+            "points": None if math.isnan(points) else points,
+            "tags": [self._tag_name(t) for t in tag_ids],
+        }
+
+
+def _contains(posting, row):
+    i = bisect.bisect_left(posting, row)
+    return i < len(posting) and posting[i] == row
+
+
+class CatalogFile:
+    # The catalog at `path` for this worker: reopened when another process
+    # swaps in a new file, and rebuilt in the background (by one worker at a
+    # time, claimed through a lock file) when missing or older than max_age.
+
+    CHECK_INTERVAL_SECONDS = 30
+    BUILD_LEASE_SECONDS = 600
+
+    def __init__(self, path, load_records, max_age):
+        self.path = path
+        self._load_records = load_records
+        self._max_age = max_age
+        self._catalog = None
+        self._signature = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._checked_at is not None
+                and now - self._checked_at < self.CHECK_INTERVAL_SECONDS
+            ):
+                return self._catalog
+            self._checked_at = now
+
+            try:
+                stat = os.stat(self.path)
+                signature = (stat.st_ino, stat.st_mtime_ns)
+                if signature != self._signature:
+                    self._catalog = Catalog(self.path)
+                    self._signature = signature
+            except (OSError, ValueError) as e:
+                if not isinstance(e, FileNotFoundError):
+                    print(f"Problem catalog unreadable: {e}")
+
+            catalog = self._catalog
+
+        if catalog is None or time.time() - catalog.built_at > self._max_age:
+            self._rebuild_in_background()
+        return catalog
+
+    def _claim(self):
+        lock_path = f"{self.path}.lock"
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > self.BUILD_LEASE_SECONDS:
+                    os.remove(lock_path)
+            except OSError:
+                pass
+            return False
+        except OSError as e:
+            print(f"Problem catalog lock failed: {e}")
+            return False
+
+    def _rebuild_in_background(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if self._claim():
+            threading.Thread(target=self.rebuild, daemon=True).start()
+
+    def rebuild(self):
+        try:
+            write_catalog(self.path, self._load_records())
+        except Exception as e:
+            print(f"Problem catalog rebuild failed: {e}")
+        finally:
+            try:
+                os.remove(f"{self.path}.lock")
+            except OSError:
+                pass
+            with self._lock:
+                self._checked_at = None
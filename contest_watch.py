@@ -0,0 +1,130 @@
+import threading
+import time
+from datetime import datetime
+
+from info import get_codeforces_contests, get_contest_participants, ratings_published
+
+# Codeforces ratings only change when a rated contest's results are
+# published, so rating data is cached until then rather than on a timer.
+# The watcher follows the contest schedule, and once a contest has ended it
+# checks which of the handles this worker has cached took part and polls
+# each of them until its new rating shows up, then invalidates that handle.
+
+SCHEDULE_REFRESH_SECONDS = 6 * 3600
+RATING_POLL_SECONDS = 600
+# Unrated contests never publish ratings; stop waiting after this long.
+PUBLICATION_WINDOW_SECONDS = 3 * 86400
+MAX_SLEEP_SECONDS = 600
+
+
+def _contest_end(contest):
+    if not contest.get("contest_end"):
+        return None
+    return datetime.fromisoformat(contest["contest_end"]).timestamp()
+
+
+class ContestWatcher:
+    def __init__(self, invalidate):
+        # invalidate(handle, user_ids) drops the handle's cached rating data.
+        self._invalidate = invalidate
+        self._users = {}
+        self._ends = {}
+        self._next_poll = {}
+        self._invalidated = {}
+        self._done = set()
+        self._schedule_fetched_at = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def watch(self, handle, user_id=None):
+        # The thread is only started once there is something to watch.
+        with self._lock:
+            users = self._users.setdefault(handle.lower(), (handle, set()))[1]
+            if user_id is not None:
+                users.add(user_id)
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="contest-watch", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            now = time.time()
+            try:
+                self.tick(now)
+            except Exception as e:
+                print(f"Contest watch error: {e}")
+            time.sleep(self._sleep_for(time.time()))
+
+    def _sleep_for(self, now):
+        wake = [self._schedule_fetched_at + SCHEDULE_REFRESH_SECONDS]
+        for contest_id, end in self._ends.items():
+            wake.append(max(end, self._next_poll.get(contest_id, 0)))
+
+        return min(max(min(wake) - now, 1), MAX_SLEEP_SECONDS)
+
+    def refresh_schedule(self, now):
+        # Upcoming contests give the end times to wake up for; recently
+        # finished ones may still be waiting on their ratings.
+        contests = get_codeforces_contests(upcoming=True) + get_codeforces_contests(
+            upcoming=False
+        )
+
+        for contest in contests:
+            end = _contest_end(contest)
+            contest_id = contest.get("contestId")
+            if end is None or contest_id in self._done:
+                continue
+            if now - end < PUBLICATION_WINDOW_SECONDS:
+                self._ends[contest_id] = end
+
+        self._schedule_fetched_at = now
+
+    def tick(self, now):
+        if now - self._schedule_fetched_at >= SCHEDULE_REFRESH_SECONDS:
+            self.refresh_schedule(now)
+
+        for contest_id, end in list(self._ends.items()):
+            if now < end or now < self._next_poll.get(contest_id, 0):
+                continue
+
+            if now - end > PUBLICATION_WINDOW_SECONDS or self.check(contest_id):
+                self._finish(contest_id)
+            else:
+                self._next_poll[contest_id] = now + RATING_POLL_SECONDS
+
+    def check(self, contest_id):
+        # True once every participant's new rating is out and its cached
+        # rating data has been dropped. Handles are checked one by one, so
+        # one whose rating never changes (unrated, renamed) doesn't hold back
+        # the others; it is given up on with the contest.
+        with self._lock:
+            users = dict(self._users)
+        if not users:
+            return False
+
+        invalidated = self._invalidated.setdefault(contest_id, set())
+        participants = [
+            users[handle.lower()]
+            for handle in get_contest_participants(contest_id, users)
+            if handle.lower() in users
+        ]
+        if not participants:
+            return False
+
+        for handle, user_ids in participants:
+            if handle.lower() in invalidated:
+                continue
+            if ratings_published(contest_id, handle):
+                self._invalidate(handle, set(user_ids))
+                invalidated.add(handle.lower())
+
+        return all(handle.lower() in invalidated for handle, _ in participants)
+
+    def _finish(self, contest_id):
+        self._ends.pop(contest_id, None)
+        self._next_poll.pop(contest_id, None)
+        self._invalidated.pop(contest_id, None)
+        self._done.add(contest_id)
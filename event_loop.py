@@ -0,0 +1,54 @@
+import asyncio
+import os
+import threading
+from functools import wraps
+
+# One event loop per worker process, run on a daemon thread. Flask's async
+# views are run on it (see async_to_sync) instead of on a fresh loop per
+# request, so the async HTTP and Groq clients bound to it are created once
+# and keep their connection pools between requests. The request thread
+# still waits for its view to finish; what runs concurrently is the
+# upstream and LLM I/O of all requests in flight.
+
+_loop = None
+_pid = None
+_lock = threading.Lock()
+
+
+def get_loop():
+    global _loop, _pid
+
+    # A forked worker doesn't inherit the thread running the parent's loop.
+    if _loop is None or _pid != os.getpid():
+        with _lock:
+            if _loop is None or _pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="event-loop", daemon=True
+                ).start()
+                _loop, _pid = loop, os.getpid()
+    return _loop
+
+
+def on_loop():
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+def run(coro):
+    # Runs coro on the shared loop and blocks until it is done. The caller's
+    # context variables (Flask's request and app contexts) go with it.
+    if on_loop():
+        raise RuntimeError("event_loop.run called from the shared loop")
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+def async_to_sync(func):
+    # Replacement for Flask.async_to_sync.
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return run(func(*args, **kwargs))
+
+    return wrapper
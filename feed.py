@@ -0,0 +1,134 @@
+import base64
+import binascii
+
+from render import content_hash
+
+# Paging over a user's cached recommendation ranking. Filters are applied to
+# the ranked list as it is cached, so narrowing by platform, difficulty, tag
+# or rating never recomputes recommendations. A cursor is an opaque token
+# holding the position in the filtered ranking together with the version of
+# the ranking and the filters it was issued for; it stops being valid once
+# the ranking is recomputed.
+
+FEED_PAGE_SIZE = 12
+FEED_MAX_PAGE_SIZE = 48
+
+FILTERS = ("platform", "difficulty", "tag", "min_rating", "max_rating")
+
+
+class StaleCursor(ValueError):
+    pass
+
+
+def feed_filters(args):
+    # Normalized filters from the query string; empty values mean no filter.
+    filters = {}
+    for name in ("platform", "difficulty", "tag"):
+        value = (args.get(name) or "").strip().lower()
+        if value and value != "all":
+            filters[name] = value
+
+    for name in ("min_rating", "max_rating"):
+        value = args.get(name)
+        if value not in (None, ""):
+            filters[name] = int(value)
+
+    return filters
+
+
+def _matches(problem, filters):
+    if "platform" in filters and problem.get("platform") != filters["platform"]:
+        return False
+
+    if (
+        "difficulty" in filters
+        and (problem.get("difficulty") or "").lower() != filters["difficulty"]
+    ):
+        return False
+
+    if "tag" in filters and filters["tag"] not in (
+        tag.lower() for tag in problem.get("tags") or []
+    ):
+        return False
+
+    if "min_rating" in filters or "max_rating" in filters:
+        rating = problem.get("rating")
+        if not rating:
+            return False
+        if rating < filters.get("min_rating", rating):
+            return False
+        if rating > filters.get("max_rating", rating):
+            return False
+
+    return True
+
+
+def filter_problems(problems, filters):
+    return [problem for problem in problems if _matches(problem, filters)]
+
+
+def _filters_digest(version, filters):
+    key = "|".join(f"{name}={filters.get(name, '')}" for name in FILTERS)
+    return content_hash(f"{version}|{key}")[:16]
+
+
+def encode_cursor(version, filters, offset):
+    token = f"{_filters_digest(version, filters)}:{offset}"
+    return base64.urlsafe_b64encode(token.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, version, filters):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        digest, offset = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+        offset = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Malformed cursor")
+
+    if digest != _filters_digest(version, filters) or offset < 0:
+        raise StaleCursor("Cursor is no longer valid")
+    return offset
+
+
+def facets(problems):
+    # Filter values present in the ranking, for the page's filter controls.
+    platforms = []
+    difficulties = []
+    tags = {}
+
+    for problem in problems:
+        if problem.get("platform") not in platforms:
+            platforms.append(problem.get("platform"))
+
+        difficulty = (problem.get("difficulty") or "").lower()
+        if difficulty and difficulty != "unknown" and difficulty not in difficulties:
+            difficulties.append(difficulty)
+
+        for tag in problem.get("tags") or []:
+            tags[tag.lower()] = tags.get(tag.lower(), 0) + 1
+
+    return {
+        "platforms": platforms,
+        "difficulties": difficulties,
+        "tags": sorted(tags, key=lambda tag: (-tags[tag], tag)),
+    }
+
+
+def feed_page(problems, version, filters, cursor=None, limit=FEED_PAGE_SIZE):
+    # One page of the filtered ranking and the cursor for the next one (None
+    # on the last page). Raises ValueError for a malformed cursor and
+    # StaleCursor for one issued against another ranking or other filters.
+    limit = max(1, min(limit, FEED_MAX_PAGE_SIZE))
+    offset = decode_cursor(cursor, version, filters) if cursor else 0
+
+    matching = filter_problems(problems, filters)
+    page = matching[offset : offset + limit]
+    end = offset + len(page)
+
+    return {
+        "problems": page,
+        "total": len(matching),
+        "next_cursor": (
+            encode_cursor(version, filters, end) if end < len(matching) else None
+        ),
+    }
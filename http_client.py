@@ -0,0 +1,283 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+import event_loop
+import response_cache
+from metrics import inc, record_failure, record_response, upstream_name
+from resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, hedged
+from singleflight import SingleFlight
+
+# Shared HTTP clients for the upstream fetchers in info.py. The sync session
+# keeps connections alive between calls; the async client is bound to the
+# worker's shared event loop (event_loop.py), which async callers run on.
+
+# Benchmarks point every upstream at benchmarks/fixture_server.py with this.
+UPSTREAM_STUB_URL = os.getenv("UPSTREAM_STUB_URL")
+
+ASYNC_TIMEOUT = httpx.Timeout(30.0)
+ASYNC_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50)
+
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+_async_client = None
+_async_client_lock = threading.Lock()
+
+# Identical GETs in flight at the same time (two cards asking for the same
+# handle's user.status, a double refresh) share one upstream call. Responses
+# are only read by the fetchers, so handing the same one out is safe.
+_in_flight = SingleFlight()
+
+# alfa-leetcode-api cold-starts and competeapi is a free deployment, so calls
+# to them get a shorter timeout, a circuit breaker and hedging, and their
+# last good responses are kept to serve while the breaker is open.
+GUARDED_UPSTREAMS = ("alfa-leetcode-api", "competeapi")
+GUARDED_TIMEOUT_SECONDS = 10.0
+LAST_GOOD_ENTRIES = 256
+
+_breakers = {name: CircuitBreaker(name) for name in GUARDED_UPSTREAMS}
+_latencies = {name: LatencyTracker() for name in GUARDED_UPSTREAMS}
+_last_good = OrderedDict()
+_last_good_lock = threading.Lock()
+
+
+def _upstream_url(url):
+    if not UPSTREAM_STUB_URL:
+        return url
+
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{UPSTREAM_STUB_URL}/{parts.netloc}{parts.path}{query}"
+
+
+def _flight_key(url, kwargs):
+    # Only plain GETs are shared; anything with headers, timeouts and the
+    # like goes out on its own.
+    if set(kwargs) - {"params"}:
+        return None
+
+    params = kwargs.get("params") or {}
+    return (url, tuple(sorted(params.items())))
+
+
+def _shared(url):
+    inc("upstream_requests_coalesced_total", {"upstream": upstream_name(url)})
+
+
+def _cached(url, kwargs):
+    # Returns (stored response or None, whether it can be used as is).
+    cached = response_cache.lookup(url, kwargs.get("params"))
+    if cached is not None and cached.fresh():
+        response_cache.record(url, "fresh")
+        return cached, True
+    return cached, False
+
+
+def _get(url, **kwargs):
+    cached, fresh = _cached(url, kwargs)
+    if fresh:
+        return cached.response()
+
+    started = time.perf_counter()
+    try:
+        response = session.get(
+            _upstream_url(url),
+            headers=cached.validators() if cached else None,
+            **kwargs,
+        )
+    except Exception as e:
+        record_failure(url, e, started)
+        raise
+
+    record_response(url, response, started)
+    return response_cache.update(url, kwargs.get("params"), cached, response)
+
+
+def json_response(data, status_code=200):
+    # For alternate sources whose body is reshaped to match the primary's.
+    # Marked so it is never kept as the primary URL's last good response.
+    return httpx.Response(status_code, json=data, extensions={"alternate": True})
+
+
+def upstream_states():
+    return {name: breaker.state for name, breaker in _breakers.items()}
+
+
+def _healthy(response):
+    return response.status_code < 500 and response.status_code != 429
+
+
+def _remember(url, response):
+    with _last_good_lock:
+        _last_good[url] = response
+        _last_good.move_to_end(url)
+        if len(_last_good) > LAST_GOOD_ENTRIES:
+            _last_good.popitem(last=False)
+
+
+def _last_good_response(url):
+    with _last_good_lock:
+        return _last_good.get(url)
+
+
+def _short_circuit(url, upstream):
+    response = _last_good_response(url)
+    inc(
+        "upstream_short_circuits_total",
+        {"upstream": upstream, "served": "error" if response is None else "stale"},
+    )
+    if response is None:
+        raise CircuitOpenError(f"{upstream} is unavailable")
+    return response
+
+
+def _settle(url, upstream, response=None, error=None):
+    # Feeds the outcome to the breaker and falls back to the last good
+    # response when the call failed.
+    if error is None and _healthy(response):
+        _breakers[upstream].record_success()
+        alternate = response.extensions.get("alternate")
+        if response.status_code == 200 and not alternate:
+            _remember(url, response)
+        return response
+
+    _breakers[upstream].record_failure()
+    stale = _last_good_response(url)
+    if stale is not None:
+        return stale
+    if error is not None:
+        raise error
+    return response
+
+
+def _guarded_get(url, upstream, **kwargs):
+    allowed = _breakers[upstream].allow()
+    if not allowed:
+        return _short_circuit(url, upstream)
+
+    try:
+        try:
+            response = _get(url, timeout=GUARDED_TIMEOUT_SECONDS, **kwargs)
+        except Exception as e:
+            return _settle(url, upstream, error=e)
+
+        return _settle(url, upstream, response)
+    finally:
+        _breakers[upstream].release(allowed)
+
+
+def get(url, **kwargs):
+    upstream = upstream_name(url)
+    if upstream in _breakers:
+        fetch = lambda: _guarded_get(url, upstream, **kwargs)
+    else:
+        fetch = lambda: _get(url, **kwargs)
+
+    key = _flight_key(url, kwargs)
+    if key is None:
+        return fetch()
+
+    return _in_flight.do(key, fetch, lambda: _shared(url))
+
+
+def get_async_client():
+    global _async_client
+
+    if not event_loop.on_loop():
+        raise RuntimeError("async fetchers must run on event_loop's loop")
+
+    with _async_client_lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(
+                timeout=ASYNC_TIMEOUT, limits=ASYNC_LIMITS, follow_redirects=True
+            )
+    return _async_client
+
+
+async def _aget(url, **kwargs):
+    cached, fresh = _cached(url, kwargs)
+    if fresh:
+        return cached.response()
+
+    started = time.perf_counter()
+    try:
+        response = await get_async_client().get(
+            _upstream_url(url),
+            headers=cached.validators() if cached else None,
+            **kwargs,
+        )
+    except Exception as e:
+        record_failure(url, e, started)
+        raise
+
+    record_response(url, response, started)
+    return response_cache.update(url, kwargs.get("params"), cached, response)
+
+
+async def _guarded_aget(url, upstream, hedge, **kwargs):
+    allowed = _breakers[upstream].allow()
+    if not allowed:
+        return _short_circuit(url, upstream)
+
+    try:
+        return await _breaker_aget(url, upstream, hedge, **kwargs)
+    finally:
+        _breakers[upstream].release(allowed)
+
+
+async def _breaker_aget(url, upstream, hedge, **kwargs):
+
+    latencies = _latencies[upstream]
+
+    async def first():
+        started = time.perf_counter()
+        try:
+            response = await _aget(url, timeout=GUARDED_TIMEOUT_SECONDS, **kwargs)
+        except asyncio.CancelledError:
+            # Lost to the hedge; it took at least this long.
+            latencies.observe(time.perf_counter() - started)
+            raise
+
+        if _healthy(response):
+            latencies.observe(time.perf_counter() - started)
+        return response
+
+    try:
+        response = await hedged(
+            first,
+            hedge or first,
+            latencies.hedge_delay(),
+            _healthy,
+            lambda: inc("upstream_hedged_requests_total", {"upstream": upstream}),
+        )
+    except Exception as e:
+        return _settle(url, upstream, error=e)
+
+    return _settle(url, upstream, response)
+
+
+async def aget(url, hedge=None, **kwargs):
+    # hedge: an async callable returning a response, started alongside the
+    # request once it has run longer than its upstream's p95 latency. By
+    # default the same request is sent again. Only used for GUARDED_UPSTREAMS.
+    upstream = upstream_name(url)
+    if upstream in _breakers:
+        fetch = lambda: _guarded_aget(url, upstream, hedge, **kwargs)
+    else:
+        fetch = lambda: _aget(url, **kwargs)
+
+    key = _flight_key(url, kwargs)
+    if key is None:
+        return await fetch()
+
+    return await _in_flight.do_async(key, fetch, lambda: _shared(url))
@@ -1,8 +1,21 @@
+import asyncio
+import heapq
 import os
+import re
+import time
 from collections import defaultdict
 from datetime import datetime
 
-import requests
+from catalog import DIFFICULTIES, CatalogFile
+from http_client import aget, get, json_response
+from projections import (
+    CodechefProfile,
+    CodeforcesProfile,
+    LeetCodeProfile,
+    LeetCodeUserInfo,
+    rating_points,
+)
+import submission_store
 
 BASE_URL = "https://codeforces.com/api/"
 API_BASE = os.getenv("NODE_API_URL", "http://localhost:3000")
@@ -29,12 +42,236 @@ tags_list_all = [
     "hashing",
 ]
 
+standard_tags = [
+    "data structures",
+    "strings",
+    "brute force",
+    "sortings",
+    "two pointers",
+    "trees",
+    "hashing",
+    "greedy",
+    "binary search",
+    "dfs and similar",
+    "bitmasks",
+    "math",
+    "dp",
+    "graphs",
+    "geometry",
+    "combinatorics",
+    "number theory",
+]
+
+cf_tag_mapping = {
+    "implementation": "brute force",
+    "brute force": "brute force",
+    "data structures": "data structures",
+    "dp": "dp",
+    "dynamic programming": "dp",
+    "greedy": "greedy",
+    "math": "math",
+    "sortings": "sortings",
+    "sorting": "sortings",
+    "constructive algorithms": "brute force",
+    "strings": "strings",
+    "string": "strings",
+    "two pointers": "two pointers",
+    "combinatorics": "combinatorics",
+    "graphs": "graphs",
+    "graph": "graphs",
+    "dfs and similar": "dfs and similar",
+    "dfs": "dfs and similar",
+    "bfs": "dfs and similar",
+    "trees": "trees",
+    "tree": "trees",
+    "geometry": "geometry",
+    "dsu": "data structures",
+    "flows": "graphs",
+    "graph matchings": "graphs",
+    "hashing": "hashing",
+    "number theory": "number theory",
+    "bitmasks": "bitmasks",
+    "bit manipulation": "bitmasks",
+    "binary search": "binary search",
+    "divide and conquer": "brute force",
+    "games": "math",
+    "shortest paths": "graphs",
+    "matrices": "data structures",
+    "ternary search": "binary search",
+    "probabilities": "math",
+    "chinese remainder theorem": "number theory",
+    "*special": None,
+    "string suffix structures": "strings",
+    "expression parsing": "strings",
+}
+
+leetcode_skill_tag_mapping = {
+    "math": "math",
+    "greedy": "greedy",
+    "dynamic-programming": "dp",
+    "dp": "dp",
+    "graph": "graphs",
+    "tree": "trees",
+    "binary-tree": "trees",
+    "binary-search": "binary search",
+    "depth-first-search": "dfs and similar",
+    "dfs": "dfs and similar",
+    "breadth-first-search": "dfs and similar",
+    "bfs": "dfs and similar",
+    "string": "strings",
+    "two-pointers": "two pointers",
+    "hash-table": "hashing",
+    "sorting": "sortings",
+    "bit-manipulation": "bitmasks",
+    "geometry": "geometry",
+    "combinatorics": "combinatorics",
+    "number-theory": "number theory",
+    "array": "data structures",
+    "matrix": "data structures",
+    "linked-list": "data structures",
+    "stack": "data structures",
+    "queue": "data structures",
+    "heap": "data structures",
+    "hash-map": "data structures",
+    "trie": "data structures",
+    "segment-tree": "data structures",
+    "binary-indexed-tree": "data structures",
+    "union-find": "data structures",
+    "design": "data structures",
+    "backtracking": "brute force",
+    "divide-and-conquer": "brute force",
+    "recursion": "brute force",
+    "simulation": "brute force",
+    "sliding-window": "two pointers",
+    "prefix-sum": "data structures",
+    "monotonic-stack": "data structures",
+    "monotonic-queue": "data structures",
+    "topological-sort": "graphs",
+    "quickselect": "sortings",
+}
+
+leetcode_tag_map = {
+    "dp": "dynamic-programming",
+    "data structures": "array",
+    "dfs and similar": "depth-first-search",
+    "graphs": "graph",
+    "trees": "tree",
+    "strings": "string",
+    "two pointers": "two-pointers",
+    "hashing": "hash-table",
+    "sortings": "sorting",
+    "bitmasks": "bit-manipulation",
+    "number theory": "number-theory",
+    "binary search": "binary-search",
+    "greedy": "greedy",
+    "math": "math",
+    "brute force": "backtracking",
+}
+
+codeforces_tag_map = {
+    "dp": "dp",
+    "data structures": "data structures",
+    "dfs and similar": "dfs and similar",
+    "graphs": "graphs",
+    "trees": "trees",
+    "strings": "strings",
+    "two pointers": "two pointers",
+    "hashing": "hashing",
+    "sortings": "sortings",
+    "bitmasks": "bitmasks",
+    "number theory": "number theory",
+    "binary search": "binary search",
+    "greedy": "greedy",
+    "math": "math",
+    "brute force": "brute force",
+    "combinatorics": "combinatorics",
+    "geometry": "geometry",
+}
+
 """
 CODEFORCES
 """
 
 
+def _codeforces_difficulty(rating):
+    if not rating:
+        return "unknown"
+    if rating <= 1200:
+        return "easy"
+    if rating <= 1900:
+        return "medium"
+    return "hard"
+
+
+def _codeforces_problems_from(response, seen, min_rating, max_rating, limit):
+    standardized_problems = []
+
+    if response.status_code != 200:
+        return standardized_problems
+
+    data = response.json()
+    if data.get("status") != "OK":
+        return standardized_problems
+
+    problems = data.get("result", {}).get("problems", [])
+    problem_stats = data.get("result", {}).get("problemStatistics", [])
+
+    stats_map = {f"{s.get('contestId')}_{s.get('index')}": s for s in problem_stats}
+
+    for problem in problems:
+        contest_id = problem.get("contestId")
+        index = problem.get("index")
+        key = (contest_id, index)
+
+        if key in seen:
+            continue
+
+        rating = problem.get("rating")
+
+        if min_rating is not None and (rating is None or rating < min_rating):
+            continue
+        if max_rating is not None and (rating is None or rating > max_rating):
+            continue
+
+        difficulty = _codeforces_difficulty(rating)
+
+        stat = stats_map.get(f"{contest_id}_{index}", {})
+        solved_count = stat.get("solvedCount", 0)
+
+        standardized_problems.append(
+            {
+                "platform": "codeforces",
+                "title": problem.get("name", ""),
+                "contestId": contest_id,
+                "index": index,
+                "difficulty": difficulty,
+                "rating": rating,
+                "tags": problem.get("tags", []),
+                "link": f"https://codeforces.com/problemset/problem/{contest_id}/{index}",
+                "type": problem.get("type", "PROGRAMMING"),
+                "points": problem.get("points"),
+                "solved_count": solved_count,
+                "is_contest": False,
+                "contest_start": None,
+                "contest_end": None,
+            }
+        )
+
+        seen.add(key)
+
+        if len(standardized_problems) >= limit:
+            break
+
+    return standardized_problems
+
+
 def get_codeforces_problems(tags=None, min_rating=None, max_rating=None, limit=50):
+    catalog = problem_catalog.get() if problem_catalog else None
+    if catalog is not None:
+        return _catalog_codeforces_problems(
+            catalog, tags, min_rating, max_rating, limit
+        )
+
     base_url = f"{BASE_URL}problemset.problems"
     standardized_problems = []
     seen = set()
@@ -47,72 +284,60 @@ def get_codeforces_problems(tags=None, min_rating=None, max_rating=None, limit=5
             if tag:
                 params["tags"] = tag
 
-            response = requests.get(base_url, params=params)
-            if response.status_code != 200:
-                continue
+            response = get(base_url, params=params)
+            standardized_problems.extend(
+                _codeforces_problems_from(
+                    response,
+                    seen,
+                    min_rating,
+                    max_rating,
+                    limit - len(standardized_problems),
+                )
+            )
 
-            data = response.json()
-            if data.get("status") != "OK":
-                continue
+            if len(standardized_problems) >= limit:
+                return standardized_problems
 
-            problems = data.get("result", {}).get("problems", [])
-            problem_stats = data.get("result", {}).get("problemStatistics", [])
+        return standardized_problems
 
-            stats_map = {
-                f"{s.get('contestId')}_{s.get('index')}": s for s in problem_stats
-            }
+    except Exception as e:
+        print(f"Exception in get_codeforces_problems: {e}")
+        return []
 
-            for problem in problems:
-                contest_id = problem.get("contestId")
-                index = problem.get("index")
-                key = (contest_id, index)
-
-                if key in seen:
-                    continue
-
-                rating = problem.get("rating")
-
-                if min_rating is not None and (rating is None or rating < min_rating):
-                    continue
-                if max_rating is not None and (rating is None or rating > max_rating):
-                    continue
-
-                if rating:
-                    if rating <= 1200:
-                        difficulty = "easy"
-                    elif rating <= 1900:
-                        difficulty = "medium"
-                    else:
-                        difficulty = "hard"
-                else:
-                    difficulty = "unknown"
-
-                stat = stats_map.get(f"{contest_id}_{index}", {})
-                solved_count = stat.get("solvedCount", 0)
-
-                standardized_problems.append(
-                    {
-                        "platform": "codeforces",
-                        "title": problem.get("name", ""),
-                        "contestId": contest_id,
-                        "index": index,
-                        "difficulty": difficulty,
-                        "rating": rating,
-                        "tags": problem.get("tags", []),
-                        "link": f"https://codeforces.com/problemset/problem/{contest_id}/{index}",
-                        "type": problem.get("type", "PROGRAMMING"),
-                        "points": problem.get("points"),
-                        "solved_count": solved_count,
-                        "is_contest": False,
-                        "contest_start": None,
-                        "contest_end": None,
-                    }
-                )
 
-                seen.add(key)
+async def get_codeforces_problems_async(
+    tags=None, min_rating=None, max_rating=None, limit=50
+):
+    catalog = problem_catalog.get() if problem_catalog else None
+    if catalog is not None:
+        return _catalog_codeforces_problems(
+            catalog, tags, min_rating, max_rating, limit
+        )
+
+    base_url = f"{BASE_URL}problemset.problems"
+    standardized_problems = []
+    seen = set()
+
+    tag_batches = tags if tags else [None]
+
+    try:
+        responses = await asyncio.gather(
+            *(aget(base_url, params={"tags": tag} if tag else {}) for tag in tag_batches)
+        )
+
+        for response in responses:
+            standardized_problems.extend(
+                _codeforces_problems_from(
+                    response,
+                    seen,
+                    min_rating,
+                    max_rating,
+                    limit - len(standardized_problems),
+                )
+            )
 
-                if len(standardized_problems) >= limit:
-                    return standardized_problems
+            if len(standardized_problems) >= limit:
+                return standardized_problems
 
         return standardized_problems
 
@@ -121,73 +346,121 @@ def get_codeforces_problems(tags=None, min_rating=None, max_rating=None, limit=5
         return []
 
 
+def _codeforces_contests_from(response, upcoming):
+    if response.status_code == 200:
+        data = response.json()
+
+        if data.get("status") != "OK":
+            print(f"Codeforces API error: {data.get('comment', 'Unknown error')}")
+            return []
+
+        contests = data.get("result", [])
+
+        if upcoming:
+            filtered_contests = [c for c in contests if c.get("phase") == "BEFORE"]
+        else:
+            filtered_contests = [c for c in contests if c.get("phase") == "FINISHED"]
+
+        standardized_contests = []
+        for contest in filtered_contests[:10]:
+            start_time = contest.get("startTimeSeconds")
+            duration_seconds = contest.get("durationSeconds", 0)
+
+            standardized_contests.append(
+                {
+                    "platform": "codeforces",
+                    "title": contest.get("name", ""),
+                    "contestId": contest.get("id"),
+                    "difficulty": None,
+                    "rating": None,
+                    "tags": [],
+                    "link": f"https://codeforces.com/contest/{contest.get('id')}",
+                    "type": contest.get("type", "CF"),
+                    "is_contest": True,
+                    "contest_start": datetime.fromtimestamp(start_time).isoformat()
+                    if start_time
+                    else None,
+                    "contest_end": datetime.fromtimestamp(
+                        start_time + duration_seconds
+                    ).isoformat()
+                    if start_time
+                    else None,
+                    "duration_hours": duration_seconds / 3600
+                    if duration_seconds
+                    else None,
+                }
+            )
+
+        return standardized_contests
+    else:
+        print(f"Error fetching Codeforces contests: {response.status_code}")
+        return []
+
+
 def get_codeforces_contests(upcoming=True):
     url = f"{BASE_URL}contest.list"
 
     try:
-        response = requests.get(url)
+        return _codeforces_contests_from(get(url), upcoming)
 
-        if response.status_code == 200:
-            data = response.json()
-
-            if data.get("status") != "OK":
-                print(f"Codeforces API error: {data.get('comment', 'Unknown error')}")
-                return []
+    except Exception as e:
+        print(f"Exception in get_codeforces_contests: {e}")
+        return []
 
-            contests = data.get("result", [])
 
-            if upcoming:
-                filtered_contests = [c for c in contests if c.get("phase") == "BEFORE"]
-            else:
-                filtered_contests = [
-                    c for c in contests if c.get("phase") == "FINISHED"
-                ]
-
-            standardized_contests = []
-            for contest in filtered_contests[:10]:
-                start_time = contest.get("startTimeSeconds")
-                duration_seconds = contest.get("durationSeconds", 0)
-
-                standardized_contests.append(
-                    {
-                        "platform": "codeforces",
-                        "title": contest.get("name", ""),
-                        "contestId": contest.get("id"),
-                        "difficulty": None,
-                        "rating": None,
-                        "tags": [],
-                        "link": f"https://codeforces.com/contest/{contest.get('id')}",
-                        "type": contest.get("type", "CF"),
-                        "is_contest": True,
-                        "contest_start": datetime.fromtimestamp(start_time).isoformat()
-                        if start_time
-                        else None,
-                        "contest_end": datetime.fromtimestamp(
-                            start_time + duration_seconds
-                        ).isoformat()
-                        if start_time
-                        else None,
-                        "duration_hours": duration_seconds / 3600
-                        if duration_seconds
-                        else None,
-                    }
-                )
+async def get_codeforces_contests_async(upcoming=True):
+    url = f"{BASE_URL}contest.list"
 
-            return standardized_contests
-        else:
-            print(f"Error fetching Codeforces contests: {response.status_code}")
-            return []
+    try:
+        return _codeforces_contests_from(await aget(url), upcoming)
 
     except Exception as e:
         print(f"Exception in get_codeforces_contests: {e}")
         return []
 
 
-def get_codeforces_user_info(handle):
+def _contest_participants_from(res):
+    if res.status_code != 200:
+        return []
+
+    data = res.json()
+    if data.get("status") != "OK":
+        return []
+
+    return [
+        member["handle"]
+        for row in data["result"].get("rows", [])
+        for member in row["party"]["members"]
+    ]
+
+
+def get_contest_participants(contest_id, handles, batch_size=100):
+    # Standings filtered to the given handles are a small response, unlike
+    # contest.ratingChanges which lists every participant.
+    participants = []
+    handles = list(handles)
+
+    for i in range(0, len(handles), batch_size):
+        url = (
+            f"{BASE_URL}contest.standings?contestId={contest_id}"
+            f"&handles={';'.join(handles[i:i + batch_size])}&showUnofficial=false"
+        )
+        participants.extend(_contest_participants_from(get(url)))
+
+    return participants
+
+
+def ratings_published(contest_id, handle):
+    url = f"{BASE_URL}user.rating?handle={handle}"
+    res = get(url)
+
+    if res.status_code != 200:
+        return False
+
+    return any(c.get("contestId") == contest_id for c in res.json().get("result", []))
 
-    url = f"{BASE_URL}user.info?handles={handle}"
 
-    res = requests.get(url)
+def _codeforces_user_info_from(res):
 
     data = res.json()
     result = data["result"][0]
@@ -200,113 +473,209 @@ def get_codeforces_user_info(handle):
     return [friends, maxRating, maxRank, rank]
 
 
-def get_recent_failed_problem_summaries(handle, limit=3):
+def get_codeforces_user_info(handle):
 
-    if handle:
-        url = f"{BASE_URL}user.status?handle={handle}"
-        res = requests.get(url)
+    url = f"{BASE_URL}user.info?handles={handle}"
 
-        if res.status_code != 200:
-            return []
+    return _codeforces_user_info_from(get(url))
 
-        submissions = res.json().get("result", [])
 
-        problems = {}
+async def get_codeforces_user_info_async(handle):
 
-        for sub in submissions:
-            verdict = sub.get("verdict")
-            if verdict == "OK":
-                continue
+    url = f"{BASE_URL}user.info?handles={handle}"
 
-            problem = sub.get("problem", {})
-            contest_id = problem.get("contestId")
-            index = problem.get("index")
+    return _codeforces_user_info_from(await aget(url))
 
-            if contest_id is None or index is None:
-                continue
 
-            problem_id = f"{contest_id}{index}"
+# Failed-submission scans page through user.status newest first and stop
+# once `limit` distinct failed problems are found, the window is exhausted
+# or FAILED_SCAN_MAX_PAGES have been read, rather than downloading the whole
+# history. Attempt counts cover the submissions scanned.
+FAILED_SCAN_PAGE = 100
+FAILED_SCAN_MAX_PAGES = 20
+FAILED_SCAN_WINDOW_SECONDS = 365 * 86400
 
-            if problem_id not in problems:
-                problems[problem_id] = {
-                    "problem_id": problem_id,
-                    "name": problem.get("name"),
-                    "rating": problem.get("rating"),
-                    "tags": problem.get("tags", []),
-                    "failed_attempts": 0,
-                    "verdicts": defaultdict(int),
-                    "last_failed_at": 0,
-                    "languages_used": set(),
-                }
 
-            summary = problems[problem_id]
-            summary["failed_attempts"] += 1
-            summary["verdicts"][verdict] += 1
-            summary["last_failed_at"] = max(
-                summary["last_failed_at"], sub.get("creationTimeSeconds", 0)
-            )
-            summary["languages_used"].add(sub.get("programmingLanguage"))
+def _failed_scan_params(handle, page):
+    return {
+        "handle": handle,
+        "from": page * FAILED_SCAN_PAGE + 1,
+        "count": FAILED_SCAN_PAGE,
+    }
 
-        summaries = []
-        for p in problems.values():
-            summaries.append(
-                {
-                    "problem_id": p["problem_id"],
-                    "name": p["name"],
-                    "rating": p["rating"],
-                    "tags": p["tags"],
-                    "failed_attempts": p["failed_attempts"],
-                    "verdicts": dict(p["verdicts"]),
-                    "last_failed_at": p["last_failed_at"],
-                    "languages_used": list(p["languages_used"]),
-                }
+
+def _collect_failed_submissions(problems, submissions, oldest):
+    # Adds failed submissions to `problems`; returns False once one older
+    # than `oldest` shows up, as everything after it is older still.
+    for sub in submissions:
+        if oldest is not None and sub.get("creationTimeSeconds", 0) < oldest:
+            return False
+
+        verdict = sub.get("verdict")
+        if verdict == "OK":
+            continue
+
+        problem = sub.get("problem", {})
+        contest_id = problem.get("contestId")
+        index = problem.get("index")
+
+        if contest_id is None or index is None:
+            continue
+
+        problem_id = f"{contest_id}{index}"
+
+        if problem_id not in problems:
+            problems[problem_id] = {
+                "problem_id": problem_id,
+                "name": problem.get("name"),
+                "rating": problem.get("rating"),
+                "tags": problem.get("tags", []),
+                "failed_attempts": 0,
+                "verdicts": defaultdict(int),
+                "last_failed_at": 0,
+                "languages_used": set(),
+            }
+
+        summary = problems[problem_id]
+        summary["failed_attempts"] += 1
+        summary["verdicts"][verdict] += 1
+        summary["last_failed_at"] = max(
+            summary["last_failed_at"], sub.get("creationTimeSeconds", 0)
+        )
+        summary["languages_used"].add(sub.get("programmingLanguage"))
+
+    return True
+
+
+def _scan_continues(res, problems, oldest, limit):
+    # Folds one page into `problems`; False when no further page is needed.
+    if res.status_code != 200:
+        return False
+
+    submissions = res.json().get("result", [])
+    in_window = _collect_failed_submissions(problems, submissions, oldest)
+
+    return in_window and len(problems) < limit and len(submissions) >= FAILED_SCAN_PAGE
+
+
+def _failed_problem_summaries(problems, limit):
+    summaries = []
+    for p in problems.values():
+        summaries.append(
+            {
+                "problem_id": p["problem_id"],
+                "name": p["name"],
+                "rating": p["rating"],
+                "tags": p["tags"],
+                "failed_attempts": p["failed_attempts"],
+                "verdicts": dict(p["verdicts"]),
+                "last_failed_at": p["last_failed_at"],
+                "languages_used": sorted(p["languages_used"], key=str),
+            }
+        )
+
+    summaries.sort(key=lambda x: x["last_failed_at"], reverse=True)
+
+    return summaries[:limit]
+
+
+def get_recent_failed_problem_summaries(
+    handle, limit=3, window_seconds=FAILED_SCAN_WINDOW_SECONDS
+):
+
+    if handle:
+        problems = {}
+        oldest = time.time() - window_seconds if window_seconds else None
+
+        for page in range(FAILED_SCAN_MAX_PAGES):
+            res = get(
+                f"{BASE_URL}user.status", params=_failed_scan_params(handle, page)
             )
+            if not _scan_continues(res, problems, oldest, limit):
+                break
+
+        return _failed_problem_summaries(problems, limit)
+    else:
+        return {}
 
-        summaries.sort(key=lambda x: x["last_failed_at"], reverse=True)
 
-        return summaries[:limit]
+async def get_recent_failed_problem_summaries_async(
+    handle, limit=3, window_seconds=FAILED_SCAN_WINDOW_SECONDS
+):
+
+    if handle:
+        problems = {}
+        oldest = time.time() - window_seconds if window_seconds else None
+
+        for page in range(FAILED_SCAN_MAX_PAGES):
+            res = await aget(
+                f"{BASE_URL}user.status", params=_failed_scan_params(handle, page)
+            )
+            if not _scan_continues(res, problems, oldest, limit):
+                break
+
+        return _failed_problem_summaries(problems, limit)
     else:
         return {}
 
 
+def _most_used_lang_from(data):
+
+    lang_count = {}
+    for result in data:
+        lang_count[result["programmingLanguage"]] = (
+            lang_count.get(result["programmingLanguage"], 0) + 1
+        )
+
+    return max(lang_count, key=lang_count.get)
+
+
 def get_most_used_lang(handle):
 
     url = f"{BASE_URL}user.status?handle={handle}"
-    res = requests.get(url)
+    res = get(url)
 
     if res.status_code == 200:
         data = res.json()["result"]
 
-        lang_count = {}
-        for result in data:
-            lang_count[result["programmingLanguage"]] = (
-                lang_count.get(result["programmingLanguage"], 0) + 1
-            )
+    return _most_used_lang_from(data)
 
-    return max(lang_count, key=lang_count.get)
 
+async def get_most_used_lang_async(handle):
 
-def get_all_accepted_submissions(handle):
     url = f"{BASE_URL}user.status?handle={handle}"
-    res = requests.get(url)
+    res = await aget(url)
 
+    data = []
     if res.status_code == 200:
         data = res.json()["result"]
 
-        accepted = [s for s in data if s["verdict"] == "OK"]
+    return _most_used_lang_from(data)
+
+
+def _accepted_problems_from(data):
+
+    accepted = [s for s in data if s["verdict"] == "OK"]
+
+    unique_problems = {}
+    for sub in accepted:
+        problem_id = f"{sub['problem']['contestId']}{sub['problem']['index']}"
+        if problem_id not in unique_problems:
+            unique_problems[problem_id] = sub["problem"]
+
+    return list(unique_problems.values())
 
-        unique_problems = {}
-        for sub in accepted:
-            problem_id = f"{sub['problem']['contestId']}{sub['problem']['index']}"
-            if problem_id not in unique_problems:
-                unique_problems[problem_id] = sub["problem"]
 
-        return list(unique_problems.values())
+def get_all_accepted_submissions(handle):
+    url = f"{BASE_URL}user.status?handle={handle}"
+    res = get(url)
+
+    if res.status_code == 200:
+        return _accepted_problems_from(res.json()["result"])
     return []
 
 
-def get_topic_distribution(handle):
-    solved_problems = get_all_accepted_submissions(handle)
+def _topic_distribution_from(solved_problems):
 
     topic_counts = {}
     for problem in solved_problems:
@@ -316,9 +685,24 @@ def get_topic_distribution(handle):
     return topic_counts, len(solved_problems)
 
 
-def get_rating_history(handle):
-    url = f"{BASE_URL}user.rating?handle={handle}"
-    res = requests.get(url)
+def get_topic_distribution(handle):
+    solved_problems = get_all_accepted_submissions(handle)
+
+    return _topic_distribution_from(solved_problems)
+
+
+async def get_topic_distribution_async(handle):
+    url = f"{BASE_URL}user.status?handle={handle}"
+    res = await aget(url)
+
+    solved_problems = []
+    if res.status_code == 200:
+        solved_problems = _accepted_problems_from(res.json()["result"])
+
+    return _topic_distribution_from(solved_problems)
+
+
+def _rating_history_from(res):
 
     if res.status_code == 200:
         contests = res.json()["result"]
@@ -334,10 +718,19 @@ def get_rating_history(handle):
     return []
 
 
-def get_blog_info(handle):
+def get_rating_history(handle):
+    url = f"{BASE_URL}user.rating?handle={handle}"
+
+    return _rating_history_from(get(url))
+
+
+async def get_rating_history_async(handle):
+    url = f"{BASE_URL}user.rating?handle={handle}"
+
+    return _rating_history_from(await aget(url))
 
-    url = f"{BASE_URL}user.blogEntries?handle={handle}"
-    res = requests.get(url)
+
+def _blog_info_from(res):
 
     if res.status_code == 200:
         data = res.json()["result"]
@@ -351,34 +744,99 @@ def get_blog_info(handle):
     return count, ratings
 
 
+def get_blog_info(handle):
+
+    url = f"{BASE_URL}user.blogEntries?handle={handle}"
+
+    return _blog_info_from(get(url))
+
+
+async def get_blog_info_async(handle):
+
+    url = f"{BASE_URL}user.blogEntries?handle={handle}"
+
+    return _blog_info_from(await aget(url))
+
+
+def _codeforces_profile_from_components(
+    tag_distribution, language_stats, user_info, blogs, rating_history
+):
+    data = {}
+
+    tags_info, solved = tag_distribution
+    most_used_tag = max(tags_info, key=tags_info.get)
+
+    data["most_used_tag"] = most_used_tag
+
+    data["maxRating"] = user_info[1]
+    data["maxRank"] = user_info[2]
+    data["rank"] = user_info[3]
+
+    data["most_used_lang"] = language_stats
+    data["total_solved"] = solved
+
+    blog_count, ratings = blogs
+
+    data["blog_count"] = blog_count
+    data["best_rated_blog"] = max(ratings, key=ratings.get)
+    data["best_rated_blog_ratings"] = ratings[data["best_rated_blog"]]
+
+    data["ratingHistory"] = rating_history
+
+    return data
+
+
+def _codeforces_profile_from(status_res, info_res, blog_res, rating_res):
+    # user.status backs the tag, solved and language stats, so it is fetched
+    # once and shared between them.
+    submissions = []
+    if status_res.status_code == 200:
+        submissions = status_res.json()["result"]
+
+    return _codeforces_profile_from_components(
+        tag_distribution=_topic_distribution_from(_accepted_problems_from(submissions)),
+        language_stats=_most_used_lang_from(submissions),
+        user_info=_codeforces_user_info_from(info_res),
+        blogs=_blog_info_from(blog_res),
+        rating_history=_rating_history_from(rating_res),
+    )
+
+
+def _codeforces_profile_urls(handle):
+    return [
+        f"{BASE_URL}user.status?handle={handle}",
+        f"{BASE_URL}user.info?handles={handle}",
+        f"{BASE_URL}user.blogEntries?handle={handle}",
+        f"{BASE_URL}user.rating?handle={handle}",
+    ]
+
+
 def get_full_codeforces_profile_stats(handle):
 
     try:
         data = {}
 
         if handle:
-            tags_info, solved = get_topic_distribution(handle)
-            most_used_tag = max(tags_info, key=tags_info.get)
+            responses = [get(url) for url in _codeforces_profile_urls(handle)]
+            data = _codeforces_profile_from(*responses)
 
-            data["most_used_tag"] = most_used_tag
+        return data
 
-            profile_data = get_codeforces_user_info(handle)
-            data["maxRating"] = profile_data[1]
-            data["maxRank"] = profile_data[2]
-            data["rank"] = profile_data[3]
+    except Exception as e:
+        print(f"FROM get_full_codeforces_stats: {str(e)}")
+        return {}
 
-            lang_data = get_most_used_lang(handle)
-            data["most_used_lang"] = lang_data
-            data["total_solved"] = solved
 
-            blog_count, ratings = get_blog_info(handle)
+async def get_full_codeforces_profile_stats_async(handle):
 
-            data["blog_count"] = blog_count
-            data["best_rated_blog"] = max(ratings, key=ratings.get)
-            data["best_rated_blog_ratings"] = ratings[data["best_rated_blog"]]
+    try:
+        data = {}
 
-            ratingHistory = get_rating_history(handle)
-            data["ratingHistory"] = ratingHistory
+        if handle:
+            responses = await asyncio.gather(
+                *(aget(url) for url in _codeforces_profile_urls(handle))
+            )
+            data = _codeforces_profile_from(*responses)
 
         return data
 
@@ -392,22 +850,41 @@ LEETCODE!!
 """
 
 
+def _leetcode_submissions_url(username, accepted_only):
+    endpoint = (
+        f"/leetcode/{username}/acSubmission"
+        if accepted_only
+        else f"/leetcode/{username}/submission"
+    )
+    return f"{API_BASE}{endpoint}"
+
+
+def _leetcode_submissions_from(res):
+    if res.status_code == 200:
+        return res.json()["data"]
+    else:
+        return res.json()
+
+
 def get_leetcode_submissions(username, accepted_only=False):
 
     try:
         if username:
-            endpoint = (
-                f"/leetcode/{username}/acSubmission"
-                if accepted_only
-                else f"/leetcode/{username}/submission"
-            )
-            url = f"{API_BASE}{endpoint}"
-            res = requests.get(url)
+            url = _leetcode_submissions_url(username, accepted_only)
+            return _leetcode_submissions_from(get(url))
+        else:
+            return {}
+    except Exception as e:
+        print(f"Error from leetcode submissions info {str(e)}")
+        return {}
 
-            if res.status_code == 200:
-                return res.json()["data"]
-            else:
-                return res.json()
+
+async def get_leetcode_submissions_async(username, accepted_only=False):
+
+    try:
+        if username:
+            url = _leetcode_submissions_url(username, accepted_only)
+            return _leetcode_submissions_from(await aget(url))
         else:
             return {}
     except Exception as e:
@@ -415,9 +892,121 @@ def get_leetcode_submissions(username, accepted_only=False):
         return {}
 
 
-def get_recent_failed_leetcode_problems(submissions, limit=3):
+# The Node API only returns a user's most recent submissions (LeetCode's
+# public list has no offset), so the full history is built up in
+# submission_store: each sync reads the newest page back to the stored
+# cursor and appends what is new. Aggregates then cover everything seen,
+# unless more than a page arrived between two syncs (see _leetcode_sync_gap).
+LEETCODE_SYNC_PAGE = 100
+LEETCODE_SYNC_SECONDS = 300
+
+SUBMISSION_ID_RE = re.compile(r"/submissions/detail/(\d+)")
+
+
+def _leetcode_submission_id(sub):
+    match = SUBMISSION_ID_RE.search(sub.get("url") or "")
+    if match:
+        return match.group(1)
+    return f"{sub.get('timestamp')}:{sub.get('titleSlug')}:{sub.get('statusDisplay')}"
+
+
+def _new_leetcode_submissions(res, cursor):
+    # The page is newest first. Submissions in the cursor's own second may
+    # be new too; ones already stored are skipped by id.
+    if res.status_code != 200:
+        print(f"Error syncing LeetCode submissions: {res.status_code}")
+        return None
+
+    new = []
+    for sub in res.json().get("data", []):
+        timestamp = int(sub.get("timestamp", 0))
+        if timestamp < cursor:
+            break
 
+        new.append(
+            {
+                "id": _leetcode_submission_id(sub),
+                "timestamp": timestamp,
+                "title_slug": sub.get("titleSlug"),
+                "title": sub.get("title"),
+                "status": sub.get("statusDisplay"),
+                "lang": sub.get("lang"),
+            }
+        )
+
+    return new
+
+
+def _leetcode_sync_cursor(username):
+    # The cursor to sync from, or None if the handle was synced recently.
+    state = submission_store.sync_state("leetcode", username)
+    if state is None:
+        return 0
+    if time.time() - state[1] < LEETCODE_SYNC_SECONDS:
+        return None
+    return state[0]
+
+
+def _leetcode_sync_gap(username, new, cursor):
+    # A full page that never got back to the cursor means more than a page
+    # of submissions arrived since the last sync; the ones in between are
+    # gone from the upstream's window for good.
+    if cursor and len(new) >= LEETCODE_SYNC_PAGE and new[-1]["timestamp"] > cursor:
+        gap = (cursor, new[-1]["timestamp"])
+        print(f"LeetCode submission history for {username} missed {gap[0]}-{gap[1]}")
+        return gap
+    return None
+
+
+def _leetcode_sync_url(username):
+    return f"{_leetcode_submissions_url(username, False)}?limit={LEETCODE_SYNC_PAGE}"
+
+
+def sync_leetcode_submissions(username):
+    cursor = _leetcode_sync_cursor(username)
+    if cursor is None:
+        return
+
+    new = _new_leetcode_submissions(get(_leetcode_sync_url(username)), cursor)
+    if new is not None:
+        gap = _leetcode_sync_gap(username, new, cursor)
+        submission_store.append("leetcode", username, new, gap)
+
+
+async def sync_leetcode_submissions_async(username):
+    cursor = _leetcode_sync_cursor(username)
+    if cursor is None:
+        return
+
+    new = _new_leetcode_submissions(await aget(_leetcode_sync_url(username)), cursor)
+    if new is not None:
+        gap = _leetcode_sync_gap(username, new, cursor)
+        submission_store.append("leetcode", username, new, gap)
+
+
+def leetcode_submission_history(username, accepted_only=False):
+    # Stored submissions, newest first, in the Node API's shape.
+    return [
+        {
+            "title": sub["title"],
+            "titleSlug": sub["title_slug"],
+            "timestamp": str(sub["timestamp"]),
+            "statusDisplay": sub["status"],
+            "lang": sub["lang"],
+        }
+        for sub in submission_store.history("leetcode", username, accepted_only)
+    ]
+
+
+def get_recent_failed_leetcode_problems(
+    submissions, limit=3, window_seconds=FAILED_SCAN_WINDOW_SECONDS
+):
+    # Submissions come newest first, so the walk stops at the first one
+    # outside the window. Everything inside it is counted: the list is
+    # already in memory, and stopping early would change which problems are
+    # picked and cut their attempt counts short.
     problems = {}
+    oldest = time.time() - window_seconds if window_seconds else None
     if submissions:
         for sub in submissions:
             slug = sub.get("titleSlug")
@@ -426,6 +1015,9 @@ def get_recent_failed_leetcode_problems(submissions, limit=3):
             ts = int(sub.get("timestamp", 0))
             lang = sub.get("lang")
 
+            if oldest is not None and ts < oldest:
+                break
+
             if not slug or not verdict:
                 continue
 
@@ -459,7 +1051,7 @@ def get_recent_failed_leetcode_problems(submissions, limit=3):
                 "verdicts": dict(p["verdicts"]),
                 "eventually_accepted": p["eventually_accepted"],
                 "last_submission_ts": p["last_submission_ts"],
-                "languages_used": list(p["languages_used"]),
+                "languages_used": sorted(p["languages_used"], key=str),
             }
             for p in problems.values()
             if p["failed_attempts"] > 0
@@ -472,150 +1064,221 @@ def get_recent_failed_leetcode_problems(submissions, limit=3):
         return {}
 
 
-def get_leetcode_tag_distribution(username):
-    tag_mapping = {
-        "math": "math",
-        "greedy": "greedy",
-        "dynamic-programming": "dp",
-        "dp": "dp",
-        "graph": "graphs",
-        "tree": "trees",
-        "binary-tree": "trees",
-        "binary-search": "binary search",
-        "depth-first-search": "dfs and similar",
-        "dfs": "dfs and similar",
-        "breadth-first-search": "dfs and similar",
-        "bfs": "dfs and similar",
-        "string": "strings",
-        "two-pointers": "two pointers",
-        "hash-table": "hashing",
-        "sorting": "sortings",
-        "bit-manipulation": "bitmasks",
-        "geometry": "geometry",
-        "combinatorics": "combinatorics",
-        "number-theory": "number theory",
-        "array": "data structures",
-        "matrix": "data structures",
-        "linked-list": "data structures",
-        "stack": "data structures",
-        "queue": "data structures",
-        "heap": "data structures",
-        "hash-map": "data structures",
-        "trie": "data structures",
-        "segment-tree": "data structures",
-        "binary-indexed-tree": "data structures",
-        "union-find": "data structures",
-        "design": "data structures",
-        "backtracking": "brute force",
-        "divide-and-conquer": "brute force",
-        "recursion": "brute force",
-        "simulation": "brute force",
-        "sliding-window": "two pointers",
-        "prefix-sum": "data structures",
-        "monotonic-stack": "data structures",
-        "monotonic-queue": "data structures",
-        "topological-sort": "graphs",
-        "quickselect": "sortings",
-    }
+async def get_recent_failed_leetcode_problems_async(username, limit=3):
+    if submission_store.enabled():
+        await sync_leetcode_submissions_async(username)
+        submissions = leetcode_submission_history(username)
+    else:
+        submissions = await get_leetcode_submissions_async(username)
 
-    try:
-        skill_url = f"{API_BASE}/leetcode/skillStats/{username}"
-        skill_res = requests.get(skill_url)
+    return get_recent_failed_leetcode_problems(submissions, limit)
 
-        if skill_res.status_code == 200:
-            skill_data = skill_res.json()
 
-            tag_data = skill_data.get("data", {})
+def _leetcode_tag_distribution_from(skill_res):
 
-            tag_counts = {}
+    if skill_res.status_code == 200:
+        skill_data = skill_res.json()
 
-            for difficulty_level in ["fundamental", "intermediate", "advanced"]:
-                if difficulty_level in tag_data:
-                    for tag_info in tag_data[difficulty_level]:
-                        leetcode_tag = tag_info.get("tagSlug", "").lower()
-                        problems_solved = tag_info.get("problemsSolved", 0)
+        tag_data = skill_data.get("data", {})
 
-                        if problems_solved > 0:
-                            standardized_tag = tag_mapping.get(
-                                leetcode_tag, leetcode_tag
+        tag_counts = {}
+
+        for difficulty_level in ["fundamental", "intermediate", "advanced"]:
+            if difficulty_level in tag_data:
+                for tag_info in tag_data[difficulty_level]:
+                    leetcode_tag = tag_info.get("tagSlug", "").lower()
+                    problems_solved = tag_info.get("problemsSolved", 0)
+
+                    if problems_solved > 0:
+                        standardized_tag = leetcode_skill_tag_mapping.get(
+                            leetcode_tag, leetcode_tag
+                        )
+
+                        if standardized_tag in tags_list_all:
+                            tag_counts[standardized_tag] = (
+                                tag_counts.get(standardized_tag, 0) + problems_solved
                             )
 
-                            if standardized_tag in tags_list_all:
-                                tag_counts[standardized_tag] = (
-                                    tag_counts.get(standardized_tag, 0)
-                                    + problems_solved
-                                )
+        return {tag: count for tag, count in tag_counts.items() if count > 0}
+
+    else:
+        print(f"Error fetching LeetCode skill stats: {skill_res.status_code}")
+        return {}
+
 
-            return {tag: count for tag, count in tag_counts.items() if count > 0}
+def get_leetcode_tag_distribution(username):
 
-        else:
-            print(f"Error fetching LeetCode skill stats: {skill_res.status_code}")
-            return {}
+    try:
+        skill_url = f"{API_BASE}/leetcode/skillStats/{username}"
+        return _leetcode_tag_distribution_from(get(skill_url))
     except Exception as e:
         print(f"Error from leetcode tag distro: {str(e)}")
         return {}
 
 
+async def get_leetcode_tag_distribution_async(username):
+
+    try:
+        skill_url = f"{API_BASE}/leetcode/skillStats/{username}"
+        return _leetcode_tag_distribution_from(await aget(skill_url))
+    except Exception as e:
+        print(f"Error from leetcode tag distro: {str(e)}")
+        return {}
+
+
+def _leetcode_language_stats(submissions):
+    language_counts = {}
+    for submission in submissions:
+        lang = submission.get("lang", "Unknown")
+        language_counts[lang] = language_counts.get(lang, 0) + 1
+
+    if language_counts:
+        most_used = max(language_counts.items(), key=lambda x: x[1])
+        return {
+            "language": most_used[0],
+            "count": most_used[1],
+            "percentage": round((most_used[1] / len(submissions)) * 100, 2),
+            "all_languages": language_counts,
+        }
+    else:
+        return {
+            "language": "None",
+            "count": 0,
+            "percentage": 0,
+            "all_languages": {},
+        }
+
+
+def _leetcode_most_used_language_from(res):
+
+    if res.status_code == 200:
+        data = res.json()
+        return _leetcode_language_stats(data.get("data", []))
+
+    else:
+        print(f"Error fetching LeetCode submissions: {res.status_code}")
+        return {
+            "language": "Unknown",
+            "count": 0,
+            "percentage": 0,
+            "all_languages": {},
+        }
+
+
 def get_leetcode_most_used_language(username):
 
     try:
+        if submission_store.enabled():
+            sync_leetcode_submissions(username)
+            accepted = leetcode_submission_history(username, accepted_only=True)
+            if accepted:
+                stats = _leetcode_language_stats(accepted)
+                stats["complete"] = submission_store.complete("leetcode", username)
+                return stats
+
         endpoint = f"/leetcode/{username}/acSubmission"
         url = f"{API_BASE}{endpoint}"
-        res = requests.get(url)
-
-        if res.status_code == 200:
-            data = res.json()
-            submissions = data.get("data", [])
-
-            language_counts = {}
-            for submission in submissions:
-                lang = submission.get("lang", "Unknown")
-                language_counts[lang] = language_counts.get(lang, 0) + 1
-
-            if language_counts:
-                most_used = max(language_counts.items(), key=lambda x: x[1])
-                return {
-                    "language": most_used[0],
-                    "count": most_used[1],
-                    "percentage": round((most_used[1] / len(submissions)) * 100, 2),
-                    "all_languages": language_counts,
-                }
-            else:
-                return {
-                    "language": "None",
-                    "count": 0,
-                    "percentage": 0,
-                    "all_languages": {},
-                }
+        return _leetcode_most_used_language_from(get(url))
+    except Exception as e:
+        print(f"Error from leetcode most used lang: {str(e)}")
+        return {"language": "Unknown", "count": 0, "percentage": 0, "all_languages": {}}
 
-        else:
-            print(f"Error fetching LeetCode submissions: {res.status_code}")
-            return {
-                "language": "Unknown",
-                "count": 0,
-                "percentage": 0,
-                "all_languages": {},
-            }
+
+async def get_leetcode_most_used_language_async(username):
+
+    try:
+        if submission_store.enabled():
+            await sync_leetcode_submissions_async(username)
+            accepted = leetcode_submission_history(username, accepted_only=True)
+            if accepted:
+                stats = _leetcode_language_stats(accepted)
+                stats["complete"] = submission_store.complete("leetcode", username)
+                return stats
+
+        endpoint = f"/leetcode/{username}/acSubmission"
+        url = f"{API_BASE}{endpoint}"
+        return _leetcode_most_used_language_from(await aget(url))
+    except Exception as e:
+        print(f"Error from leetcode most used lang: {str(e)}")
+        return {"language": "Unknown", "count": 0, "percentage": 0, "all_languages": {}}
+
+
+def _leetcode_submission_info_from(res):
+    if res.status_code == 200:
+        return res.json()
+    else:
+        print(f"STATUS CODE: {res.status_code}")
+        return {}
+
+
+def get_leetcode_submission_info(username):
+
+    try:
+        url = f"https://alfa-leetcode-api.onrender.com/{username}/profile"
+        return _leetcode_submission_info_from(get(url))
     except Exception as e:
-        print(f"Error from leetcode most used lang: {str(e)}")
-        return {"language": "Unknown", "count": 0, "percentage": 0, "all_languages": {}}
+        return {}
 
 
-def get_leetcode_submission_info(username):
+async def _leetcode_profile_from_node_api(username):
+    # The local API's profile and solved counts, reshaped to match
+    # alfa-leetcode-api's. If either is missing the alternate answers 502, so
+    # the hedge keeps waiting for the primary rather than winning with a
+    # partial profile.
+    profile, solved = await asyncio.gather(
+        aget(f"{API_BASE}/leetcode/userProfile/{username}"),
+        aget(f"{API_BASE}/leetcode/{username}/solved"),
+    )
+    if profile.status_code != 200 or solved.status_code != 200:
+        return json_response({}, 502)
+
+    profile = profile.json().get("data", {}).get("profile", {})
+    solved = solved.json().get("data", {})
+    totals = {
+        entry.get("difficulty"): entry.get("count")
+        for entry in solved.get("totalQuestions") or []
+    }
+    if not all(totals.get(level) for level in ("All", "Easy", "Medium", "Hard")):
+        return json_response({}, 502)
+
+    return json_response(
+        {
+            "totalSolved": solved.get("solvedProblem", 0),
+            "totalQuestions": totals["All"],
+            "easySolved": solved.get("easySolved", 0),
+            "totalEasy": totals["Easy"],
+            "mediumSolved": solved.get("mediumSolved", 0),
+            "totalMedium": totals["Medium"],
+            "hardSolved": solved.get("hardSolved", 0),
+            "totalHard": totals["Hard"],
+            "ranking": profile.get("ranking"),
+            "reputation": profile.get("reputation"),
+        }
+    )
+
+
+async def get_leetcode_submission_info_async(username):
 
     try:
         url = f"https://alfa-leetcode-api.onrender.com/{username}/profile"
-        res = requests.get(url)
-
-        if res.status_code == 200:
-            return res.json()
-        else:
-            print(f"STATUS CODE: {res.status_code}")
-            return {}
+        return _leetcode_submission_info_from(
+            await aget(url, hedge=lambda: _leetcode_profile_from_node_api(username))
+        )
     except Exception as e:
         return {}
 
 
+def _leetcode_profile_from(data, langStats, tag_data):
+
+    data["most_used_lang"] = langStats["language"]
+    data["history_complete"] = langStats.get("complete", True)
+
+    most_used_tag = max(tag_data, key=tag_data.get)
+    data["most_used_tag"] = most_used_tag
+
+    return data
+
+
 def get_full_leetcode_profile_stats(username):
 
     if username:
@@ -624,22 +1287,28 @@ def get_full_leetcode_profile_stats(username):
 
         langStats = get_leetcode_most_used_language(username)
 
-        data["most_used_lang"] = langStats["language"]
-
         tag_data = get_leetcode_tag_distribution(username)
 
-        most_used_tag = max(tag_data, key=tag_data.get)
-        data["most_used_tag"] = most_used_tag
-
-        return data
+        return _leetcode_profile_from(data, langStats, tag_data)
     else:
         return {}
 
 
-def get_leetcode_contests():
-    url = f"https://competeapi.vercel.app/contests/leetcode/"
+async def get_full_leetcode_profile_stats_async(username):
+
+    if username:
+        data, langStats, tag_data = await asyncio.gather(
+            get_leetcode_submission_info_async(username),
+            get_leetcode_most_used_language_async(username),
+            get_leetcode_tag_distribution_async(username),
+        )
+
+        return _leetcode_profile_from(data, langStats, tag_data)
+    else:
+        return {}
 
-    res = requests.get(url)
+
+def _leetcode_contests_from(res):
 
     if res.status_code == 200:
         data = res.json()["data"]["topTwoContests"]
@@ -649,41 +1318,67 @@ def get_leetcode_contests():
         return {}
 
 
+def get_leetcode_contests():
+    url = f"https://competeapi.vercel.app/contests/leetcode/"
+
+    return _leetcode_contests_from(get(url))
+
+
+async def get_leetcode_contests_async():
+    url = f"https://competeapi.vercel.app/contests/leetcode/"
+
+    return _leetcode_contests_from(await aget(url))
+
+
+def _leetcode_daily_challenge_from(response):
+
+    if response.status_code == 200:
+        data = response.json()
+        problem = data.get("question", {})
+
+        return {
+            "platform": "leetcode",
+            "title": problem.get("title", ""),
+            "titleSlug": problem.get("titleSlug", ""),
+            "difficulty": problem.get("difficulty", "UNKNOWN").lower(),
+            "rating": None,
+            "tags": [tag.get("name", "") for tag in problem.get("topicTags", [])],
+            "link": f"https://leetcode.com/problems/{problem.get('titleSlug', '')}",
+            "isPremium": False,
+            "acRate": problem.get("acRate", 0),
+            "is_contest": False,
+            "contest_start": None,
+            "contest_end": None,
+            "is_daily": True,
+        }
+    else:
+        print(f"Error fetching daily challenge: {response.status_code}")
+        return None
+
+
 def get_leetcode_daily_challenge():
     url = f"{API_BASE}/leetcode/daily"
 
     try:
-        response = requests.get(url)
+        return _leetcode_daily_challenge_from(get(url))
 
-        if response.status_code == 200:
-            data = response.json()
-            problem = data.get("question", {})
+    except Exception as e:
+        print(f"Exception in get_leetcode_daily_challenge: {e}")
+        return None
 
-            return {
-                "platform": "leetcode",
-                "title": problem.get("title", ""),
-                "titleSlug": problem.get("titleSlug", ""),
-                "difficulty": problem.get("difficulty", "UNKNOWN").lower(),
-                "rating": None,
-                "tags": [tag.get("name", "") for tag in problem.get("topicTags", [])],
-                "link": f"https://leetcode.com/problems/{problem.get('titleSlug', '')}",
-                "isPremium": False,
-                "acRate": problem.get("acRate", 0),
-                "is_contest": False,
-                "contest_start": None,
-                "contest_end": None,
-                "is_daily": True,
-            }
-        else:
-            print(f"Error fetching daily challenge: {response.status_code}")
-            return None
+
+async def get_leetcode_daily_challenge_async():
+    url = f"{API_BASE}/leetcode/daily"
+
+    try:
+        return _leetcode_daily_challenge_from(await aget(url))
 
     except Exception as e:
         print(f"Exception in get_leetcode_daily_challenge: {e}")
         return None
 
 
-def get_leetcode_problems(tags=None, difficulty=None, limit=50, skip=0):
+def _leetcode_problems_url(tags=None, difficulty=None, limit=50, skip=0):
     base_url = f"{API_BASE}/leetcode/problems"
 
     params = []
@@ -701,38 +1396,66 @@ def get_leetcode_problems(tags=None, difficulty=None, limit=50, skip=0):
     if params:
         url += "?" + "&".join(params)
 
+    return url
+
+
+def _leetcode_problems_from(response):
+
+    if response.status_code == 200:
+        data = response.json()
+        problems = data["data"]["questions"]
+
+        standardized_problems = []
+        for problem in problems:
+            standardized_problems.append(
+                {
+                    "platform": "leetcode",
+                    "title": problem.get("title", ""),
+                    "titleSlug": problem.get("titleSlug", ""),
+                    "difficulty": problem.get("difficulty", "UNKNOWN").lower(),
+                    "rating": None,
+                    "tags": [
+                        tag.get("name", "") for tag in problem.get("topicTags", [])
+                    ],
+                    "link": f"https://leetcode.com/problems/{problem.get('titleSlug', '')}",
+                    "isPremium": problem.get("isPaidOnly", False),
+                    "acRate": problem.get("acRate", 0),
+                    "is_contest": False,
+                    "contest_start": None,
+                    "contest_end": None,
+                }
+            )
+
+        return standardized_problems
+    else:
+        print(f"Error fetching LeetCode problems: {response.status_code}")
+        return []
+
+
+def get_leetcode_problems(tags=None, difficulty=None, limit=50, skip=0):
+    catalog = problem_catalog.get() if problem_catalog else None
+    if catalog is not None:
+        return _catalog_leetcode_problems(catalog, tags, difficulty, limit, skip)
+
+    url = _leetcode_problems_url(tags, difficulty, limit, skip)
+
     try:
-        response = requests.get(url)
-
-        if response.status_code == 200:
-            data = response.json()
-            problems = data["data"]["questions"]
-
-            standardized_problems = []
-            for problem in problems:
-                standardized_problems.append(
-                    {
-                        "platform": "leetcode",
-                        "title": problem.get("title", ""),
-                        "titleSlug": problem.get("titleSlug", ""),
-                        "difficulty": problem.get("difficulty", "UNKNOWN").lower(),
-                        "rating": None,
-                        "tags": [
-                            tag.get("name", "") for tag in problem.get("topicTags", [])
-                        ],
-                        "link": f"https://leetcode.com/problems/{problem.get('titleSlug', '')}",
-                        "isPremium": problem.get("isPaidOnly", False),
-                        "acRate": problem.get("acRate", 0),
-                        "is_contest": False,
-                        "contest_start": None,
-                        "contest_end": None,
-                    }
-                )
+        return _leetcode_problems_from(get(url))
 
-            return standardized_problems
-        else:
-            print(f"Error fetching LeetCode problems: {response.status_code}")
-            return []
+    except Exception as e:
+        print(f"Exception in get_leetcode_problems: {e}")
+        return []
+
+
+async def get_leetcode_problems_async(tags=None, difficulty=None, limit=50, skip=0):
+    catalog = problem_catalog.get() if problem_catalog else None
+    if catalog is not None:
+        return _catalog_leetcode_problems(catalog, tags, difficulty, limit, skip)
+
+    url = _leetcode_problems_url(tags, difficulty, limit, skip)
+
+    try:
+        return _leetcode_problems_from(await aget(url))
 
     except Exception as e:
         print(f"Exception in get_leetcode_problems: {e}")
@@ -744,23 +1467,65 @@ CODECHEF!!
 """
 
 
+def _codechef_profile_stats_from(res):
+
+    data = {}
+
+    if res.status_code == 200:
+        data = res.json()
+
+    return data
+
+
 def get_codechef_profile_stats(username):
 
     data = {}
 
     if username:
-        res = requests.get(f"https://competeapi.vercel.app/user/codechef/{username}/")
-
-        if res.status_code == 200:
-            data = res.json()
+        res = get(f"https://competeapi.vercel.app/user/codechef/{username}/")
+        data = _codechef_profile_stats_from(res)
 
     return data
 
 
-def get_codechef_contests():
-    url = f"https://competeapi.vercel.app/contests/codechef/"
+async def _codechef_profile_from_node_api(username):
+    # The local API's profile, reshaped to match competeapi's.
+    res = await aget(f"{API_BASE}/codechef/user/{username}")
+    if res.status_code != 200:
+        return res
+
+    data = res.json().get("data", {})
+
+    return json_response(
+        {
+            "success": True,
+            "username": data.get("username", username),
+            "name": data.get("fullName"),
+            "rating": f"{data.get('stars', 0)}★",
+            "rating_number": data.get("currentRating"),
+            "country": data.get("country"),
+            "global_rank": data.get("globalRank"),
+            "country_rank": data.get("countryRank"),
+            "max_rank": data.get("maxRating"),
+        }
+    )
+
+
+async def get_codechef_profile_stats_async(username):
+
+    data = {}
+
+    if username:
+        res = await aget(
+            f"https://competeapi.vercel.app/user/codechef/{username}/",
+            hedge=lambda: _codechef_profile_from_node_api(username),
+        )
+        data = _codechef_profile_stats_from(res)
+
+    return data
+
 
-    res = requests.get(url)
+def _codechef_contests_from(res):
 
     if res.status_code == 200:
         data = res.json()
@@ -770,93 +1535,151 @@ def get_codechef_contests():
         return {}
 
 
-def get_unified_tag_distribution(leetcode_username=None, codeforces_handle=None):
-    standard_tags = [
-        "data structures",
-        "strings",
-        "brute force",
-        "sortings",
-        "two pointers",
-        "trees",
-        "hashing",
-        "greedy",
-        "binary search",
-        "dfs and similar",
-        "bitmasks",
-        "math",
-        "dp",
-        "graphs",
-        "geometry",
-        "combinatorics",
-        "number theory",
-    ]
+def get_codechef_contests():
+    url = f"https://competeapi.vercel.app/contests/codechef/"
+
+    return _codechef_contests_from(get(url))
+
+
+async def get_codechef_contests_async():
+    url = f"https://competeapi.vercel.app/contests/codechef/"
+
+    return _codechef_contests_from(await aget(url))
 
-    cf_tag_mapping = {
-        "implementation": "brute force",
-        "brute force": "brute force",
-        "data structures": "data structures",
-        "dp": "dp",
-        "dynamic programming": "dp",
-        "greedy": "greedy",
-        "math": "math",
-        "sortings": "sortings",
-        "sorting": "sortings",
-        "constructive algorithms": "brute force",
-        "strings": "strings",
-        "string": "strings",
-        "two pointers": "two pointers",
-        "combinatorics": "combinatorics",
-        "graphs": "graphs",
-        "graph": "graphs",
-        "dfs and similar": "dfs and similar",
-        "dfs": "dfs and similar",
-        "bfs": "dfs and similar",
-        "trees": "trees",
-        "tree": "trees",
-        "geometry": "geometry",
-        "dsu": "data structures",
-        "flows": "graphs",
-        "graph matchings": "graphs",
-        "hashing": "hashing",
-        "number theory": "number theory",
-        "bitmasks": "bitmasks",
-        "bit manipulation": "bitmasks",
-        "binary search": "binary search",
-        "divide and conquer": "brute force",
-        "games": "math",
-        "shortest paths": "graphs",
-        "matrices": "data structures",
-        "ternary search": "binary search",
-        "probabilities": "math",
-        "chinese remainder theorem": "number theory",
-        "*special": None,
-        "string suffix structures": "strings",
-        "expression parsing": "strings",
-    }
 
+def unified_tag_distribution(lc_tags, cf_tags):
     unified_distribution = {tag: 0 for tag in standard_tags}
 
+    for tag, count in lc_tags.items():
+        if tag in unified_distribution:
+            unified_distribution[tag] += count
+
+    for cf_tag, count in cf_tags.items():
+        standard_tag = cf_tag_mapping.get(cf_tag.lower())
+
+        if standard_tag and standard_tag in unified_distribution:
+            unified_distribution[standard_tag] += count
+
+    return {tag: count for tag, count in unified_distribution.items() if count > 0}
+
+
+def get_unified_tag_distribution(leetcode_username=None, codeforces_handle=None):
+    lc_tags = {}
+    cf_tags = {}
+
     if leetcode_username:
         try:
             lc_tags = get_leetcode_tag_distribution(leetcode_username)
-            for tag, count in lc_tags.items():
-                if tag in unified_distribution:
-                    unified_distribution[tag] += count
         except Exception as e:
             print(f"Error fetching LeetCode tags: {e}")
 
     if codeforces_handle:
         try:
             cf_tags, _ = get_topic_distribution(codeforces_handle)
-            for cf_tag, count in cf_tags.items():
-                standard_tag = cf_tag_mapping.get(cf_tag.lower())
+        except Exception as e:
+            print(f"Error fetching Codeforces tags: {e}")
+
+    return unified_tag_distribution(lc_tags, cf_tags)
+
+
+async def get_unified_tag_distribution_async(
+    leetcode_username=None, codeforces_handle=None
+):
+    async def leetcode_tags():
+        if not leetcode_username:
+            return {}
+        try:
+            return await get_leetcode_tag_distribution_async(leetcode_username)
+        except Exception as e:
+            print(f"Error fetching LeetCode tags: {e}")
+            return {}
 
-                if standard_tag and standard_tag in unified_distribution:
-                    unified_distribution[standard_tag] += count
+    async def codeforces_tags():
+        if not codeforces_handle:
+            return {}
+        try:
+            cf_tags, _ = await get_topic_distribution_async(codeforces_handle)
+            return cf_tags
         except Exception as e:
             print(f"Error fetching Codeforces tags: {e}")
+            return {}
 
-    return {tag: count for tag, count in unified_distribution.items() if count > 0}
+    lc_tags, cf_tags = await asyncio.gather(leetcode_tags(), codeforces_tags())
+
+    return unified_tag_distribution(lc_tags, cf_tags)
+
+
+def _leetcode_contest_entries(lc_contests_raw):
+    return [
+        {
+            "platform": "leetcode",
+            "title": contest.get("title", ""),
+            "link": f"https://leetcode.com/contest/{contest.get('title', '').lower().replace(' ', '-')}",
+            "is_contest": True,
+            "contest_start": datetime.fromtimestamp(
+                contest.get("startTime", 0)
+            ).isoformat(),
+            "contest_end": datetime.fromtimestamp(
+                contest.get("startTime", 0) + contest.get("duration", 0)
+            ).isoformat(),
+            "duration_hours": contest.get("duration", 0) / 3600,
+            "tags": [],
+            "difficulty": None,
+            "rating": None,
+        }
+        for contest in lc_contests_raw
+    ]
+
+
+def _codechef_contest_entries(cc_contests_raw):
+    return [
+        {
+            "platform": "codechef",
+            "title": contest.get("contest_name", ""),
+            "link": f"https://www.codechef.com/{contest.get('contest_code', '')}",
+            "is_contest": True,
+            "contest_start": contest.get("contest_start_date_iso", ""),
+            "contest_end": contest.get("contest_end_date_iso", ""),
+            "duration_hours": int(contest.get("contest_duration", 0)) / 60,
+            "tags": [],
+            "difficulty": None,
+            "rating": None,
+        }
+        for contest in cc_contests_raw
+    ]
+
+
+def _codeforces_rating_range(difficulty, min_rating, max_rating):
+    if difficulty and not min_rating and not max_rating:
+        if difficulty == "easy":
+            min_rating, max_rating = 800, 1200
+        elif difficulty == "medium":
+            min_rating, max_rating = 1300, 1900
+        elif difficulty == "hard":
+            min_rating, max_rating = 2000, 3500
+
+    return min_rating if difficulty else None, max_rating
+
+
+def _merged_recommendations(all_problems, all_contests):
+    def sort_key(problem):
+        if problem["platform"] == "codeforces" and problem.get("rating"):
+            return problem["rating"]
+        elif problem["platform"] == "leetcode":
+            diff_order = {"easy": 1, "medium": 2, "hard": 3, "unknown": 4}
+            return diff_order.get(problem["difficulty"], 4) * 1000
+        return 9999
+
+    all_problems.sort(key=sort_key)
+
+    all_contests.sort(key=lambda x: x.get("contest_start", ""))
+
+    return {
+        "problems": all_problems,
+        "contests": all_contests,
+        "total_problems": len(all_problems),
+        "total_contests": len(all_contests),
+    }
 
 
 def get_unified_problem_recommendations(
@@ -869,44 +1692,6 @@ def get_unified_problem_recommendations(
     platforms=["leetcode", "codeforces", "codechef"],
 ):
 
-    leetcode_tag_map = {
-        "dp": "dynamic-programming",
-        "data structures": "array",
-        "dfs and similar": "depth-first-search",
-        "graphs": "graph",
-        "trees": "tree",
-        "strings": "string",
-        "two pointers": "two-pointers",
-        "hashing": "hash-table",
-        "sortings": "sorting",
-        "bitmasks": "bit-manipulation",
-        "number theory": "number-theory",
-        "binary search": "binary-search",
-        "greedy": "greedy",
-        "math": "math",
-        "brute force": "backtracking",
-    }
-
-    codeforces_tag_map = {
-        "dp": "dp",
-        "data structures": "data structures",
-        "dfs and similar": "dfs and similar",
-        "graphs": "graphs",
-        "trees": "trees",
-        "strings": "strings",
-        "two pointers": "two pointers",
-        "hashing": "hashing",
-        "sortings": "sortings",
-        "bitmasks": "bitmasks",
-        "number theory": "number theory",
-        "binary search": "binary search",
-        "greedy": "greedy",
-        "math": "math",
-        "brute force": "brute force",
-        "combinatorics": "combinatorics",
-        "geometry": "geometry",
-    }
-
     all_problems = []
     all_contests = []
 
@@ -928,26 +1713,7 @@ def get_unified_problem_recommendations(
                 all_problems.insert(0, daily)
 
             if include_contests:
-                lc_contests_raw = get_leetcode_contests()
-                for contest in lc_contests_raw:
-                    all_contests.append(
-                        {
-                            "platform": "leetcode",
-                            "title": contest.get("title", ""),
-                            "link": f"https://leetcode.com/contest/{contest.get('title', '').lower().replace(' ', '-')}",
-                            "is_contest": True,
-                            "contest_start": datetime.fromtimestamp(
-                                contest.get("startTime", 0)
-                            ).isoformat(),
-                            "contest_end": datetime.fromtimestamp(
-                                contest.get("startTime", 0) + contest.get("duration", 0)
-                            ).isoformat(),
-                            "duration_hours": contest.get("duration", 0) / 3600,
-                            "tags": [],
-                            "difficulty": None,
-                            "rating": None,
-                        }
-                    )
+                all_contests.extend(_leetcode_contest_entries(get_leetcode_contests()))
 
         except Exception as e:
             print(f"Error fetching LeetCode data: {e}")
@@ -958,18 +1724,14 @@ def get_unified_problem_recommendations(
             if tags:
                 cf_tags = [codeforces_tag_map.get(tag, tag) for tag in tags]
 
-            if difficulty and not min_rating and not max_rating:
-                if difficulty == "easy":
-                    min_rating, max_rating = 800, 1200
-                elif difficulty == "medium":
-                    min_rating, max_rating = 1300, 1900
-                elif difficulty == "hard":
-                    min_rating, max_rating = 2000, 3500
+            cf_min_rating, cf_max_rating = _codeforces_rating_range(
+                difficulty, min_rating, max_rating
+            )
 
             cf_problems = get_codeforces_problems(
                 tags=[cf_tags[0]] if cf_tags else None,
-                min_rating=min_rating if difficulty else None,
-                max_rating=max_rating,
+                min_rating=cf_min_rating,
+                max_rating=cf_max_rating,
                 limit=limit_per_platform,
             )
             all_problems.extend(cf_problems)
@@ -983,41 +1745,347 @@ def get_unified_problem_recommendations(
 
     if "codechef" in platforms and include_contests:
         try:
-            cc_contests_raw = get_codechef_contests()
-            for contest in cc_contests_raw:
-                all_contests.append(
-                    {
-                        "platform": "codechef",
-                        "title": contest.get("contest_name", ""),
-                        "link": f"https://www.codechef.com/{contest.get('contest_code', '')}",
-                        "is_contest": True,
-                        "contest_start": contest.get("contest_start_date_iso", ""),
-                        "contest_end": contest.get("contest_end_date_iso", ""),
-                        "duration_hours": int(contest.get("contest_duration", 0)) / 60,
-                        "tags": [],
-                        "difficulty": None,
-                        "rating": None,
-                    }
-                )
+            all_contests.extend(_codechef_contest_entries(get_codechef_contests()))
 
         except Exception as e:
             print(f"Error fetching CodeChef data: {e}")
 
-    def sort_key(problem):
-        if problem["platform"] == "codeforces" and problem.get("rating"):
-            return problem["rating"]
-        elif problem["platform"] == "leetcode":
-            diff_order = {"easy": 1, "medium": 2, "hard": 3, "unknown": 4}
-            return diff_order.get(problem["difficulty"], 4) * 1000
-        return 9999
+    return _merged_recommendations(all_problems, all_contests)
 
-    all_problems.sort(key=sort_key)
 
-    all_contests.sort(key=lambda x: x.get("contest_start", ""))
+async def _gather_logged(label, *aws):
+    # Like the per-platform try blocks above: a failing fetch is logged and
+    # yields None while the other fetches for that platform still count.
+    results = await asyncio.gather(*aws, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Error fetching {label} data: {result}")
+
+    return [None if isinstance(r, Exception) else r for r in results]
+
+
+async def _no_result():
+    return None
+
+
+async def get_unified_problem_recommendations_async(
+    tags=None,
+    difficulty=None,
+    min_rating=None,
+    max_rating=None,
+    limit_per_platform=20,
+    include_contests=True,
+    platforms=["leetcode", "codeforces", "codechef"],
+):
+
+    async def leetcode_part():
+        lc_tags = None
+        if tags:
+            lc_tags = [leetcode_tag_map.get(tag, tag) for tag in tags]
 
+        lc_problems, daily, lc_contests_raw = await _gather_logged(
+            "LeetCode",
+            get_leetcode_problems_async(
+                tags=lc_tags,
+                difficulty=difficulty.upper() if difficulty else None,
+                limit=limit_per_platform,
+            ),
+            get_leetcode_daily_challenge_async(),
+            get_leetcode_contests_async() if include_contests else _no_result(),
+        )
+
+        problems = ([daily] if daily else []) + (lc_problems or [])
+        contests = _leetcode_contest_entries(lc_contests_raw or [])
+        return problems, contests
+
+    async def codeforces_part():
+        cf_tags = None
+        if tags:
+            cf_tags = [codeforces_tag_map.get(tag, tag) for tag in tags]
+
+        cf_min_rating, cf_max_rating = _codeforces_rating_range(
+            difficulty, min_rating, max_rating
+        )
+
+        cf_problems, cf_contests = await _gather_logged(
+            "Codeforces",
+            get_codeforces_problems_async(
+                tags=[cf_tags[0]] if cf_tags else None,
+                min_rating=cf_min_rating,
+                max_rating=cf_max_rating,
+                limit=limit_per_platform,
+            ),
+            get_codeforces_contests_async(upcoming=True)
+            if include_contests
+            else _no_result(),
+        )
+
+        return cf_problems or [], cf_contests or []
+
+    async def codechef_part():
+        (cc_contests_raw,) = await _gather_logged(
+            "CodeChef", get_codechef_contests_async()
+        )
+        return [], _codechef_contest_entries(cc_contests_raw or [])
+
+    parts = []
+    if "leetcode" in platforms:
+        parts.append(leetcode_part())
+    if "codeforces" in platforms:
+        parts.append(codeforces_part())
+    if "codechef" in platforms and include_contests:
+        parts.append(codechef_part())
+
+    all_problems = []
+    all_contests = []
+    for problems, contests in await asyncio.gather(*parts):
+        all_problems.extend(problems)
+        all_contests.extend(contests)
+
+    return _merged_recommendations(all_problems, all_contests)
+
+
+"""
+PROBLEM CATALOG
+"""
+
+# Every Codeforces and LeetCode problem in a memory-mapped file (see
+# catalog.py) shared by all workers. Once it is built, problem lookups are
+# answered from it instead of the network; until then, or with
+# PROBLEM_CATALOG_PATH set empty, the fetchers above call the APIs as before.
+PROBLEM_CATALOG_PATH = os.getenv(
+    "PROBLEM_CATALOG_PATH",
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".cache", "problems.catalog"
+    ),
+)
+CATALOG_MAX_AGE_SECONDS = 6 * 3600
+# The Node API serves at most 100 problems per request.
+LEETCODE_CATALOG_PAGE = 100
+LEETCODE_CATALOG_MAX_PAGES = 60
+
+
+def _codeforces_catalog_records():
+    response = get(f"{BASE_URL}problemset.problems")
+    data = response.json() if response.status_code == 200 else {}
+    if data.get("status") != "OK":
+        raise RuntimeError(f"problemset.problems failed: {response.status_code}")
+
+    stats_map = {
+        (s.get("contestId"), s.get("index")): s.get("solvedCount", 0)
+        for s in data["result"].get("problemStatistics", [])
+    }
+
+    return [
+        {
+            "platform": "codeforces",
+            "title": problem.get("name", ""),
+            "slug": problem.get("index", ""),
+            "number": problem.get("contestId") or 0,
+            "rating": problem.get("rating"),
+            "difficulty": _codeforces_difficulty(problem.get("rating")),
+            "solved_count": stats_map.get(
+                (problem.get("contestId"), problem.get("index")), 0
+            ),
+            "programming": problem.get("type", "PROGRAMMING") == "PROGRAMMING",
+            "points": problem.get("points"),
+            "tags": [(tag, tag) for tag in problem.get("tags", [])],
+        }
+        for problem in data["result"].get("problems", [])
+    ]
+
+
+def _leetcode_catalog_records():
+    records = {}
+
+    for page in range(LEETCODE_CATALOG_MAX_PAGES):
+        skip = page * LEETCODE_CATALOG_PAGE
+        response = get(_leetcode_problems_url(limit=LEETCODE_CATALOG_PAGE, skip=skip))
+        if response.status_code != 200:
+            raise RuntimeError(f"LeetCode problems failed: {response.status_code}")
+
+        data = response.json()["data"]
+        for problem in data["questions"]:
+            difficulty = problem.get("difficulty", "").lower()
+            records[problem.get("titleSlug", "")] = {
+                "platform": "leetcode",
+                "title": problem.get("title", ""),
+                "slug": problem.get("titleSlug", ""),
+                "number": int(problem.get("questionFrontendId") or 0),
+                "rating": None,
+                "difficulty": difficulty if difficulty in DIFFICULTIES else "unknown",
+                "ac_rate": problem.get("acRate", 0),
+                "premium": problem.get("isPaidOnly", False),
+                "tags": [
+                    (tag.get("name", ""), tag.get("slug", ""))
+                    for tag in problem.get("topicTags", [])
+                ],
+            }
+
+        if skip + LEETCODE_CATALOG_PAGE >= data.get("totalQuestions", 0):
+            break
+
+    return list(records.values())
+
+
+def _catalog_records():
+    return _codeforces_catalog_records() + _leetcode_catalog_records()
+
+
+problem_catalog = (
+    CatalogFile(PROBLEM_CATALOG_PATH, _catalog_records, CATALOG_MAX_AGE_SECONDS)
+    if PROBLEM_CATALOG_PATH
+    else None
+)
+
+
+def _codeforces_problem_from_catalog(record):
     return {
-        "problems": all_problems,
-        "contests": all_contests,
-        "total_problems": len(all_problems),
-        "total_contests": len(all_contests),
+        "platform": "codeforces",
+        "title": record["title"],
+        "contestId": record["number"],
+        "index": record["slug"],
+        "difficulty": record["difficulty"],
+        "rating": record["rating"],
+        "tags": record["tags"],
+        "link": f"https://codeforces.com/problemset/problem/{record['number']}/{record['slug']}",
+        "type": "PROGRAMMING" if record["programming"] else "QUESTION",
+        "points": record["points"],
+        "solved_count": record["solved_count"],
+        "is_contest": False,
+        "contest_start": None,
+        "contest_end": None,
+    }
+
+
+def _leetcode_problem_from_catalog(record):
+    return {
+        "platform": "leetcode",
+        "title": record["title"],
+        "titleSlug": record["slug"],
+        "difficulty": record["difficulty"],
+        "rating": None,
+        "tags": record["tags"],
+        "link": f"https://leetcode.com/problems/{record['slug']}",
+        "isPremium": record["premium"],
+        "acRate": record["ac_rate"],
+        "is_contest": False,
+        "contest_start": None,
+        "contest_end": None,
     }
+
+
+def _catalog_codeforces_problems(catalog, tags, min_rating, max_rating, limit):
+    # Same selection as the API path: tag by tag, the newest problems in the
+    # rating band that an earlier tag didn't already contribute.
+    rows = []
+    seen = set()
+
+    for tag in tags or [None]:
+        band = catalog.rows("codeforces", tag, min_rating, max_rating)
+        newest = heapq.nlargest(
+            limit - len(rows) + len(seen),
+            band,
+            key=lambda row: (catalog.number(row), row),
+        )
+        for row in newest:
+            if row not in seen and len(rows) < limit:
+                rows.append(row)
+        seen.update(newest)
+
+        if len(rows) >= limit:
+            break
+
+    return [_codeforces_problem_from_catalog(catalog.record(row)) for row in rows]
+
+
+def _catalog_leetcode_problems(catalog, tags, difficulty, limit, skip):
+    # Problems carrying all of the tags, in problem-number order.
+    rows = catalog.rows_with_tags("leetcode", [tag.lower() for tag in tags or []])
+    if difficulty:
+        rows = [row for row in rows if catalog.difficulty(row) == difficulty.lower()]
+
+    rows = heapq.nsmallest(skip + limit, rows, key=catalog.number)[skip:]
+    return [_leetcode_problem_from_catalog(catalog.record(row)) for row in rows]
+
+
+"""
+PROFILE COMPONENTS
+"""
+
+# The pieces a platform profile is built from. Each is fetched on its own so
+# the caller can cache them separately and refetch only what has gone stale;
+# components that read the same endpoint share the call while it is in flight.
+COMPONENT_FETCHERS = {
+    "codeforces": {
+        "tag_distribution": get_topic_distribution_async,
+        "language_stats": get_most_used_lang_async,
+        "user_info": get_codeforces_user_info_async,
+        "blogs": get_blog_info_async,
+        "rating_history": get_rating_history_async,
+        "recent_failures": get_recent_failed_problem_summaries_async,
+    },
+    "leetcode": {
+        "user_info": get_leetcode_submission_info_async,
+        "language_stats": get_leetcode_most_used_language_async,
+        "tag_distribution": get_leetcode_tag_distribution_async,
+        "recent_failures": get_recent_failed_leetcode_problems_async,
+    },
+    "codechef": {
+        "user_info": get_codechef_profile_stats_async,
+    },
+}
+
+PROFILE_COMPONENTS = {
+    "codeforces": [
+        "tag_distribution",
+        "language_stats",
+        "user_info",
+        "blogs",
+        "rating_history",
+    ],
+    "leetcode": ["user_info", "language_stats", "tag_distribution"],
+    "codechef": ["user_info"],
+}
+
+
+def _best_blog_only(blogs):
+    count, ratings = blogs
+    if not ratings:
+        return blogs
+
+    best = max(ratings, key=ratings.get)
+    return count, {best: ratings[best]}
+
+
+# Applied to a fetched component before it is cached, keeping only what the
+# profile built from it needs (see projections.py).
+COMPONENT_PROJECTIONS = {
+    ("leetcode", "user_info"): LeetCodeUserInfo.project,
+    ("codechef", "user_info"): CodechefProfile.project,
+    ("codeforces", "blogs"): _best_blog_only,
+    ("codeforces", "rating_history"): rating_points,
+}
+
+
+def project_component(platform, component, value):
+    projection = COMPONENT_PROJECTIONS.get((platform, component))
+    return projection(value) if projection else value
+
+
+def profile_from_components(platform, components):
+    if platform == "codeforces":
+        return CodeforcesProfile.project(
+            _codeforces_profile_from_components(**components)
+        )
+    elif platform == "leetcode":
+        return LeetCodeProfile.project(
+            _leetcode_profile_from(
+                LeetCodeUserInfo.project(components["user_info"]).to_dict(),
+                components["language_stats"],
+                components["tag_distribution"],
+            )
+        )
+    else:
+        return CodechefProfile.project(components["user_info"])
@@ -1,44 +1,88 @@
 // Rate limiting middleware
-const createRateLimiter = (windowMs = 15 * 60 * 1000, max = 100) => {
-  const requests = new Map();
+//
+// Sliding window counter: each client keeps the number of requests in the
+// current fixed window and in the one before it. The previous count is
+// weighted by how much of it still overlaps the sliding window, so every
+// request is O(1) and each client costs three numbers however busy it is.
+
+// Callers that are never limited. Defaults to loopback, i.e. the AlgoDash app
+// calling through API_BASE on the same host; set RATE_LIMIT_ALLOWLIST to a
+// comma-separated list of addresses to change it, or to an empty string to
+// limit everyone (e.g. behind a reverse proxy on the same host).
+const DEFAULT_ALLOWLIST = ['127.0.0.1', '::1', '::ffff:127.0.0.1'];
+
+const parseAllowlist = (value) =>
+  value === undefined
+    ? DEFAULT_ALLOWLIST
+    : value.split(',').map(address => address.trim()).filter(Boolean);
+
+const createRateLimiter = (
+  windowMs = 15 * 60 * 1000,
+  max = 100,
+  { allowlist = parseAllowlist(process.env.RATE_LIMIT_ALLOWLIST) } = {}
+) => {
+  const clients = new Map();
+  const trusted = new Set(allowlist);
+
+  // Clients idle for two windows have nothing left to count; drop them in the
+  // background instead of on the request path.
+  const cleanup = setInterval(() => {
+    const staleBefore = Math.floor(Date.now() / windowMs) * windowMs - windowMs;
+    for (const [clientId, client] of clients) {
+      if (client.windowStart < staleBefore) {
+        clients.delete(clientId);
+      }
+    }
+  }, windowMs);
+  cleanup.unref();
 
   return (req, res, next) => {
     const clientId = req.ip || req.connection.remoteAddress;
+    if (trusted.has(clientId)) {
+      return next();
+    }
+
     const now = Date.now();
-    const windowStart = now - windowMs;
-
-    // Clean up old requests
-    for (const [key, timestamps] of requests.entries()) {
-      const filteredTimestamps = timestamps.filter(timestamp => timestamp > windowStart);
-      if (filteredTimestamps.length === 0) {
-        requests.delete(key);
-      } else {
-        requests.set(key, filteredTimestamps);
-      }
+    const windowStart = Math.floor(now / windowMs) * windowMs;
+
+    let client = clients.get(clientId);
+    if (!client) {
+      client = { windowStart, current: 0, previous: 0 };
+      clients.set(clientId, client);
+    } else if (client.windowStart !== windowStart) {
+      client.previous = client.windowStart === windowStart - windowMs ? client.current : 0;
+      client.current = 0;
+      client.windowStart = windowStart;
     }
 
-    // Get current requests for this client
-    const clientRequests = requests.get(clientId) || [];
-    const recentRequests = clientRequests.filter(timestamp => timestamp > windowStart);
+    const overlap = 1 - (now - windowStart) / windowMs;
+    const used = client.previous * overlap + client.current;
+
+    if (used + 1 > max) {
+      // Time until enough of the previous window has slid out to make room,
+      // at most until the current window ends.
+      const untilReset = windowStart + windowMs - now;
+      const waitMs = client.previous === 0
+        ? untilReset
+        : Math.min(untilReset, ((used + 1 - max) / client.previous) * windowMs);
+      const retryAfter = Math.max(1, Math.ceil(waitMs / 1000));
 
-    if (recentRequests.length >= max) {
+      res.set('Retry-After', retryAfter);
       return res.status(429).json({
         success: false,
         message: 'Too many requests, please try again later',
-        retryAfter: Math.ceil(windowMs / 1000),
+        retryAfter,
         timestamp: new Date().toISOString()
       });
     }
 
-    // Add this request
-    recentRequests.push(now);
-    requests.set(clientId, recentRequests);
+    client.current += 1;
 
     // Add rate limit headers
     res.set({
       'X-RateLimit-Limit': max,
-      'X-RateLimit-Remaining': Math.max(0, max - recentRequests.length),
-      'X-RateLimit-Reset': new Date(now + windowMs).toISOString()
+      'X-RateLimit-Remaining': Math.max(0, Math.floor(max - used - 1)),
+      'X-RateLimit-Reset': new Date(windowStart + windowMs).toISOString()
     });
 
     next();
@@ -1,152 +1,162 @@
-from groq import Groq
+import hashlib
 import os
 from dotenv import load_dotenv
 import json
+from metrics import track
+from services import lazy_import, register
 
+# groq is only imported once a client is needed (or an error class is read).
+groq = lazy_import("groq")
 
 
 load_dotenv()
 
 groq_api = os.getenv("GROQ_API_KEY")
 
-client = Groq(api_key=groq_api)
-
-response_format = {
-    "type": "json_schema",
-    "json_schema": {
-        "name": "daily_cp_feedback",
-        "strict": True,
-        "schema": {
-            "type": "object",
-            "additionalProperties": False,
-            "required": [
-                "failed_submissions",
-                "ratings_and_progress",
-                "profile_and_tags",
-                "resources",
-                "suggested_priorities"
-            ],
-            "properties": {
-                "failed_submissions": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": [
-                        "analysis",
-                        "recommended_approach",
-                        "common_mistakes_to_watch"
-                    ],
-                    "properties": {
-                        "analysis": { "type": "string" },
-                        "recommended_approach": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        },
-                        "common_mistakes_to_watch": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        }
-                    }
-                },
-                "ratings_and_progress": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": [
-                        "current_snapshot",
-                        "diagnosis",
-                        "improvement_strategy"
-                    ],
-                    "properties": {
-                        "current_snapshot": { "type": "string" },
-                        "diagnosis": { "type": "string" },
-                        "improvement_strategy": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        }
-                    }
-                },
-                "profile_and_tags": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": [
-                        "strengths",
-                        "weaknesses",
-                        "tag_distribution_feedback"
-                    ],
-                    "properties": {
-                        "strengths": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        },
-                        "weaknesses": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        },
-                        "tag_distribution_feedback": { "type": "string" }
-                    }
-                },
-                "resources": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": [
-                        "practice_sets",
-                        "learning_materials",
-                        "platform_specific_tips"
-                    ],
-                    "properties": {
-                        "practice_sets": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        },
-                        "learning_materials": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        },
-                        "platform_specific_tips": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        }
-                    }
-                },
-                "suggested_priorities": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": ["today", "this_week", "long_term"],
-                    "properties": {
-                        "today": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        },
-                        "this_week": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        },
-                        "long_term": {
-                            "type": "array",
-                            "items": { "type": "string" },
-                            "minItems": 1
-                        }
-                    }
-                }
+client = register(
+    "groq",
+    lambda: groq.Groq(api_key=groq_api),
+    health_check=lambda c: c.models.list(),
+)
+async_client = register("groq_async", lambda: groq.AsyncGroq(api_key=groq_api))
+
+section_schemas = {
+    "failed_submissions": {
+        "type": "object",
+        "additionalProperties": False,
+        "required": [
+            "analysis",
+            "recommended_approach",
+            "common_mistakes_to_watch"
+        ],
+        "properties": {
+            "analysis": { "type": "string" },
+            "recommended_approach": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            },
+            "common_mistakes_to_watch": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            }
+        }
+    },
+    "ratings_and_progress": {
+        "type": "object",
+        "additionalProperties": False,
+        "required": [
+            "current_snapshot",
+            "diagnosis",
+            "improvement_strategy"
+        ],
+        "properties": {
+            "current_snapshot": { "type": "string" },
+            "diagnosis": { "type": "string" },
+            "improvement_strategy": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            }
+        }
+    },
+    "profile_and_tags": {
+        "type": "object",
+        "additionalProperties": False,
+        "required": [
+            "strengths",
+            "weaknesses",
+            "tag_distribution_feedback"
+        ],
+        "properties": {
+            "strengths": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            },
+            "weaknesses": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            },
+            "tag_distribution_feedback": { "type": "string" }
+        }
+    },
+    "resources": {
+        "type": "object",
+        "additionalProperties": False,
+        "required": [
+            "practice_sets",
+            "learning_materials",
+            "platform_specific_tips"
+        ],
+        "properties": {
+            "practice_sets": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            },
+            "learning_materials": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            },
+            "platform_specific_tips": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            }
+        }
+    },
+    "suggested_priorities": {
+        "type": "object",
+        "additionalProperties": False,
+        "required": ["today", "this_week", "long_term"],
+        "properties": {
+            "today": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            },
+            "this_week": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
+            },
+            "long_term": {
+                "type": "array",
+                "items": { "type": "string" },
+                "minItems": 1
             }
         }
     }
 }
 
+FEEDBACK_SECTIONS = list(section_schemas)
 
-def get_ai_response(query, context):
 
-    try:
-        prompt = f"""
+def build_response_format(sections):
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "daily_cp_feedback",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": list(sections),
+                "properties": {name: section_schemas[name] for name in sections},
+            }
+        }
+    }
+
+
+response_format = build_response_format(FEEDBACK_SECTIONS)
+
+
+def chat_prompt(query, context):
+    return f"""
         You are AlgoMentor.
         You are a competitive programming coach specializing in algorithms, data structures, and problem-solving strategy.
         Your purpose is to guide competitive programmers to think algorithmically, never to directly solve problems for them. You are a strategic partner in developing problem-solving intuition and computational thinking.
@@ -220,15 +230,21 @@ def get_ai_response(query, context):
 
         Query: {query}
         """
-        completion = client.chat.completions.create(
-            model="openai/gpt-oss-120b",
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
+
+
+def get_ai_response(query, context):
+
+    try:
+        with track("groq", "chat"):
+            completion = client.chat.completions.create(
+                model="openai/gpt-oss-120b",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": chat_prompt(query, context)
+                    }
+                ]
+            )
 
         return completion.choices[0].message.content
     
@@ -237,13 +253,100 @@ def get_ai_response(query, context):
     except Exception as e:
          return f"## {str(e)}"
 
-def feedback_generator(info):
+
+async def get_ai_response_async(query, context):
 
     try:
+        with track("groq", "chat"):
+            completion = await async_client.chat.completions.create(
+                model="openai/gpt-oss-120b",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": chat_prompt(query, context)
+                    }
+                ]
+            )
 
-        prompt = f"""You are AlgoMentor, an analytical competitive programming coach.
+        return completion.choices[0].message.content
+
+    except groq.RateLimitError as e:
+            return "## ❗❗ Rate limit reached\n\nPlease slow down and try again in a moment."
+    except Exception as e:
+         return f"## {str(e)}"
+
+
+def _platform_data(dashboard_info, platform):
+    return ((dashboard_info or {}).get(platform) or {}).get("data") or {}
+
+
+def _pick(data, keys):
+    return {k: data.get(k) for k in keys}
+
+
+def section_inputs(info):
+    # Only fields that move when the user actually practises are included,
+    # so drifting values (global ranks etc.) don't invalidate a section.
+    dashboard_info = info.get("dashboard_info")
+    leetcode = _platform_data(dashboard_info, "leetcode")
+    codeforces = _platform_data(dashboard_info, "codeforces")
+    codechef = _platform_data(dashboard_info, "codechef")
+
+    failed = {
+        "failed_leetcode": info.get("failed_leetcode"),
+        "failed_codeforces": info.get("failed_codeforces"),
+    }
+    ratings = {
+        "ratings": {
+            "leetcode": _pick(
+                leetcode, ["totalSolved", "easySolved", "mediumSolved", "hardSolved"]
+            ),
+            "codeforces": _pick(
+                codeforces, ["rank", "maxRating", "maxRank", "ratingHistory"]
+            ),
+            "codechef": _pick(codechef, ["rating", "rating_number"]),
+        }
+    }
+    tags = {"tag_distribution": info.get("tag_distribution")}
+    profile = {
+        "profile": {
+            "leetcode": _pick(
+                leetcode, ["most_used_tag", "most_used_lang", "history_complete"]
+            ),
+            "codeforces": _pick(
+                codeforces, ["most_used_tag", "most_used_lang", "total_solved"]
+            ),
+        }
+    }
+
+    return {
+        "failed_submissions": failed,
+        "ratings_and_progress": ratings,
+        "profile_and_tags": {**tags, **profile},
+        "resources": {**failed, **tags},
+        "suggested_priorities": {**failed, **ratings, **tags, **profile},
+    }
+
+
+def fingerprint(payload):
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def stale_sections(fingerprints, previous):
+    previous_fingerprints = previous.get("section_fingerprints") or {}
+    return [
+        name
+        for name in FEEDBACK_SECTIONS
+        if name not in previous or previous_fingerprints.get(name) != fingerprints[name]
+    ]
+
+
+def feedback_prompt(sections, info):
+    return f"""You are AlgoMentor, an analytical competitive programming coach.
 
             Generate daily feedback based on a user’s recent submissions, ratings, and profile statistics.
+            Only the following feedback sections are needed today: {", ".join(sections)}.
 
             Focus on diagnosis and prescription:
             - Explain why failures happened (logic, complexity, edge cases).
@@ -261,19 +364,22 @@ def feedback_generator(info):
             If information is missing, infer cautiously and reflect uncertainty through phrasing.
             Here is the user info: {info}.
             """
-        
-        response = client.chat.completions.create(
-            model="openai/gpt-oss-120b",
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ], 
-            response_format=response_format
-        )
-
-        print(response.choices[0].message.content)
+
+
+def _generate_sections(sections, info):
+
+    try:
+        with track("groq", "feedback"):
+            response = client.chat.completions.create(
+                model="openai/gpt-oss-120b",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": feedback_prompt(sections, info)
+                    }
+                ], 
+                response_format=build_response_format(sections)
+            )
 
         return json.loads(response.choices[0].message.content or "{}")
     
@@ -283,7 +389,75 @@ def feedback_generator(info):
          return {"error" : str(e)}
 
 
+async def _generate_sections_async(sections, info):
+
+    try:
+        with track("groq", "feedback"):
+            response = await async_client.chat.completions.create(
+                model="openai/gpt-oss-120b",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": feedback_prompt(sections, info)
+                    }
+                ],
+                response_format=build_response_format(sections)
+            )
+
+        return json.loads(response.choices[0].message.content or "{}")
+
+    except groq.RateLimitError as e:
+         return {"error" : "❗❗ Rate limit reached\n\nPlease slow down and try again in a moment."}
+    except Exception as e:
+         return {"error" : str(e)}
+
+
+def _plan_feedback(info, previous):
+    # Sections whose inputs are unchanged since the stored feedback are reused
+    # as-is; only the stale ones are sent to the model, with a schema that
+    # covers just those sections.
+    inputs = section_inputs(info)
+    fingerprints = {name: fingerprint(payload) for name, payload in inputs.items()}
+
+    previous = previous if isinstance(previous, dict) else {}
+    stale = stale_sections(fingerprints, previous)
+
+    feedback = {name: previous[name] for name in FEEDBACK_SECTIONS if name not in stale}
+    feedback["section_fingerprints"] = fingerprints
+
+    # A full generation sees the whole dashboard payload, as it always has;
+    # only a partial one is narrowed to what its stale sections depend on.
+    if len(stale) == len(FEEDBACK_SECTIONS):
+        return feedback, stale, info
+
+    info_to_send = {}
+    for name in stale:
+        info_to_send.update(inputs[name])
+
+    return feedback, stale, info_to_send
+
+
+def _merge_feedback(feedback, generated):
+    if "error" in generated:
+        return generated
+
+    return {**feedback, **generated}
+
+
+def feedback_generator(info, previous=None):
+    feedback, stale, info_to_send = _plan_feedback(info, previous)
+
+    if not stale:
+        return feedback
+
+    return _merge_feedback(feedback, _generate_sections(stale, info_to_send))
+
 
+async def feedback_generator_async(info, previous=None):
+    feedback, stale, info_to_send = _plan_feedback(info, previous)
 
+    if not stale:
+        return feedback
 
-  
\ No newline at end of file
+    generated = await _generate_sections_async(stale, info_to_send)
+    return _merge_feedback(feedback, generated)
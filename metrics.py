@@ -0,0 +1,203 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+# In-process metrics for the upstreams this app depends on, exposed in the
+# Prometheus text format by the /metrics route. Every worker process keeps
+# its own registry, so scrape each worker (or run a single one) to see all
+# of them.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+UPSTREAM_HOSTS = {
+    "codeforces.com": "codeforces",
+    "alfa-leetcode-api.onrender.com": "alfa-leetcode-api",
+    "competeapi.vercel.app": "competeapi",
+    urlsplit(os.getenv("NODE_API_URL", "http://localhost:3000")).netloc: "node-api",
+}
+
+HELP = {
+    "upstream_request_duration_seconds": "Latency of calls to upstream services.",
+    "upstream_requests_total": "Calls to upstream services by outcome.",
+    "upstream_response_bytes_total": "Response bytes received from upstreams.",
+    "upstream_requests_coalesced_total": "Upstream GETs shared with a call in flight.",
+    "upstream_hedged_requests_total": "Second attempts fired at a slow upstream.",
+    "upstream_short_circuits_total": "Calls not made because a breaker was open.",
+    "http_cache_requests_total": "Upstream GETs by on-disk response cache outcome.",
+    "http_request_duration_seconds": "Latency of requests served by this app.",
+    "cache_requests_total": "Cache lookups made while serving a route.",
+    "cache_evictions_total": "Cache entries dropped, by key family and reason.",
+    "cache_bytes": "Bytes held by this worker's cache.",
+    "cache_entries": "Entries held by this worker's cache.",
+    "cache_family_bytes": "Bytes held by this worker's cache, by key family.",
+    "cache_family_entries": "Entries held by this worker's cache, by key family.",
+    "worker_info": "The worker process that produced this scrape.",
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+_spans = ContextVar("spans", default=None)
+
+# Callables yielding (name, labels, value) for gauges read at scrape time.
+_gauge_sources = []
+
+
+def upstream_name(url):
+    host = urlsplit(url).netloc
+    return UPSTREAM_HOSTS.get(host, host)
+
+
+def register_gauges(source):
+    _gauge_sources.append(source)
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, labels, amount=1):
+    key = (name, _labels_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name, labels, value):
+    key = (name, _labels_key(labels))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * len(LATENCY_BUCKETS), 0, 0.0]
+
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                histogram[0][i] += 1
+        histogram[1] += 1
+        histogram[2] += value
+
+
+def start_spans():
+    # A fresh list per request; tasks and threads started while serving it
+    # copy the context and therefore append to the same list.
+    spans = []
+    _spans.set(spans)
+    return spans
+
+
+def add_span(upstream, operation, duration, status):
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((upstream, operation, duration, status))
+
+
+def record_upstream(upstream, operation, duration, status, size=None):
+    labels = {"upstream": upstream, "status": str(status)}
+    observe("upstream_request_duration_seconds", {"upstream": upstream}, duration)
+    inc("upstream_requests_total", labels)
+    if size:
+        inc("upstream_response_bytes_total", {"upstream": upstream}, size)
+    add_span(upstream, operation, duration, status)
+
+
+def record_response(url, response, started):
+    record_upstream(
+        upstream_name(url),
+        urlsplit(url).path,
+        time.perf_counter() - started,
+        response.status_code,
+        len(response.content),
+    )
+
+
+def record_failure(url, error, started):
+    record_upstream(
+        upstream_name(url),
+        urlsplit(url).path,
+        time.perf_counter() - started,
+        type(error).__name__,
+    )
+
+
+@contextmanager
+def track(upstream, operation):
+    # For clients that don't go through http_client (Supabase, Groq).
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except Exception as e:
+        status = type(e).__name__
+        raise
+    finally:
+        record_upstream(upstream, operation, time.perf_counter() - started, status)
+
+
+def record_cache(route, family, hit):
+    inc(
+        "cache_requests_total",
+        {"route": route, "family": family, "result": "hit" if hit else "miss"},
+    )
+
+
+def format_span_log(method, path, status, duration, spans):
+    lines = [f"{method} {path} {status} {duration * 1000:.1f}ms"]
+    for upstream, operation, span_duration, span_status in spans:
+        lines.append(
+            f"  {upstream:<18} {span_status!s:<6} {span_duration * 1000:8.1f}ms"
+            f"  {operation}"
+        )
+    return "\n".join(lines)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def render_metrics():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(v[0]), v[1], v[2]) for k, v in _histograms.items()}
+
+    lines = []
+    seen = set()
+
+    def header(name, kind):
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    # Counters are per worker, so scrapers need to tell the workers apart.
+    header("worker_info", "gauge")
+    lines.append(f'worker_info{{pid="{os.getpid()}"}} 1')
+
+    for source in _gauge_sources:
+        for name, labels, value in source():
+            header(name, "gauge")
+            lines.append(f"{name}{_format_labels(_labels_key(labels))} {value}")
+
+    for (name, labels), value in sorted(counters.items()):
+        header(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for (name, labels), (buckets, count, total) in sorted(histograms.items()):
+        header(name, "histogram")
+        for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+            le = _format_labels(labels + (("le", str(bound)),))
+            lines.append(f"{name}_bucket{le} {bucket_count}")
+        le = _format_labels(labels + (("le", "+Inf"),))
+        lines.append(f"{name}_bucket{le} {count}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,101 @@
+# Cached per-user payloads are cut down to the fields the dashboard cards,
+# the rating chart and the feedback prompt actually read, and held in
+# slotted objects rather than dicts. Upstream profiles carry a lot more
+# (LeetCode's submission calendar and recent submissions, CodeChef's profile
+# metadata), all of which was pickled on every cache write before.
+#
+# Projections read like the dicts they replace: templates use attribute
+# access, Python code uses .get() / [] and pickles hold just the values.
+
+
+class Projection:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def project(cls, data):
+        if isinstance(data, cls):
+            return data
+        return cls(*(data.get(name) for name in cls.__slots__))
+
+    def get(self, name, default=None):
+        if name not in self.__slots__:
+            return default
+        return getattr(self, name)
+
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.__getstate__() == other.__getstate__()
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class LeetCodeUserInfo(Projection):
+    __slots__ = (
+        "totalSolved",
+        "easySolved",
+        "totalEasy",
+        "mediumSolved",
+        "totalMedium",
+        "hardSolved",
+        "totalHard",
+        "ranking",
+        "contributionPoint",
+    )
+
+
+class LeetCodeProfile(Projection):
+    __slots__ = LeetCodeUserInfo.__slots__ + (
+        "most_used_lang",
+        "most_used_tag",
+        "history_complete",
+    )
+
+
+class CodeforcesProfile(Projection):
+    __slots__ = (
+        "rank",
+        "maxRating",
+        "maxRank",
+        "total_solved",
+        "most_used_lang",
+        "most_used_tag",
+        "blog_count",
+        "best_rated_blog",
+        "best_rated_blog_ratings",
+        "ratingHistory",
+    )
+
+
+class CodechefProfile(Projection):
+    __slots__ = ("rating", "rating_number", "global_rank", "country", "country_rank")
+
+
+def rating_points(history):
+    # Rating history as (date, rating) pairs: several hundred small dicts
+    # per handle otherwise, copied into every entry that holds the profile.
+    return [(point["date"], point["rating"]) for point in history]
+
+
+def json_default(value):
+    if isinstance(value, Projection):
+        return value.to_dict()
+    return str(value)
@@ -0,0 +1,113 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from markupsafe import Markup
+
+from services import on_warm_up
+
+RENDER_CACHE_SIZE = 512
+
+_parser = None
+_parser_lock = threading.Lock()
+
+_render_cache = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+@on_warm_up
+def get_parser():
+    # MarkdownIt keeps all per-document state in the state object it creates
+    # for each render call, so one parser per worker can be shared by threads.
+    # markdown_it and the plugins are imported here so workers that never
+    # render markdown don't load them. Raw HTML in the text is escaped rather
+    # than passed through: it comes from the LLM and the output is marked safe.
+    global _parser
+
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                from markdown_it import MarkdownIt
+                from markdown_it.common.utils import escapeHtml
+                from mdit_py_plugins.texmath import texmath_plugin
+                from mdit_py_plugins.texmath.index import rules
+
+                parser = MarkdownIt("gfm-like", {"linkify": False, "html": False})
+                parser.use(texmath_plugin)
+
+                # texmath writes the TeX between the delimiters out verbatim,
+                # which html=False doesn't cover; escape it like other text.
+                dollars = rules["dollars"]
+                for rule in dollars["inline"] + dollars["block"]:
+                    parser.add_render_rule(
+                        rule["name"], _escaped_math(rule["tmpl"], escapeHtml)
+                    )
+
+                _parser = parser
+    return _parser
+
+
+def _escaped_math(tmpl, escape):
+    def render_math(self, tokens, idx, options, env):
+        token = tokens[idx]
+        return tmpl.format(escape(token.content), escape(token.info))
+
+    return render_math
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cached_render(kind, text, render_fn):
+    key = (kind, content_hash(text))
+
+    with _render_cache_lock:
+        html = _render_cache.get(key)
+        if html is not None:
+            _render_cache.move_to_end(key)
+            return html
+
+    html = render_fn(text)
+
+    with _render_cache_lock:
+        _render_cache[key] = html
+        _render_cache.move_to_end(key)
+        while len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+
+    return html
+
+
+def render_markdown(text, cache=True):
+    if not text:
+        return ""
+    if not cache:
+        return get_parser().render(text)
+    return _cached_render("block", text, get_parser().render)
+
+
+def render_inline(text):
+    if not text:
+        return ""
+    return _cached_render("inline", text, get_parser().renderInline)
+
+
+def wrap_markdown_html(html):
+    return f"""
+            <div class="markdown-content">
+                {html}
+            </div>
+            """
+
+
+def render_feedback(feedback):
+    # Feedback values are short markdown strings (or lists of them); render
+    # them inline and mark them safe so the template can print them as-is.
+    if isinstance(feedback, dict):
+        return {k: render_feedback(v) for k, v in feedback.items()}
+    if isinstance(feedback, list):
+        return [render_feedback(v) for v in feedback]
+    if isinstance(feedback, str):
+        return Markup(render_inline(feedback))
+    return feedback
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+# Guards for upstreams that are slow or unreliable (alfa-leetcode-api
+# cold-starts, competeapi times out): a circuit breaker that stops calling an
+# upstream after repeated failures, latency tracking that decides when a
+# second, hedged attempt is worth firing, and the hedging itself.
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT_SECONDS = 30
+
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+DEFAULT_HEDGE_DELAY_SECONDS = 1.0
+MIN_HEDGE_DELAY_SECONDS = 0.05
+
+
+# What CircuitBreaker.allow returns for the half-open trial call.
+TRIAL = "trial"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    # Closed until FAILURE_THRESHOLD failures in a row, then open (calls fail
+    # fast) for RESET_TIMEOUT_SECONDS, after which a single trial call is let
+    # through; its outcome closes the breaker or opens it again.
+
+    def __init__(
+        self,
+        name,
+        failure_threshold=FAILURE_THRESHOLD,
+        reset_timeout=RESET_TIMEOUT_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        # False to fail fast; TRIAL for the trial call, which must be handed
+        # to release() once it is over; True otherwise.
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            if self._trial or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+
+            self._trial = True
+            return TRIAL
+
+    def release(self, allowed):
+        # Frees the trial slot if the trial ended without recording an
+        # outcome (cancelled, or a BaseException), so the next call can try.
+        if allowed is TRIAL:
+            with self._lock:
+                self._trial = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+class LatencyTracker:
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct):
+        with self._lock:
+            samples = sorted(self._samples)
+
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def hedge_delay(self):
+        p95 = self.percentile(95)
+        if p95 is None:
+            return DEFAULT_HEDGE_DELAY_SECONDS
+        return max(p95, MIN_HEDGE_DELAY_SECONDS)
+
+
+async def hedged(first, second, delay, acceptable, on_hedge=None):
+    # Runs first(); if it hasn't finished after `delay` seconds, starts
+    # second() as well and returns whichever acceptable result comes back
+    # first. If neither is acceptable, the last result (or error) stands.
+    tasks = [asyncio.ensure_future(first())]
+    done, _ = await asyncio.wait(tasks, timeout=delay)
+
+    if not done:
+        if on_hedge is not None:
+            on_hedge()
+        tasks.append(asyncio.ensure_future(second()))
+
+    last = None
+    try:
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                tasks.remove(task)
+                last = task
+                if task.exception() is None and acceptable(task.result()):
+                    return task.result()
+        return last.result()
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,204 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlencode
+
+import httpx
+
+from metrics import inc, upstream_name
+
+# On-disk cache of upstream GET responses, shared by every worker and kept
+# across restarts. Bodies are stored zlib-compressed. A response is served
+# without asking the upstream while it is fresh (FRESHNESS_RULES, else the
+# upstream's Cache-Control max-age); after that it is revalidated with
+# If-None-Match / If-Modified-Since when the upstream sent an ETag or
+# Last-Modified, so an unchanged body costs a 304.
+
+RESPONSE_CACHE_PATH = os.getenv(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".cache", "responses.sqlite3"
+    ),
+)
+
+MAX_ENTRIES = 10000
+PRUNE_EVERY_WRITES = 200
+
+# (URL pattern, seconds fresh). Per-user data isn't listed: app.py decides
+# when to ask for it again, and then it should be current.
+FRESHNESS_RULES = [
+    (re.compile(r"codeforces\.com/api/problemset\.problems"), 6 * 3600),
+    (re.compile(r"codeforces\.com/api/contest\.list"), 600),
+    (re.compile(r"codeforces\.com/api/user\.blogEntries"), 86400),
+    (re.compile(r"competeapi\.vercel\.app/contests/"), 600),
+    (re.compile(r"/leetcode/problems"), 6 * 3600),
+    (re.compile(r"/leetcode/daily"), 600),
+]
+
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+_local = threading.local()
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+class CachedResponse:
+    def __init__(self, status, content_type, etag, last_modified, body, fresh_until):
+        self.status = status
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.fresh_until = fresh_until
+
+    def fresh(self):
+        return time.time() < self.fresh_until
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def response(self):
+        headers = {"content-type": self.content_type} if self.content_type else {}
+        return httpx.Response(self.status, content=self.body, headers=headers)
+
+
+def _connection():
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        os.makedirs(os.path.dirname(RESPONSE_CACHE_PATH) or ".", exist_ok=True)
+        connection = sqlite3.connect(
+            RESPONSE_CACHE_PATH, timeout=5, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, status INTEGER, content_type TEXT, etag TEXT,"
+            " last_modified TEXT, body BLOB, fresh_until REAL, stored_at REAL)"
+        )
+        _local.connection = connection
+    return connection
+
+
+def cache_key(url, params=None):
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()))}"
+
+
+def freshness(url, response):
+    for pattern, seconds in FRESHNESS_RULES:
+        if pattern.search(url):
+            return seconds
+
+    match = MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    return int(match.group(1)) if match else 0
+
+
+def lookup(url, params=None):
+    if not RESPONSE_CACHE_PATH:
+        return None
+
+    try:
+        row = (
+            _connection()
+            .execute(
+                "SELECT status, content_type, etag, last_modified, body, fresh_until"
+                " FROM responses WHERE key = ?",
+                (cache_key(url, params),),
+            )
+            .fetchone()
+        )
+    except sqlite3.Error as e:
+        print(f"Response cache read failed: {e}")
+        return None
+
+    if row is None:
+        return None
+
+    status, content_type, etag, last_modified, body, fresh_until = row
+    return CachedResponse(
+        status, content_type, etag, last_modified, zlib.decompress(body), fresh_until
+    )
+
+
+def record(url, result):
+    inc("http_cache_requests_total", {"upstream": upstream_name(url), "result": result})
+
+
+def update(url, params, cached, response):
+    # Called with what the upstream answered; returns the response to use.
+    if not RESPONSE_CACHE_PATH:
+        return response
+
+    key = cache_key(url, params)
+
+    if response.status_code == 304 and cached is not None:
+        record(url, "revalidated")
+        cached.fresh_until = time.time() + freshness(url, response)
+        _execute(
+            "UPDATE responses SET fresh_until = ? WHERE key = ?",
+            (cached.fresh_until, key),
+        )
+        return cached.response()
+
+    record(url, "miss")
+
+    cache_control = response.headers.get("cache-control", "")
+    if response.status_code != 200 or "no-store" in cache_control:
+        return response
+
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    seconds = freshness(url, response)
+
+    # Nothing to gain from a body that is never fresh and can't be revalidated.
+    if not seconds and not etag and not last_modified:
+        return response
+
+    now = time.time()
+    _execute(
+        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            key,
+            response.status_code,
+            response.headers.get("content-type"),
+            etag,
+            last_modified,
+            zlib.compress(response.content, 6),
+            now + seconds,
+            now,
+        ),
+    )
+    _maybe_prune()
+    return response
+
+
+def _execute(sql, args):
+    try:
+        _connection().execute(sql, args)
+    except sqlite3.Error as e:
+        print(f"Response cache write failed: {e}")
+
+
+def _maybe_prune():
+    global _writes
+
+    with _writes_lock:
+        _writes += 1
+        if _writes % PRUNE_EVERY_WRITES:
+            return
+
+    _execute(
+        "DELETE FROM responses WHERE key IN (SELECT key FROM responses"
+        " ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+        (MAX_ENTRIES,),
+    )
@@ -0,0 +1,85 @@
+from itertools import accumulate
+
+RATING_SERIES_POINTS = 120
+ROLLING_WINDOW = 5
+
+
+def lttb_indices(xs, ys, target):
+    # Largest-Triangle-Three-Buckets: keeps the first and last points and,
+    # from each bucket in between, the point forming the largest triangle
+    # with the previously kept point and the average of the next bucket.
+    n = len(xs)
+    if target >= n or target < 3:
+        return list(range(n))
+
+    bucket_size = (n - 2) / (target - 2)
+    kept = [0]
+    a = 0
+
+    for i in range(target - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[a], ys[a]
+        a = max(
+            range(start, end),
+            key=lambda j: abs(
+                (ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay)
+            ),
+        )
+        kept.append(a)
+
+    kept.append(n - 1)
+    return kept
+
+
+def rolling_mean(values, window):
+    sums = [0, *accumulate(values)]
+    return [
+        (sums[i + 1] - sums[max(0, i + 1 - window)]) / min(i + 1, window)
+        for i in range(len(values))
+    ]
+
+
+def prepare_rating_series(history, target=RATING_SERIES_POINTS):
+    # Derived values are computed over the full history and then sampled, so
+    # the rolling mean and deltas stay exact for the points that are kept.
+    if not history:
+        return {"points": [], "total": 0, "maxRating": None}
+
+    # history is a list of (date, rating) pairs, oldest first.
+    dates = [date for date, _ in history]
+    ratings = [rating for _, rating in history]
+
+    deltas = [None, *(b - a for a, b in zip(ratings, ratings[1:]))]
+    means = rolling_mean(ratings, ROLLING_WINDOW)
+    running_max = list(accumulate(ratings, max))
+    peaks = [i == 0 or ratings[i] > running_max[i - 1] for i in range(len(ratings))]
+
+    kept = lttb_indices(dates, ratings, target)
+
+    # The all-time peak is the one point the chart must never drop.
+    best = ratings.index(running_max[-1])
+    if best not in kept:
+        kept = sorted([*kept, best])
+
+    return {
+        "points": [
+            {
+                "date": dates[i],
+                "rating": ratings[i],
+                "delta": deltas[i],
+                "mean": round(means[i], 1),
+                "peak": peaks[i],
+            }
+            for i in kept
+        ],
+        "total": len(history),
+        "maxRating": running_max[-1],
+    }
@@ -0,0 +1,127 @@
+import importlib.util
+import sys
+import threading
+import time
+
+# Clients for external services (Supabase, Groq) are registered here and
+# built on first use rather than at import, so gunicorn workers and scripts
+# that only need part of the app don't pay for the rest at boot.
+
+_services = {}
+_warm_up_hooks = []
+
+
+def lazy_import(name):
+    # The module object is returned straight away; the import itself runs
+    # the first time one of its attributes is read.
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class LazyService:
+    def __init__(self, name, factory, health_check=None):
+        self.name = name
+        self._factory = factory
+        self._health_check = health_check
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self):
+        return self._instance is not None
+
+    def get(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    def reset(self):
+        with self._lock:
+            self._instance = None
+
+    def check(self):
+        started = time.perf_counter()
+        error = None
+
+        try:
+            instance = self.get()
+            if self._health_check is not None:
+                self._health_check(instance)
+        except Exception as e:
+            error = str(e)
+
+        return {
+            "ok": error is None,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error": error,
+        }
+
+
+class ServiceProxy:
+    # Module-level stand-in for a client, so call sites like
+    # supabase_admin.table(...) don't change.
+
+    def __init__(self, service):
+        self._service = service
+
+    def __getattr__(self, name):
+        return getattr(self._service.get(), name)
+
+
+def register(name, factory, health_check=None):
+    service = LazyService(name, factory, health_check)
+    _services[name] = service
+    return ServiceProxy(service)
+
+
+def get(name):
+    return _services[name].get()
+
+
+def status():
+    return {name: {"created": s.created} for name, s in _services.items()}
+
+
+def health_checks(names=None):
+    return {name: _services[name].check() for name in names or list(_services)}
+
+
+def on_warm_up(hook):
+    _warm_up_hooks.append(hook)
+    return hook
+
+
+def warm_up(names=None):
+    # Builds the services and runs the registered hooks ahead of the first
+    # request; failures are logged and left for that request to surface.
+    timings = {}
+
+    for name in names or list(_services):
+        started = time.perf_counter()
+        try:
+            _services[name].get()
+        except Exception as e:
+            print(f"Warm-up of {name} failed: {e}")
+        timings[name] = time.perf_counter() - started
+
+    for hook in _warm_up_hooks:
+        started = time.perf_counter()
+        try:
+            hook()
+        except Exception as e:
+            print(f"Warm-up hook {hook.__name__} failed: {e}")
+        timings[hook.__name__] = time.perf_counter() - started
+
+    return timings
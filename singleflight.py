@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+# Coalesces concurrent work on the same key: the first caller runs it and
+# callers arriving before it finishes wait for and share its result. Sync
+# callers wait on a thread event; async callers on a future of their own loop
+# that the leader resolves thread-safely, so waiting holds no thread.
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = []
+        self.result = None
+        self.error = None
+
+    def outcome(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def _finish(self, key, call, result=None, error=None):
+        call.result = result
+        call.error = error
+        with self._lock:
+            self._calls.pop(key, None)
+            call.done.set()
+            waiters = call.waiters
+
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                pass  # the waiter's loop is closed
+
+    async def _wait(self, call):
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        with self._lock:
+            if call.done.is_set():
+                return
+            call.waiters.append((loop, waiter))
+        await waiter
+
+    def do(self, key, fn, on_shared=None):
+        call, leader = self._join(key)
+
+        if not leader:
+            if on_shared is not None:
+                on_shared()
+            call.done.wait()
+            return call.outcome()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, call, error=e)
+            raise
+
+        self._finish(key, call, result)
+        return result
+
+    async def do_async(self, key, fn, on_shared=None):
+        call, leader = self._join(key)
+
+        if not leader:
+            if on_shared is not None:
+                on_shared()
+            await self._wait(call)
+            return call.outcome()
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, call, error=e)
+            raise
+
+        self._finish(key, call, result)
+        return result
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
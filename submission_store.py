@@ -0,0 +1,163 @@
+import os
+import sqlite3
+import threading
+import time
+
+# Submission history per platform handle, kept on disk and shared by every
+# worker. Upstreams only expose a user's most recent submissions, so each
+# sync appends what is newer than the handle's cursor (the newest timestamp
+# stored) and the history grows past that window over time. A sync whose
+# page doesn't reach back to the cursor records the span it missed in
+# sync_gaps; the handle's history is incomplete from then on.
+
+SUBMISSION_STORE_PATH = os.getenv(
+    "SUBMISSION_STORE_PATH",
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".cache", "submissions.sqlite3"
+    ),
+)
+
+_local = threading.local()
+
+
+def _connection():
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        os.makedirs(os.path.dirname(SUBMISSION_STORE_PATH) or ".", exist_ok=True)
+        connection = sqlite3.connect(
+            SUBMISSION_STORE_PATH, timeout=5, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS submissions ("
+            " platform TEXT, handle TEXT, id TEXT, timestamp INTEGER,"
+            " title_slug TEXT, title TEXT, status TEXT, lang TEXT,"
+            " PRIMARY KEY (platform, handle, id))"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS submissions_by_time"
+            " ON submissions (platform, handle, timestamp DESC)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            " platform TEXT, handle TEXT, cursor INTEGER, synced_at REAL,"
+            " PRIMARY KEY (platform, handle))"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sync_gaps ("
+            " platform TEXT, handle TEXT, after INTEGER, before INTEGER)"
+        )
+        _local.connection = connection
+    return connection
+
+
+def enabled():
+    return bool(SUBMISSION_STORE_PATH)
+
+
+def sync_state(platform, handle):
+    # (cursor, synced_at), or None if the handle was never synced.
+    try:
+        return (
+            _connection()
+            .execute(
+                "SELECT cursor, synced_at FROM sync_state"
+                " WHERE platform = ? AND handle = ?",
+                (platform, handle.lower()),
+            )
+            .fetchone()
+        )
+    except sqlite3.Error as e:
+        print(f"Submission store read failed: {e}")
+        return None
+
+
+def append(platform, handle, submissions, gap=None):
+    # submissions: dicts with id, timestamp, title_slug, title, status, lang.
+    # Already stored ones are ignored, so overlapping pages are harmless.
+    # gap: (after, before) timestamps between which submissions were missed.
+    handle = handle.lower()
+    state = sync_state(platform, handle)
+    cursor = max(
+        [s["timestamp"] for s in submissions] + ([state[0]] if state else [0])
+    )
+
+    try:
+        connection = _connection()
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT OR IGNORE INTO submissions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        platform,
+                        handle,
+                        s["id"],
+                        s["timestamp"],
+                        s["title_slug"],
+                        s["title"],
+                        s["status"],
+                        s["lang"],
+                    )
+                    for s in submissions
+                ],
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                (platform, handle, cursor, time.time()),
+            )
+            if gap is not None:
+                connection.execute(
+                    "INSERT INTO sync_gaps VALUES (?, ?, ?, ?)",
+                    (platform, handle, *gap),
+                )
+    except sqlite3.Error as e:
+        print(f"Submission store write failed: {e}")
+
+
+def complete(platform, handle):
+    # False once a sync has missed submissions for the handle.
+    try:
+        row = (
+            _connection()
+            .execute(
+                "SELECT 1 FROM sync_gaps WHERE platform = ? AND handle = ? LIMIT 1",
+                (platform, handle.lower()),
+            )
+            .fetchone()
+        )
+    except sqlite3.Error as e:
+        print(f"Submission store read failed: {e}")
+        return True
+
+    return row is None
+
+
+def history(platform, handle, accepted_only=False):
+    # Stored submissions, newest first.
+    sql = (
+        "SELECT id, timestamp, title_slug, title, status, lang FROM submissions"
+        " WHERE platform = ? AND handle = ?"
+    )
+    if accepted_only:
+        sql += " AND status = 'Accepted'"
+    sql += " ORDER BY timestamp DESC"
+
+    try:
+        rows = _connection().execute(sql, (platform, handle.lower())).fetchall()
+    except sqlite3.Error as e:
+        print(f"Submission store read failed: {e}")
+        return []
+
+    return [
+        {
+            "id": id,
+            "timestamp": timestamp,
+            "title_slug": title_slug,
+            "title": title,
+            "status": status,
+            "lang": lang,
+        }
+        for id, timestamp, title_slug, title, status, lang in rows
+    ]
@@ -0,0 +1,36 @@
+from markupsafe import Markup
+
+from render import render_feedback, render_inline, render_markdown
+
+
+def test_raw_html_is_escaped():
+    assert "<img" not in render_markdown("<img src=x onerror=1>", cache=False)
+
+
+def test_inline_math_is_escaped():
+    html = render_inline("$<img src=x onerror=1>$")
+
+    assert "<img" not in html
+    assert "&lt;img src=x onerror=1&gt;" in html
+
+
+def test_block_math_is_escaped():
+    html = render_markdown("$$<script>alert(1)</script>$$", cache=False)
+
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_block_math_label_is_escaped():
+    html = render_markdown("$$\nx\n$$ (<b onclick=1>1</b>)", cache=False)
+
+    assert "<b" not in html
+
+
+def test_feedback_math_is_escaped_before_marked_safe():
+    feedback = render_feedback({"summary": ["$<svg onload=1>$ is $x < y$"]})
+    html = feedback["summary"][0]
+
+    assert isinstance(html, Markup)
+    assert "<svg" not in html
+    assert "<eq>x &lt; y</eq>" in html